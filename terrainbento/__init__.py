@@ -17,10 +17,12 @@ from .base_class import (
 )
 from .boundary_handlers import (
     CaptureNodeBaselevelHandler,
+    DistributedPrecipChanger,
     GenericFuncBaselevelHandler,
     NotCoreNodeBaselevelHandler,
     PrecipChanger,
     SingleNodeBaselevelHandler,
+    SpatiallyVariableUpliftHandler,
 )
 from .clock import Clock
 from .derived_models import (
@@ -56,8 +58,17 @@ from .derived_models import (
 from .model_template import ModelTemplate
 from .output_writers import (
     GenericOutputWriter,
+    OutputBudgetWarning,
     OutputIteratorSkipWarning,
+    OutputManifest,
+    OWDeltaSnapshot,
+    OWPyramidNetCDF,
+    OWReductions,
+    OWRegionNetCDF,
+    OWRingBuffer,
+    OWRunningReductions,
     OWSimpleNetCDF,
+    OWUnstructuredNetCDF,
     StaticIntervalOutputClassAdapter,
     StaticIntervalOutputFunctionAdapter,
     StaticIntervalOutputWriter,
@@ -103,16 +114,27 @@ __all__ = [
     "NotCoreNodeBaselevelHandler",
     "SingleNodeBaselevelHandler",
     "GenericFuncBaselevelHandler",
+    "SpatiallyVariableUpliftHandler",
     "PrecipChanger",
+    "DistributedPrecipChanger",
     "ErosionModel",
     "StochasticErosionModel",
     "TwoLithologyErosionModel",
     "GenericOutputWriter",
     "OutputIteratorSkipWarning",
+    "OutputBudgetWarning",
     "StaticIntervalOutputWriter",
     "StaticIntervalOutputClassAdapter",
     "StaticIntervalOutputFunctionAdapter",
     "OWSimpleNetCDF",
+    "OWDeltaSnapshot",
+    "OWRingBuffer",
+    "OWRegionNetCDF",
+    "OWReductions",
+    "OWRunningReductions",
+    "OutputManifest",
+    "OWPyramidNetCDF",
+    "OWUnstructuredNetCDF",
 ]
 
 
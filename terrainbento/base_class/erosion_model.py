@@ -6,23 +6,31 @@ import os
 import sys
 import time as tm
 import warnings
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import xarray as xr
 import yaml
 from landlab import ModelGrid, create_grid
-from landlab.components import FlowAccumulator, NormalFault
+from landlab.components import FlowAccumulator
 
 from terrainbento.boundary_handlers import (
+    BaselevelUpdatePlan,
+    CachedNormalFault,
     CaptureNodeBaselevelHandler,
+    DistributedPrecipChanger,
     GenericFuncBaselevelHandler,
     NotCoreNodeBaselevelHandler,
     PrecipChanger,
     SingleNodeBaselevelHandler,
+    SpatiallyVariableUpliftHandler,
 )
 from terrainbento.clock import Clock
 from terrainbento.output_writers import (
     GenericOutputWriter,
+    OutputBudgetWarning,
+    OutputManifest,
     OWSimpleNetCDF,
     StaticIntervalOutputClassAdapter,
     StaticIntervalOutputFunctionAdapter,
@@ -30,6 +38,7 @@ from terrainbento.output_writers import (
 )
 from terrainbento.precipitators import RandomPrecipitator, UniformPrecipitator
 from terrainbento.runoff_generators import SimpleRunoff
+from terrainbento.utilities import RandomStreams
 
 _SUPPORTED_PRECIPITATORS = {
     "UniformPrecipitator": UniformPrecipitator,
@@ -45,20 +54,26 @@ _DEFAULT_RUNOFF_GENERATOR = {"SimpleRunoff": {}}
 
 _SUPPORTED_BOUNDARY_HANDLERS = [
     "NormalFault",
+    "CachedNormalFault",
     "PrecipChanger",
+    "DistributedPrecipChanger",
     "CaptureNodeBaselevelHandler",
     "NotCoreNodeBaselevelHandler",
     "SingleNodeBaselevelHandler",
     "GenericFuncBaselevelHandler",
+    "SpatiallyVariableUpliftHandler",
 ]
 
 _HANDLER_METHODS = {
-    "NormalFault": NormalFault,
+    "NormalFault": CachedNormalFault,
+    "CachedNormalFault": CachedNormalFault,
     "PrecipChanger": PrecipChanger,
+    "DistributedPrecipChanger": DistributedPrecipChanger,
     "CaptureNodeBaselevelHandler": CaptureNodeBaselevelHandler,
     "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler,
     "SingleNodeBaselevelHandler": SingleNodeBaselevelHandler,
     "GenericFuncBaselevelHandler": GenericFuncBaselevelHandler,
+    "SpatiallyVariableUpliftHandler": SpatiallyVariableUpliftHandler,
 }
 
 _DEFAULT_OUTPUT_DIR = os.path.join(os.curdir, "output")
@@ -116,8 +131,12 @@ def _setup_boundary_handlers(grid, name, params):
     that takes the parameter ``step``. Permitted boundary condition handlers
     include the Landlab Component **NormalFault** as well as the following
     options from terrainbento: **PrecipChanger**,
-    **CaptureNodeBaselevelHandler**, **NotCoreNodeBaselevelHandler**,
-    **SingleNodeBaselevelHandler**.
+    **DistributedPrecipChanger**, **CaptureNodeBaselevelHandler**,
+    **NotCoreNodeBaselevelHandler**, **SingleNodeBaselevelHandler**,
+    **GenericFuncBaselevelHandler**, **SpatiallyVariableUpliftHandler**.
+
+    A **NormalFault** is made as a **CachedNormalFault**, so models of an
+    ensemble built on identical grids share the hanging wall of the fault.
 
     Parameters
     ----------
@@ -337,6 +356,12 @@ class ErosionModel(object):
         output_prefix="terrainbento-output",
         output_dir=_DEFAULT_OUTPUT_DIR,
         fields=None,
+        random_streams=None,
+        output_in_memory=False,
+        output_manifest=False,
+        output_threads=1,
+        output_budget=None,
+        output_budget_thinning=False,
     ):
         """
         Parameters
@@ -377,7 +402,9 @@ class ErosionModel(object):
             Dictionary with ``name: instance`` key-value pairs. Each entry
             must be a valid instance of a terrainbento boundary handler. See
             the :py:mod:`boundary handlers <terrainbento.boundary_handlers>`
-            module for valid options.
+            module for valid options. A **DistributedPrecipChanger** is
+            used in place of a **PrecipChanger**, so the two may not be
+            combined.
         output_writers : dictionary of output writers.
             Classes or functions used to write incremental output (e.g. make a
             diagnostic plot). There are two formats for the dictionary entries:
@@ -431,6 +458,51 @@ class ErosionModel(object):
         fields : list, optional
             List of field names to write as netCDF output. Default is to only
             write out "topographic__elevation".
+        random_streams : RandomStreams or int, optional
+            Root of the random number streams used by this model. An integer
+            is used as the seed of a new
+            :py:class:`~terrainbento.utilities.random_streams.RandomStreams`.
+            When provided, the precipitator and every boundary handler that
+            has a **set_random_generator** method draw from their own
+            independent child stream. Default is None, which leaves all
+            components on the global random state.
+        output_in_memory : bool, optional
+            Indicates whether the default netcdf writer should also keep its
+            output in memory, so that **to_xarray_dataset** builds the dataset
+            from memory instead of reading the netCDF files. Defaults to
+            False.
+        output_manifest : bool, optional
+            Indicates whether the files written by new style writers should
+            also be recorded in an
+            :py:class:`~terrainbento.output_writers.OutputManifest`, logged
+            to a file named ``"<output_prefix>_manifest.jsonl"`` in the output
+            directory. The log can be loaded with **OutputManifest.load** to
+            list the output of a finished or crashed run. Defaults to False.
+        output_threads : int, optional
+            Number of threads that run the output writers due at the same
+            model time. With more than one thread the writers run
+            concurrently, which helps when they spend their time writing
+            files or encoding images, and the model waits until all of them
+            are done. Writers that may run together must not change model
+            state, and must not use a library that is not thread safe at
+            the same time, such as the netCDF library in some builds.
+            Defaults to 1, which runs the writers one after another.
+        output_budget : float, optional
+            Largest fraction of the run time, between 0 and 1, that each new
+            style output writer may take. The run time is the wall time
+            spent in the model time steps of **run** and **run_for** and in
+            the output writers, so time spent outside the model does not
+            count. Every writer records the wall time and bytes written of
+            each of its calls (see **GenericOutputWriter.output_costs**).
+            After a writer has run at least twice, an
+            **OutputBudgetWarning** is raised if its share of the run time
+            is above the budget. Defaults to None, which sets no budget.
+        output_budget_thinning : bool, optional
+            Indicates whether a writer that is over the output budget should
+            also write only every other one of its remaining output times.
+            Its share of the run time is then measured again from that
+            point. Saving the first and last time steps is still honored.
+            Defaults to False.
 
         Returns
         -------
@@ -474,7 +546,27 @@ class ErosionModel(object):
         self._output_prefix = output_prefix
         self.output_dir = output_dir
         self.output_fields = fields
+        self.output_in_memory = output_in_memory
         self._output_files = []
+        if int(output_threads) < 1:
+            raise ValueError("output_threads must be at least one.")
+        self.output_threads = int(output_threads)
+        if output_budget is not None and not 0.0 < output_budget <= 1.0:
+            raise ValueError("output_budget must be in (0, 1].")
+        self.output_budget = output_budget
+        self.output_budget_thinning = output_budget_thinning
+        # wall time spent in model time steps and output writers, and the
+        # run time and number of calls the budget share of each writer is
+        # measured from.
+        self._run_wall_time = 0.0
+        self._budget_windows = {}
+        self._output_pool = None
+        self.output_manifest = None
+        if output_manifest:
+            name = "_".join(filter(None, [output_prefix, "manifest.jsonl"]))
+            self.output_manifest = OutputManifest(
+                os.path.join(output_dir, name)
+            )
         if output_interval is None:
             output_interval = clock.stop
         self.output_interval = output_interval
@@ -539,7 +631,47 @@ class ErosionModel(object):
         # Boundary Conditions and Output Writers
         ###################################################################
         _verify_boundary_handler(boundary_handlers)
+        changers = [
+            name
+            for name in boundary_handlers
+            if isinstance(
+                boundary_handlers[name],
+                (PrecipChanger, DistributedPrecipChanger),
+            )
+        ]
+        if any(
+            isinstance(boundary_handlers[name], DistributedPrecipChanger)
+            for name in changers
+        ):
+            if len(changers) > 1:
+                raise ValueError(
+                    (
+                        "terrainbento ErosionModel: a DistributedPrecipChanger "
+                        "cannot be combined with another precipitation "
+                        "changer."
+                    )
+                )
+            # Models look for the precipitation changer under this name.
+            boundary_handlers = dict(boundary_handlers)
+            boundary_handlers["PrecipChanger"] = boundary_handlers.pop(
+                changers[0]
+            )
         self.boundary_handlers = boundary_handlers
+        # the components of a model do not change closed or fixed value
+        # nodes, so handlers may keep values computed from them.
+        self._boundary_update_plan = BaselevelUpdatePlan(
+            self.grid, self.boundary_handlers, fixed_boundaries=True
+        )
+
+        ###################################################################
+        # Random number streams
+        ###################################################################
+        if random_streams is not None and not isinstance(
+            random_streams, RandomStreams
+        ):
+            random_streams = RandomStreams(random_streams)
+        self.random_streams = random_streams
+        self._attach_random_streams()
 
         # Instantiate all the output writers and store in a list
         self.all_output_writers = self._setup_output_writers(
@@ -562,6 +694,29 @@ class ErosionModel(object):
                     "Required field {field} not present.".format(field=field)
                 )
 
+    def _attach_random_streams(self):
+        """Give stochastic components their own child random stream.
+
+        The precipitator draws from the ``"precipitator"`` stream and each
+        boundary handler from the ``"boundary_handler.<name>"`` stream, where
+        ``<name>`` is its key in the boundary handler dictionary. Components
+        without a **set_random_generator** method are left untouched.
+        """
+        if self.random_streams is None:
+            return
+
+        if hasattr(self.precipitator, "set_random_generator"):
+            self.precipitator.set_random_generator(
+                self.random_streams.generator("precipitator")
+            )
+
+        for name in self.boundary_handlers:
+            handler = self.boundary_handlers[name]
+            if hasattr(handler, "set_random_generator"):
+                handler.set_random_generator(
+                    self.random_streams.generator("boundary_handler." + name)
+                )
+
     def _setup_output_writers(self, output_writers, output_default_netcdf):
         """Convert all output writers to the new style and instantiate output
         writer classes.
@@ -631,6 +786,7 @@ class ErosionModel(object):
                     "intervals": self.output_interval,
                     "add_id": True,
                     "output_dir": self.output_dir,
+                    "keep_in_memory": self.output_in_memory,
                 },
             }
 
@@ -819,7 +975,9 @@ class ErosionModel(object):
             if elapsed_time + step >= runtime:
                 step = runtime - elapsed_time
                 keep_running = False
+            start = tm.perf_counter()
             self.run_one_step(step)
+            self._run_wall_time += tm.perf_counter() - start
             elapsed_time += step
 
     def run(self):
@@ -887,9 +1045,38 @@ class ErosionModel(object):
         step : float
             Timestep in unit of model time.
         """
-        # Run each of the baselevel handlers.
-        for name in self.boundary_handlers:
-            self.boundary_handlers[name].run_one_step(step)
+        # Run each of the baselevel handlers as one fused update.
+        self._boundary_update_plan.run_one_step(step)
+
+    def _adjust_erodibility(self, eroder, name, erodibility):
+        """Set an erodibility of an eroder from the precipitation changer.
+
+        The erodibility ``name`` of ``eroder`` (e.g. "K") is set to
+        ``erodibility`` times the erodibility adjustment factor of the
+        "PrecipChanger" boundary handler. When the eroder already holds its
+        own array of values at node, that array is updated in place, so no
+        array is allocated at each step.
+
+        Parameters
+        ----------
+        eroder : landlab component
+        name : str
+            Name of the erodibility attribute of the eroder.
+        erodibility : float or array
+            Erodibility before adjustment.
+        """
+        changer = self.boundary_handlers["PrecipChanger"]
+        current = getattr(eroder, name, None)
+        if (
+            isinstance(current, np.ndarray)
+            and current.shape == (self.grid.number_of_nodes,)
+            and current.dtype == float
+            and current.flags.writeable
+            and not np.shares_memory(current, erodibility)
+        ):
+            changer.adjust_erodibility(erodibility, out=current)
+        else:
+            setattr(eroder, name, changer.adjust_erodibility(erodibility))
 
     # Output methods
     def write_output(self):
@@ -907,12 +1094,75 @@ class ErosionModel(object):
             # The current model time matches the next output time
             current_time = self.sorted_output_times.pop(0)
             current_writers = self.active_output_times.pop(current_time)
+            # Run all the output writers associated with this time.
+            start = tm.perf_counter()
+            self._run_output_writers(current_writers)
+            self._run_wall_time += tm.perf_counter() - start
+            self._check_output_budget(current_writers)
             for ow_writer in current_writers:
-                # Run all the output writers associated with this time.
-                ow_writer.run_one_step()
                 next_time = ow_writer.advance_iter()
                 self._update_output_times(ow_writer, next_time, current_time)
 
+    def _run_output_writers(self, writers):
+        """Run some output writers, in a thread pool if there is one.
+
+        All writers run even if some of them fail. The exception of the
+        first writer that failed, in the order of **writers**, is then
+        raised, after a warning for each other failure.
+        """
+        if self.output_threads == 1 or len(writers) < 2:
+            for ow_writer in writers:
+                ow_writer.timed_run_one_step()
+            return
+
+        if self._output_pool is None:
+            self._output_pool = ThreadPoolExecutor(
+                max_workers=self.output_threads,
+                thread_name_prefix="terrainbento-output",
+            )
+            weakref.finalize(self, self._output_pool.shutdown, wait=False)
+        futures = [
+            self._output_pool.submit(ow_writer.timed_run_one_step)
+            for ow_writer in writers
+        ]
+        failures = [
+            (ow_writer, future.exception())
+            for (ow_writer, future) in zip(writers, futures)
+            if future.exception() is not None
+        ]
+        if failures:
+            for (ow_writer, error) in failures[1:]:
+                warnings.warn(
+                    f"Output writer {ow_writer.name} also failed: {error!r}"
+                )
+            raise failures[0][1]
+
+    def _check_output_budget(self, writers):
+        """Warn about, and optionally thin, writers over the output budget.
+        """
+        if self.output_budget is None:
+            return
+        now = self._run_wall_time
+        for ow_writer in writers:
+            (run_start, calls) = self._budget_windows.get(ow_writer, (0.0, 0))
+            costs = ow_writer.output_costs
+            if len(costs) - calls < 2 or now <= run_start:
+                continue
+            share = sum(cost[1] for cost in costs[calls:]) / (now - run_start)
+            if share <= self.output_budget:
+                continue
+
+            warnings.warn(
+                OutputBudgetWarning.get_message(
+                    ow_writer.name, share, self.output_budget
+                ),
+                OutputBudgetWarning,
+            )
+            if self.output_budget_thinning:
+                ow_writer.thin_output_times(2)
+            # measure the share again from now on.
+            self._budget_windows[ow_writer] = (now, len(costs))
+
     def _update_output_times(self, ow_writer, new_time, current_time):
         """Private method to update the dictionary of active output writers
         and the sorted list of next output times.
@@ -1007,6 +1257,7 @@ class ErosionModel(object):
         time_unit="time units",
         reference_time="model start",
         space_unit="space units",
+        writer=None,
     ):
         """Convert model output to an xarray dataset.
 
@@ -1017,6 +1268,11 @@ class ErosionModel(object):
         value of "time units since model start". The default space unit will
         give a value of "space unit".
 
+        If the netcdf writers keep their output in memory (see the
+        ``output_in_memory`` argument of the model), the dataset is built
+        directly from memory. Otherwise the netCDF files are opened lazily,
+        so runs too big for memory can still be read.
+
         Parameters
         ----------
         time_unit: str, optional
@@ -1025,18 +1281,65 @@ class ErosionModel(object):
             Reference tim. Default is "model start".
         space_unit: str, optional
             Name of space unit. Default is "space unit".
+        writer : GenericOutputWriter instance or list of instances or string or list of strings, optional
+            Read the output of these writers, which must have a
+            **to_xarray_dataset** method (for example **OWDeltaSnapshot**),
+            instead of the netCDF files. The datasets of several writers are
+            merged. Default is None.
         """
-        # open all files as a xarray dataset
+        netcdf_writers = [
+            ow
+            for ow in self.all_output_writers
+            if isinstance(ow, OWSimpleNetCDF)
+        ]
+        if writer is None and netcdf_writers:
+            if all(ow.keep_in_memory for ow in netcdf_writers):
+                writer = netcdf_writers
+
+        if writer is not None:
+            _, writer_list = self._format_extension_and_writer_args(
+                None, writer
+            )
+            datasets = []
+            for ow in writer_list:
+                if not hasattr(ow, "to_xarray_dataset"):
+                    raise ValueError(
+                        f"Output writer {ow.name} can not make an xarray "
+                        "dataset."
+                    )
+                ds = ow.to_xarray_dataset()
+                ds["time"].attrs.update(
+                    {
+                        "units": time_unit + " since " + reference_time,
+                        "standard_name": "time",
+                    }
+                )
+                for coord in ("x", "y"):
+                    if coord in ds:
+                        ds[coord].attrs["units"] = space_unit
+                datasets.append(ds)
+            return xr.merge(datasets)
+
+        # open all files of the netcdf writers as a xarray dataset. Other
+        # writers, such as OWRegionNetCDF, may also write netcdf files.
+        filepaths = self.get_output(
+            extension="nc", writer=netcdf_writers or None
+        )
         ds = xr.open_mfdataset(
-            self.get_output(extension="nc"),
+            filepaths,
             concat_dim="nt",
             engine="netcdf4",
             combine="nested",
             data_vars=self.output_fields,
         )
 
-        # add a time dimension
+        # add a time dimension, from the times the files were written at if
+        # they all come from one netcdf writer.
         time_array = np.asarray(self._itters) * self.output_interval
+        if len(netcdf_writers) == 1:
+            ow = netcdf_writers[0]
+            if len(ow.output_times) == len(filepaths):
+                time_array = np.asarray(ow.output_times)
         time = xr.DataArray(
             time_array,
             dims=("nt"),
@@ -1170,6 +1473,8 @@ class ErosionModel(object):
         """Remove files written by new style writers during a model
         run. Does not work for old style writers which have no way to report
         what they have written. Can specify types of files and/or writers.
+        If the model keeps an output manifest, the files to remove are
+        looked up in it.
 
         To do: allow 'writer' to be a string for the name of the writer?
 
@@ -1194,13 +1499,21 @@ class ErosionModel(object):
                 assert ext is None or isinstance(ext, str)
                 if ext and ext[0] == ".":
                     ext = ext[1:]  # ignore leading period if present
-                ow.delete_output_files(ext)
+                if self.output_manifest is None:
+                    ow.delete_output_files(ext)
+                    continue
+                # the manifest indexes the files by writer and extension.
+                for filepath in self.output_manifest.paths(
+                    writer=ow.name, extension=ext
+                ):
+                    ow.delete_output_file(filepath)
 
     def get_output(self, extension=None, writer=None):
         """Get a list of filepaths for files written by new style writers
         during a model run. Does not work for old style writers which have no
         way to report what they have written.  Can specify types of files
-        and/or writers.
+        and/or writers. If the model keeps an output manifest, the files are
+        looked up in it.
 
         Parameters
         ----------
@@ -1227,7 +1540,12 @@ class ErosionModel(object):
             assert ow is not None
             for ext in extension_list:
                 assert ext is None or isinstance(ext, str)
-                output_list += ow.get_output_filepaths(ext)
+                if self.output_manifest is None:
+                    output_list += ow.get_output_filepaths(ext)
+                else:
+                    output_list += self.output_manifest.paths(
+                        writer=ow.name, extension=ext
+                    )
 
         return output_list
 
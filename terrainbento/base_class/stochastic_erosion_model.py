@@ -4,6 +4,7 @@
 models."""
 
 import os
+import random
 import textwrap
 
 import numpy as np
@@ -11,9 +12,55 @@ import scipy.stats as stats
 from landlab.components import PrecipitationDistribution
 
 from terrainbento.base_class import ErosionModel
+from terrainbento.boundary_handlers import DistributedPrecipChanger
+from terrainbento.utilities import StormSequence
 
 _STRING_LENGTH = 80
 
+# Number of storm/interstorm pairs drawn at once from a random stream.
+_STORM_BLOCK_SIZE = 256
+
+
+def _split_storm_events(durations, intensities, step, is_storm=None):
+    """Split storms into pieces no longer than ``step``.
+
+    ``durations`` and ``intensities`` alternate between storms and
+    interstorms, starting with a storm unless ``is_storm`` marks which
+    events are storms. Interstorms are not split.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.base_class.stochastic_erosion_model import (
+    ...     _split_storm_events
+    ... )
+    >>> _split_storm_events(
+    ...     np.array([4.5, 3.0, 2.0]), np.array([1.0, 0.0, 2.0]), 2.0
+    ... )
+    array([[ 2. ,  1. ],
+           [ 2. ,  1. ],
+           [ 0.5,  1. ],
+           [ 3. ,  0. ],
+           [ 2. ,  2. ]])
+    """
+    if is_storm is None:
+        is_storm = np.arange(durations.size) % 2 == 0
+    n_pieces = np.ones(durations.size, dtype=int)
+    storm_durations = durations[is_storm]
+
+    # Match the sequential rule: keep cutting off ``step`` while more than
+    # ``step`` remains.
+    n_full = np.maximum(np.ceil(storm_durations / step) - 1.0, 0.0)
+    n_full += storm_durations - n_full * step > step
+    n_full -= (n_full > 0) & (storm_durations - (n_full - 1.0) * step <= step)
+    n_pieces[is_storm] += n_full.astype(int)
+
+    events = np.empty((n_pieces.sum(), 2))
+    events[:, 0] = step
+    events[np.cumsum(n_pieces) - 1, 0] = durations - (n_pieces - 1) * step
+    events[:, 1] = np.repeat(intensities, n_pieces)
+    return events
+
 
 class StochasticErosionModel(ErosionModel):
     """Base class for stochastic-precipitation terrainbento models.
@@ -113,6 +160,13 @@ class StochasticErosionModel(ErosionModel):
         rainfall__mean_rate=1,
         storm_sequence_filename="storm_sequence.txt",
         frequency_filename="exceedance_summary.txt",
+        storm_sequence=None,
+        adaptive_sub_time_steps=False,
+        sub_time_step_relative_error=0.05,
+        min_sub_time_steps=1,
+        max_sub_time_steps=100,
+        sub_time_step_window=50,
+        sub_time_step_samples=10,
         **kwargs
     ):
         """
@@ -122,7 +176,10 @@ class StochasticErosionModel(ErosionModel):
         grid : landlab model grid instance
             The grid must have all required fields.
         random_seed, int, optional
-            Random seed. Default is 0.
+            Random seed. Default is 0. Only used when the model was not given
+            ``random_streams``; in that case storms are drawn by the Landlab
+            PrecipitationDistribution component from the global random state
+            seeded with this value.
         opt_stochastic_duration : bool, optional
             Flag indicating if timestep is stochastic or constant. Default is
             False.
@@ -150,9 +207,46 @@ class StochasticErosionModel(ErosionModel):
         frequency_filename : str
             Filename for precipitation exceedance frequency summary. Default
             value is "exceedance_summary.txt"
+        storm_sequence : StormSequence or str, optional
+            Pre-generated storm sequence, or the path to one saved with
+            **StormSequence.save**, to replay instead of generating storms.
+            Requires ``opt_stochastic_duration=True``; the parameters
+            ``mean_storm_duration``, ``mean_interstorm_duration``,
+            ``mean_storm_depth``, and ``random_seed`` are then not used.
+            Several models may replay the same sequence. Default is None.
+        adaptive_sub_time_steps : bool, optional
+            If True, and ``opt_stochastic_duration=False``, the number of
+            sub-timesteps is chosen anew for every step so that the standard
+            error of the step's mean erosion rate, estimated from the
+            variance of the erosion rates of recent sub-timesteps, is
+            ``sub_time_step_relative_error`` times the mean erosion rate.
+            ``number_of_sub_time_steps`` is used for the first step. The
+            number used in each step is recorded in the attribute
+            ``sub_time_step_counts``. Default is False.
+        sub_time_step_relative_error : float, optional
+            Target standard error of the mean erosion rate of a step, relative
+            to the mean erosion rate. Default is 0.05.
+        min_sub_time_steps : int, optional
+            Smallest number of sub-timesteps used in adaptive mode. Default
+            is 1.
+        max_sub_time_steps : int, optional
+            Largest number of sub-timesteps used in adaptive mode. Default is
+            100.
+        sub_time_step_window : int, optional
+            Number of measured sub-timesteps the erosion rate statistics
+            remember in adaptive mode. Older rates are exponentially
+            down-weighted, so the number of sub-timesteps follows the
+            variance as it changes during a run. Default is 50.
+        sub_time_step_samples : int, optional
+            Largest number of sub-timesteps per step whose erosion rate is
+            measured in adaptive mode. Each measurement sums the elevation
+            over the grid twice. Default is 10.
         **kwargs :
             Keyword arguments to pass to
-            :py:class:`ErosionModel`
+            :py:class:`ErosionModel`. If these include ``random_streams``,
+            storms are drawn from its ``"storm_generator"`` stream instead of
+            the global random state, which makes the model safe to run in
+            parallel ensembles.
 
         Returns
         -------
@@ -183,6 +277,66 @@ class StochasticErosionModel(ErosionModel):
             )
             raise ValueError(msg)
 
+        # stochastic models need a single, scalar set of precip parameters
+        if isinstance(
+            self.boundary_handlers.get("PrecipChanger"),
+            DistributedPrecipChanger,
+        ):
+            raise ValueError(
+                (
+                    "terrainbento StochasticErosionModel: the "
+                    "DistributedPrecipChanger boundary condition handler is "
+                    "not supported by stochastic models."
+                )
+            )
+
+        if storm_sequence is not None:
+            if not self.opt_stochastic_duration:
+                raise ValueError(
+                    "terrainbento StochasticErosionModel: a storm_sequence "
+                    "can only be used with opt_stochastic_duration=True."
+                )
+            if not isinstance(storm_sequence, StormSequence):
+                storm_sequence = StormSequence.load(storm_sequence)
+        self.storm_sequence = storm_sequence
+
+        if adaptive_sub_time_steps:
+            if self.opt_stochastic_duration:
+                raise ValueError(
+                    "terrainbento StochasticErosionModel: "
+                    "adaptive_sub_time_steps can only be used with "
+                    "opt_stochastic_duration=False."
+                )
+            if sub_time_step_relative_error <= 0.0:
+                raise ValueError(
+                    "terrainbento StochasticErosionModel: "
+                    "sub_time_step_relative_error must be positive."
+                )
+            if not 1 <= min_sub_time_steps <= max_sub_time_steps:
+                raise ValueError(
+                    "terrainbento StochasticErosionModel: min_sub_time_steps "
+                    "and max_sub_time_steps must satisfy "
+                    "1 <= min_sub_time_steps <= max_sub_time_steps."
+                )
+            if sub_time_step_window < 2 or sub_time_step_samples < 1:
+                raise ValueError(
+                    "terrainbento StochasticErosionModel: "
+                    "sub_time_step_window must be at least 2 and "
+                    "sub_time_step_samples at least 1."
+                )
+        self.adaptive_sub_time_steps = adaptive_sub_time_steps
+        self.sub_time_step_relative_error = sub_time_step_relative_error
+        self.min_sub_time_steps = int(min_sub_time_steps)
+        self.max_sub_time_steps = int(max_sub_time_steps)
+        self.sub_time_step_window = int(sub_time_step_window)
+        self.sub_time_step_samples = int(sub_time_step_samples)
+        self.sub_time_step_counts = []
+
+        # Exponentially weighted statistics of the sub-timestep erosion rate.
+        self._erosion_rate_count = 0
+        self._erosion_rate_mean = 0.0
+        self._erosion_rate_variance = 0.0
+
         self.seed = int(random_seed)
 
         self.random_seed = random_seed
@@ -241,8 +395,9 @@ class StochasticErosionModel(ErosionModel):
         random storm/interstorm sequence.
 
         **run_for_stochastic** runs the model for the duration ``runtime`` with
-        model time steps given by the PrecipitationDistribution component.
-        Model run steps will not exceed the duration given by ``step``.
+        model time steps given by **generate_storm_events**. Model run steps
+        will not exceed the duration given by ``step``. The events used are
+        kept as the attribute ``storm_events``.
 
         Parameters
         ----------
@@ -251,37 +406,210 @@ class StochasticErosionModel(ErosionModel):
         runtime : float
             Total duration for which to run model.
         """
-        self.rain_generator._delta_t = step
-        self.rain_generator._run_time = runtime
-        for (
-            tr,
-            p,
-        ) in self.rain_generator.yield_storm_interstorm_duration_intensity():
+        self.run_storm_events(self.generate_storm_events(step, runtime))
+
+    def run_storm_events(self, events):
+        """Run the model through a precomputed sequence of events.
+
+        Parameters
+        ----------
+        events : array of float, shape (number_of_events, 2)
+            Duration (first column) and rainfall rate (second column) of each
+            model step, e.g. as returned by **generate_storm_events**.
+        """
+        self.storm_events = events
+        for (tr, p) in events.tolist():
             self.rain_rate = p
             self.run_one_step(tr)
 
+    def generate_storm_events(self, step, runtime):
+        """Generate the storm and interstorm events for the next ``runtime``.
+
+        Storm durations, interstorm durations, and storm depths are drawn as
+        arrays. The events are then clipped so that they end at ``runtime``
+        and storms are split into pieces no longer than ``step``, in the same
+        way as the ``yield_storm_interstorm_duration_intensity`` method of
+        the Landlab PrecipitationDistribution component. Interstorm periods
+        are not split.
+
+        Without ``random_streams`` or a ``storm_sequence`` the events are
+        drawn from the global random state, number for number as the
+        PrecipitationDistribution component would have drawn them.
+
+        Parameters
+        ----------
+        step : float
+            Maximum duration of a storm piece.
+        runtime : float
+            Duration covered by the events.
+
+        Returns
+        -------
+        events : array of float, shape (number_of_events, 2)
+            Duration (first column) and rainfall rate (second column) of each
+            model step.
+        """
+        if self.storm_sequence is not None:
+            events = list(self._storm_cursor.advance(step, runtime))
+            return np.array(events, dtype=float).reshape((-1, 2))
+        if runtime <= 0.0:
+            return np.empty((0, 2))
+        if self._storm_rng is None:
+            durations, intensities = self._draw_legacy_storm_events(runtime)
+            return _split_storm_events(durations, intensities, step)
+        (durations, intensities, is_storm) = self._draw_stream_storm_events(
+            runtime
+        )
+        return _split_storm_events(durations, intensities, step, is_storm)
+
+    def _draw_legacy_storm_events(self, runtime):
+        """Draw events from the global random state.
+
+        Durations come from the ``random`` module and depths from
+        ``np.random``, as in the PrecipitationDistribution component, and
+        exactly as many numbers are drawn, so that runs reproduce those made
+        with the component. Durations are drawn one by one because the number
+        of events is not known in advance; the depths are then drawn as one
+        array. Like the component, the storm depth distribution and the
+        intensity use the storm duration drawn when the component was
+        created.
+        """
+        durations = []
+        elapsed_time = 0.0
+        storm = True
+        while elapsed_time < runtime:
+            if storm:
+                mean = self.mean_storm_duration
+            else:
+                mean = self.mean_interstorm_duration
+            duration = random.expovariate(1.0 / mean)
+            if elapsed_time + duration > runtime:
+                duration = runtime - elapsed_time
+            durations.append(duration)
+            elapsed_time += duration
+            storm = not storm
+
+        durations = np.array(durations)
+        initial_duration = self.rain_generator.storm_duration
+        depths = np.random.gamma(
+            initial_duration / self.mean_storm_duration,
+            self.mean_storm_depth,
+            size=(durations.size + 1) // 2,
+        )
+        intensities = np.zeros_like(durations)
+        intensities[0::2] = depths / initial_duration
+        return durations, intensities
+
+    def _draw_stream_storm_events(self, runtime):
+        """Draw events from the ``"storm_generator"`` random stream.
+
+        Storm/interstorm pairs are drawn in fixed size blocks and kept in a
+        buffer of events. The part of an event cut off at the end of
+        ``runtime`` stays in the buffer and is used first by the next call,
+        so the sequence of events does not depend on how the run is split
+        into calls to **run_for**.
+
+        Returns
+        -------
+        durations, intensities, is_storm : arrays
+        """
+        while True:
+            pending = self._storm_buffer[self._storm_buffer_index :]
+            end_time = np.cumsum(pending[:, 0])
+            if end_time.size > 0 and end_time[-1] >= runtime:
+                break
+            self._storm_buffer = np.concatenate(
+                (pending, self._draw_storm_block())
+            )
+            self._storm_buffer_index = 0
+
+        n_events = int(np.searchsorted(end_time, runtime)) + 1
+        events = pending[:n_events].copy()
+        remainder = end_time[n_events - 1] - runtime
+        events[-1, 0] -= remainder
+        if remainder > 0.0:
+            # keep the rest of the last event for the next call.
+            self._storm_buffer_index += n_events - 1
+            self._storm_buffer[self._storm_buffer_index, 0] = remainder
+        else:
+            self._storm_buffer_index += n_events
+        return events[:, 0], events[:, 1], events[:, 2] > 0.0
+
+    def _draw_storm_block(self):
+        """Draw a block of storm and interstorm events.
+
+        Returns
+        -------
+        array of float, shape (2 * _STORM_BLOCK_SIZE, 3)
+            Duration, intensity, and 1 for a storm or 0 for an interstorm,
+            of storms and interstorms in turn.
+        """
+        storm_duration = self._storm_rng.exponential(
+            self.mean_storm_duration, size=_STORM_BLOCK_SIZE
+        )
+        interstorm_duration = self._storm_rng.exponential(
+            self.mean_interstorm_duration, size=_STORM_BLOCK_SIZE
+        )
+        depth = self._storm_rng.gamma(
+            storm_duration / self.mean_storm_duration, self.mean_storm_depth
+        )
+        block = np.zeros((2 * _STORM_BLOCK_SIZE, 3))
+        block[0::2, 0] = storm_duration
+        block[0::2, 1] = depth / storm_duration
+        block[0::2, 2] = 1.0
+        block[1::2, 0] = interstorm_duration
+        return block
+
     def instantiate_rain_generator(self):
-        """Instantiate component used to generate storm sequence."""
+        """Instantiate component used to generate storm sequence.
+
+        Without ``random_streams`` the Landlab PrecipitationDistribution
+        component, seeded with ``random_seed``, generates the storms. With
+        ``random_streams`` the storms are drawn from its
+        ``"storm_generator"`` stream and no PrecipitationDistribution is
+        created, so the global random state is left untouched. With a
+        ``storm_sequence`` the sequence is replayed from its start.
+        """
+        if self.random_streams is None:
+            self._storm_rng = None
+        else:
+            self._storm_rng = self.random_streams.generator("storm_generator")
+        self._storm_buffer = np.empty((0, 3))
+        self._storm_buffer_index = 0
+        self.storm_events = np.empty((0, 2))
+
+        if self.storm_sequence is not None:
+            self._storm_cursor = self.storm_sequence.cursor()
+            self.rain_generator = None
+            self.run_for = self.run_for_stochastic  # override base method
+            return
+
         # Handle option for duration.
         if self.opt_stochastic_duration:
-            self.rain_generator = PrecipitationDistribution(
-                mean_storm_duration=self.mean_storm_duration,
-                mean_interstorm_duration=self.mean_interstorm_duration,
-                mean_storm_depth=self.mean_storm_depth,
-                total_t=self.clock.stop,
-                delta_t=self.clock.step,
-                random_seed=self.seed,
-            )
+            if self._storm_rng is None:
+                self.rain_generator = PrecipitationDistribution(
+                    mean_storm_duration=self.mean_storm_duration,
+                    mean_interstorm_duration=self.mean_interstorm_duration,
+                    mean_storm_depth=self.mean_storm_depth,
+                    total_t=self.clock.stop,
+                    delta_t=self.clock.step,
+                    random_seed=self.seed,
+                )
+            else:
+                self.rain_generator = None
             self.run_for = self.run_for_stochastic  # override base method
         else:
             from scipy.special import gamma
 
-            self.rain_generator = PrecipitationDistribution(
-                mean_storm_duration=1.0,
-                mean_interstorm_duration=1.0,
-                mean_storm_depth=1.0,
-                random_seed=self.seed,
-            )
+            if self._storm_rng is None:
+                self.rain_generator = PrecipitationDistribution(
+                    mean_storm_duration=1.0,
+                    mean_interstorm_duration=1.0,
+                    mean_storm_depth=1.0,
+                    random_seed=self.seed,
+                )
+            else:
+                self.rain_generator = None
 
             self.scale_factor = self.rainfall__mean_rate / gamma(
                 1.0 + (1.0 / self.shape_factor)
@@ -299,7 +627,27 @@ class StochasticErosionModel(ErosionModel):
 
     def reset_random_seed(self):
         """Reset the random number generation sequence."""
-        self.rain_generator.seed_generator(seedval=self.seed)
+        if self.storm_sequence is not None:
+            self._storm_cursor.rewind()
+        elif self._storm_rng is None:
+            self.rain_generator.seed_generator(seedval=self.seed)
+        else:
+            self.random_streams.reset("storm_generator")
+            self._storm_rng = self.random_streams.generator("storm_generator")
+            self._storm_buffer = np.empty((0, 3))
+            self._storm_buffer_index = 0
+
+    def _generate_rain_rate(self):
+        """Draw a rainfall rate from the stretched exponential distribution."""
+        if self._storm_rng is None:
+            return self.rain_generator.generate_from_stretched_exponential(
+                self.scale_factor, self.shape_factor
+            )
+        # 1 - U lies in (0, 1], so the logarithm is always finite.
+        return self.scale_factor * (
+            (-np.log(1.0 - self._storm_rng.random()))
+            ** (1.0 / self.shape_factor)
+        )
 
     def _pre_water_erosion_steps(self):
         """Convenience function for pre-water erosion steps.
@@ -369,20 +717,27 @@ class StochasticErosionModel(ErosionModel):
 
         elif not self.opt_stochastic_duration:
 
+            n_sub_steps = self.n_sub_steps
             dt_water = (step * self.rainfall_intermittency_factor) / float(
-                self.n_sub_steps
+                n_sub_steps
             )
-            for i in range(self.n_sub_steps):
-                self.rain_rate = (
-                    self.rain_generator.generate_from_stretched_exponential(
-                        self.scale_factor, self.shape_factor
-                    )
-                )
+            # Measure the erosion rate of evenly spaced sub-timesteps only.
+            sample_every = -(-n_sub_steps // self.sub_time_step_samples)
+            for i in range(n_sub_steps):
+                self.rain_rate = self._generate_rain_rate()
 
                 self._pre_water_erosion_steps()
 
                 runoff = self.calc_runoff_and_discharge()
-                self.eroder.run_one_step(dt_water)
+                if self.adaptive_sub_time_steps and i % sample_every == 0:
+                    volume = np.sum(self.z)
+                    self.eroder.run_one_step(dt_water)
+                    if dt_water > 0.0:
+                        self._update_erosion_rate_statistics(
+                            (volume - np.sum(self.z)) / dt_water
+                        )
+                else:
+                    self.eroder.run_one_step(dt_water)
                 # save record into the rain record
                 if self.record_rain:
                     event_start_time = self.model_time + (i * dt_water)
@@ -400,10 +755,53 @@ class StochasticErosionModel(ErosionModel):
                 # if dry time is greater than zero, record.
                 if dt_dry > 0:
                     event_start_time = self.model_time + (
-                        self.n_sub_steps * dt_water
+                        n_sub_steps * dt_water
                     )
                     self.record_rain_event(event_start_time, dt_dry, 0.0, 0.0)
 
+            if self.adaptive_sub_time_steps:
+                self.sub_time_step_counts.append(n_sub_steps)
+                self.n_sub_steps = self._choose_number_of_sub_steps()
+
+    def _update_erosion_rate_statistics(self, erosion_rate):
+        """Add one sub-timestep erosion rate to the weighted statistics.
+
+        Until ``sub_time_step_window`` rates have been seen every rate has
+        the same weight; after that each new rate has the weight
+        :math:`1 / w` and older rates decay geometrically.
+        """
+        self._erosion_rate_count += 1
+        weight = 1.0 / min(
+            self._erosion_rate_count, self.sub_time_step_window
+        )
+        delta = erosion_rate - self._erosion_rate_mean
+        self._erosion_rate_mean += weight * delta
+        self._erosion_rate_variance = (1.0 - weight) * (
+            self._erosion_rate_variance + weight * delta ** 2
+        )
+
+    def _choose_number_of_sub_steps(self):
+        """Number of sub-timesteps needed to reach the target error.
+
+        The standard error of the mean of :math:`n` sub-timestep erosion
+        rates is :math:`s / \\sqrt{n}`, where :math:`s` is the weighted
+        standard deviation of recent rates, so the target is met when
+        :math:`n \\geq (s / (\\epsilon \\bar{E}))^2`.
+        """
+        if self._erosion_rate_count < 2:
+            return self.n_sub_steps
+        mean = abs(self._erosion_rate_mean)
+        if mean == 0.0:
+            return self.min_sub_time_steps
+        n_rates = min(self._erosion_rate_count, self.sub_time_step_window)
+        variance = self._erosion_rate_variance * n_rates / (n_rates - 1)
+        n_sub_steps = np.ceil(
+            variance / (self.sub_time_step_relative_error * mean) ** 2
+        )
+        return int(
+            np.clip(n_sub_steps, self.min_sub_time_steps, self.max_sub_time_steps)
+        )
+
     def finalize(self):
         """Finalize stochastic erosion models.
 
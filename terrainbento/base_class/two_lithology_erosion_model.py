@@ -141,11 +141,9 @@ class TwoLithologyErosionModel(ErosionModel):
     def _update_Ks_with_precip(self):
         # (if we're varying K through time, update that first)
         if "PrecipChanger" in self.boundary_handlers:
-            erode_factor = self.boundary_handlers[
-                "PrecipChanger"
-            ].get_erodibility_adjustment_factor()
-            self.till_erody = self.K_till * erode_factor
-            self.rock_erody = self.K_rock * erode_factor
+            changer = self.boundary_handlers["PrecipChanger"]
+            self.till_erody = changer.adjust_erodibility(self.K_till)
+            self.rock_erody = changer.adjust_erodibility(self.K_rock)
 
     def _update_erodibility_field(self):
         """Update erodibility at each node.
@@ -1,15 +1,24 @@
 """Classes to assist with boundary conditions in the terrainbento package."""
 
+from .baselevel_update_plan import BaselevelUpdatePlan
 from .capture_node_baselevel_handler import CaptureNodeBaselevelHandler
+from .distributed_precip_changer import DistributedPrecipChanger
+from .fault_geometry import CachedNormalFault, FaultGeometryCache
 from .generic_function_baselevel_handler import GenericFuncBaselevelHandler
 from .not_core_node_baselevel_handler import NotCoreNodeBaselevelHandler
 from .precip_changer import PrecipChanger
 from .single_node_baselevel_handler import SingleNodeBaselevelHandler
+from .spatially_variable_uplift_handler import SpatiallyVariableUpliftHandler
 
 __all__ = [
     "CaptureNodeBaselevelHandler",
     "NotCoreNodeBaselevelHandler",
     "SingleNodeBaselevelHandler",
     "GenericFuncBaselevelHandler",
+    "SpatiallyVariableUpliftHandler",
     "PrecipChanger",
+    "DistributedPrecipChanger",
+    "BaselevelUpdatePlan",
+    "CachedNormalFault",
+    "FaultGeometryCache",
 ]
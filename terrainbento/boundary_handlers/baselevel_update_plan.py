@@ -0,0 +1,321 @@
+# coding: utf8
+# !/usr/env/python
+"""**BaselevelUpdatePlan** runs all boundary handlers as one fused update.
+
+Running each boundary handler separately means that every handler applies its
+own boolean mask, looks up the coupled fields (``bedrock__elevation`` and
+``lithology_contact__elevation``) in the grid, and adds its elevation change
+to each field. The **BaselevelUpdatePlan** instead compiles the handlers once
+into integer node indices and a list of the coupled fields that exist, and
+then applies the elevation changes of all handlers to all fields in a single
+vectorized pass per step.
+
+A baselevel handler takes part in the fused pass by providing:
+
+``_lowered_nodes()``
+    Return the ids of the nodes it changes, refreshed from the node status.
+``_elevation_change(step)``
+    Return the elevation change of those nodes over ``step`` (a scalar or an
+    array with one value per node) without changing any field or the handler
+    time.
+``_COUPLED_FIELDS``
+    Names of the fields, other than ``topographic__elevation``, that move
+    with the topography.
+``_reads_elevation``
+    True if the elevation change depends on the current elevation. The
+    changes of the handlers before such a handler are applied before its
+    change is found, so the result is the same as running the handlers one
+    after another.
+
+A handler that restores some nodes after its change, such as a
+**SingleNodeBaselevelHandler** that lowers every node but the outlet, may also
+provide ``_reset_values()``, which returns a dictionary from field name to the
+node ids and the values they are set to. The plan writes these values after
+the fused change and starts a new fused pass after such a handler, so that the
+changes of later handlers are not undone.
+
+A handler may also set ``_fusable`` to False. Handlers that are not fusable,
+such as a **PrecipChanger**, are run with their own **run_one_step** at their
+place in the sequence. Unless they set ``_modifies_elevation`` to False, such
+handlers are taken to change the elevation of every node.
+
+A fusable handler with an ``_elevation_version`` attribute may keep a value
+computed from the elevation of its nodes, such as their mean, from one step
+to the next. The plan sets the attribute to a counter and increments it
+whenever something other than the handler may have changed those nodes:
+another handler of the plan, or whatever runs between two steps of the plan.
+Unless the plan is made with ``fixed_boundaries``, anything is taken to
+change every node between steps. Within a model, the components change only
+the nodes that are neither closed nor fixed value, and other changes must be
+declared with **mark_elevation_changed**.
+
+The plan is compiled the first time it is run and again only when the node
+status of the grid or the set of handlers changes.
+"""
+
+import numpy as np
+
+
+class _FusedSegment(object):
+    """Consecutive fusable handlers whose changes are applied together."""
+
+    def __init__(self, grid, handlers):
+        self.handlers = handlers
+        nodes = [
+            np.asarray(handler._lowered_nodes(), dtype=int)
+            for handler in handlers
+        ]
+        bounds = np.cumsum([0] + [n.size for n in nodes])
+        self.slices = [
+            slice(bounds[i], bounds[i + 1]) for i in range(len(handlers))
+        ]
+        self.nodes, self.inverse = np.unique(
+            np.concatenate(nodes), return_inverse=True
+        )
+        self.change = np.empty(bounds[-1])
+
+        self.topography = grid.at_node["topographic__elevation"]
+        names = []
+        for handler in handlers:
+            for name in handler._COUPLED_FIELDS:
+                if name in grid.at_node and name not in names:
+                    names.append(name)
+        self.fields = []
+        for name in names:
+            couples = np.array(
+                [name in handler._COUPLED_FIELDS for handler in handlers]
+            )
+            if np.all(couples):
+                weights = None
+            else:
+                weights = np.zeros(bounds[-1])
+                for (sl, coupled) in zip(self.slices, couples):
+                    weights[sl] = float(coupled)
+            self.fields.append((grid.at_node[name], weights))
+
+        resets = {}
+        for handler in handlers:
+            if hasattr(handler, "_reset_values"):
+                for (name, pair) in handler._reset_values().items():
+                    if name in grid.at_node:
+                        resets.setdefault(name, []).append(pair)
+        self.resets = []
+        reset_nodes = [np.empty(0, dtype=int)]
+        for (name, pairs) in resets.items():
+            ids = np.concatenate(
+                [np.asarray(ids, dtype=int) for (ids, _) in pairs]
+            )
+            values = np.concatenate([values for (_, values) in pairs])
+            self.resets.append((grid.at_node[name], ids, values))
+            reset_nodes.append(ids)
+        self.reset_nodes = np.unique(np.concatenate(reset_nodes))
+
+    def run_one_step(self, step):
+        for (handler, sl) in zip(self.handlers, self.slices):
+            self.change[sl] = handler._elevation_change(step)
+
+        delta = np.bincount(
+            self.inverse, weights=self.change, minlength=self.nodes.size
+        )
+        self.topography[self.nodes] += delta
+        for (field, weights) in self.fields:
+            if weights is None:
+                field[self.nodes] += delta
+            else:
+                field[self.nodes] += np.bincount(
+                    self.inverse,
+                    weights=self.change * weights,
+                    minlength=self.nodes.size,
+                )
+        for (field, ids, values) in self.resets:
+            field[ids] = values
+
+        for handler in self.handlers:
+            handler.model_time += step
+
+
+class BaselevelUpdatePlan(object):
+    """Apply the changes of all boundary handlers in one pass per step.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from terrainbento.boundary_handlers import (
+    ...     BaselevelUpdatePlan,
+    ...     CaptureNodeBaselevelHandler,
+    ...     NotCoreNodeBaselevelHandler,
+    ... )
+    >>> mg = RasterModelGrid((3, 4))
+    >>> z = mg.add_zeros("node", "topographic__elevation")
+    >>> b = mg.add_zeros("node", "bedrock__elevation")
+    >>> handlers = {
+    ...     "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+    ...         mg, lowering_rate=-0.1
+    ...     ),
+    ...     "CaptureNodeBaselevelHandler": CaptureNodeBaselevelHandler(
+    ...         mg, capture_node=5, capture_incision_rate=-0.5
+    ...     ),
+    ... }
+    >>> plan = BaselevelUpdatePlan(mg, handlers)
+    >>> plan.run_one_step(10.0)
+    >>> print(z.reshape(mg.shape))
+    [[-1. -1. -1. -1.]
+     [-1. -6.  0. -1.]
+     [-1. -1. -1. -1.]]
+
+    The capture node handler changes only the topography.
+
+    >>> print(b.reshape(mg.shape))
+    [[-1. -1. -1. -1.]
+     [-1. -1.  0. -1.]
+     [-1. -1. -1. -1.]]
+    """
+
+    def __init__(self, grid, handlers, fixed_boundaries=False):
+        """
+        Parameters
+        ----------
+        grid : landlab model grid
+        handlers : dict
+            Boundary handler instances, run in the order of the dictionary.
+            The dictionary is read at every step, so handlers added to or
+            removed from it later are picked up.
+        fixed_boundaries : bool, optional
+            If True, closed and fixed value nodes are taken to change between
+            steps only when **mark_elevation_changed** says so. Defaults to
+            False.
+        """
+        self._grid = grid
+        self._handlers = handlers
+        self._fixed_boundaries = bool(fixed_boundaries)
+        self._segments = None
+        self._key = None
+        self._tracked = []
+        self._changed_between_steps = []
+        self._changed_by_segment = []
+
+    def invalidate(self):
+        """Force the plan to be compiled again before the next step."""
+        self._segments = None
+
+    def _current_key(self):
+        return (
+            self._grid.bc_set_code,
+            tuple(id(handler) for handler in self._handlers.values()),
+        )
+
+    def _compile(self):
+        segments = []
+        fused = []
+        for handler in self._handlers.values():
+            if hasattr(handler, "_elevation_change") and getattr(
+                handler, "_fusable", True
+            ):
+                if handler._reads_elevation and fused:
+                    segments.append(_FusedSegment(self._grid, fused))
+                    fused = []
+                fused.append(handler)
+                if hasattr(handler, "_reset_values") and (
+                    handler._reset_values()
+                ):
+                    segments.append(_FusedSegment(self._grid, fused))
+                    fused = []
+            else:
+                if fused:
+                    segments.append(_FusedSegment(self._grid, fused))
+                    fused = []
+                segments.append(handler)
+        if fused:
+            segments.append(_FusedSegment(self._grid, fused))
+        self._segments = segments
+        self._track_elevation_changes()
+
+    def _track_elevation_changes(self):
+        """Find the handlers whose nodes each part of a step may change."""
+        n_nodes = self._grid.number_of_nodes
+        tracked = []
+        for segment in self._segments:
+            if isinstance(segment, _FusedSegment):
+                for handler in segment.handlers:
+                    if hasattr(handler, "_elevation_version"):
+                        tracked.append(handler)
+        # nothing kept from before the plan was compiled is used again.
+        for handler in tracked:
+            handler._elevation_version = (handler._elevation_version or 0) + 1
+        nodes = [np.unique(handler._lowered_nodes()) for handler in tracked]
+
+        changed_by_segment = []
+        for segment in self._segments:
+            count = np.zeros(n_nodes, dtype=int)
+            if isinstance(segment, _FusedSegment):
+                for handler in segment.handlers:
+                    count[np.unique(handler._lowered_nodes())] += 1
+                count[segment.reset_nodes] += 1
+                own = [
+                    int(handler in segment.handlers) for handler in tracked
+                ]
+            elif getattr(segment, "_modifies_elevation", True):
+                count[:] = 1
+                own = [0] * len(tracked)
+            else:
+                own = [0] * len(tracked)
+            changed_by_segment.append(
+                [
+                    handler
+                    for (handler, ids, mine) in zip(tracked, nodes, own)
+                    if np.any(count[ids] > mine)
+                ]
+            )
+
+        if self._fixed_boundaries:
+            status = self._grid.status_at_node
+            free = (status != self._grid.BC_NODE_IS_FIXED_VALUE) & (
+                status != self._grid.BC_NODE_IS_CLOSED
+            )
+            changed_between_steps = [
+                handler
+                for (handler, ids) in zip(tracked, nodes)
+                if np.any(free[ids])
+            ]
+        else:
+            changed_between_steps = tracked
+
+        self._tracked = tracked
+        self._changed_by_segment = changed_by_segment
+        self._changed_between_steps = changed_between_steps
+
+    def mark_elevation_changed(self, nodes=None):
+        """Declare that something outside the plan changed the elevation.
+
+        Parameters
+        ----------
+        nodes : array of int, optional
+            Nodes that were changed. Defaults to all nodes.
+        """
+        for handler in self._tracked:
+            if nodes is None or np.any(
+                np.isin(nodes, handler._lowered_nodes())
+            ):
+                handler._elevation_version += 1
+
+    def run_one_step(self, step):
+        """Run all boundary handlers forward by ``step``.
+
+        Parameters
+        ----------
+        step : float
+            Duration of model time to advance forward.
+        """
+        key = self._current_key()
+        if self._segments is None or key != self._key:
+            self._compile()
+            self._key = key
+        else:
+            for handler in self._changed_between_steps:
+                handler._elevation_version += 1
+        for (segment, changed) in zip(
+            self._segments, self._changed_by_segment
+        ):
+            segment.run_one_step(step)
+            for handler in changed:
+                handler._elevation_version += 1
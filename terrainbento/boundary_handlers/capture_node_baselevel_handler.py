@@ -4,6 +4,8 @@
 **CaptureNodeBaselevelHandler** implements "external" stream capture.
 """
 
+import numpy as np
+
 
 class CaptureNodeBaselevelHandler(object):
     """Turn a closed boundary node into an open, lowering, boundary node.
@@ -12,6 +14,14 @@ class CaptureNodeBaselevelHandler(object):
     and lowers its elevation over time. This is meant as a simple approach to
     model stream capture external to the modeled basin.
 
+    Many capture events can be handled by one **CaptureNodeBaselevelHandler**
+    by passing arrays, with one entry per event, for the capture nodes, times
+    and rates. The start and stop times of all events form a sorted timeline;
+    the rates of the nodes change only when model time passes a time on the
+    timeline, and all captured nodes are lowered with one indexed update per
+    step. **next_event_time** gives the next time on the timeline so that
+    steps can be chosen to end exactly on it.
+
     Note that **CaptureNodeBaselevelHandler** increments time at the end of the
     **run_one_step** method.
     """
@@ -30,19 +40,20 @@ class CaptureNodeBaselevelHandler(object):
         Parameters
         ----------
         grid : landlab model grid
-        capture_node : int
-            Node id of the model grid node that should be captured.
-        capture_start_time : float, optional
+        capture_node : int or array of int
+            Node id of the model grid node that should be captured, or one
+            node id for each capture event.
+        capture_start_time : float or array of float, optional
             Time at which capture should begin. Default is at onset of model
             run.
-        capture_stop_time : float, optional
+        capture_stop_time : float or array of float, optional
             Time at which capture ceases. Default is the entire duration of
-            model run.
-        capture_incision_rate : float, optional
+            model run. In an array, NaN means that the event does not stop.
+        capture_incision_rate : float or array of float, optional
             Rate of capture node elevation change.  Units are implied by the
             model grids spatial scale and the time units of ``step``. Negative
             values mean the outlet lowers. Default value is -0.01.
-        post_capture_incision_rate : float, optional
+        post_capture_incision_rate : float or array of float, optional
             Rate of captured node elevation change after capture ceases.  Units
             are implied by the model grids spatial scale and the time units of
             ``step``. Negative values mean the outlet lowers. Default value is 0.
@@ -51,6 +62,7 @@ class CaptureNodeBaselevelHandler(object):
         --------
         Start by creating a landlab model grid and set its boundary conditions.
 
+        >>> import numpy as np
         >>> from landlab import RasterModelGrid
         >>> mg = RasterModelGrid((5, 5))
         >>> z = mg.add_zeros("node", "topographic__elevation")
@@ -117,7 +129,36 @@ class CaptureNodeBaselevelHandler(object):
          [  0.   0.   0.   0.   0.]
          [  0.   0.   0.   0.   0.]]
 
+        Several capture events are described with arrays. The second and third
+        events capture the same node one after the other.
+
+        >>> mg = RasterModelGrid((5, 5))
+        >>> z = mg.add_zeros("node", "topographic__elevation")
+        >>> bh = CaptureNodeBaselevelHandler(
+        ...     mg,
+        ...     capture_node=[3, 21, 21],
+        ...     capture_start_time=[0, 5, 15],
+        ...     capture_stop_time=[10, 15, np.nan],
+        ...     capture_incision_rate=[-1.0, -2.0, -0.2],
+        ... )
+        >>> bh.next_event_time
+        5.0
+        >>> for _ in range(20):
+        ...     bh.run_one_step(1)
+        >>> print(z.reshape(mg.shape))
+        [[  0.   0.   0. -10.   0.]
+         [  0.   0.   0.   0.   0.]
+         [  0.   0.   0.   0.   0.]
+         [  0.   0.   0.   0.   0.]
+         [  0. -21.   0.   0.   0.]]
+        >>> bh.next_event_time
+        inf
         """
+        if capture_node is None:
+            raise ValueError(
+                "CaptureNodeBaselevelHandler requires a capture_node."
+            )
+
         self.model_time = 0.0
         self.grid = grid
         self.z = grid.at_node["topographic__elevation"]
@@ -136,7 +177,89 @@ class CaptureNodeBaselevelHandler(object):
         else:
             self.post_capture_incision_rate = post_capture_incision_rate
 
-        self.grid.status_at_node[self.node] = self.grid.BC_NODE_IS_FIXED_VALUE
+        # arrays with one entry per capture event.
+        try:
+            (
+                event_nodes,
+                self._start,
+                stop,
+                self._rate,
+                self._post_rate,
+            ) = np.broadcast_arrays(
+                np.atleast_1d(capture_node),
+                capture_start_time,
+                np.inf if capture_stop_time is None else capture_stop_time,
+                capture_incision_rate,
+                self.post_capture_incision_rate,
+            )
+        except ValueError:
+            raise ValueError(
+                "CaptureNodeBaselevelHandler: the capture nodes, times and "
+                "rates must be scalars or arrays of the same length."
+            )
+        if event_nodes.ndim != 1:
+            raise ValueError(
+                "CaptureNodeBaselevelHandler: the capture nodes, times and "
+                "rates must be one dimensional."
+            )
+        self._start = self._start.astype(float)
+        self._stop = np.where(np.isnan(stop.astype(float)), np.inf, stop)
+        self._rate = self._rate.astype(float)
+        self._post_rate = self._post_rate.astype(float)
+
+        self._nodes, self._inverse = np.unique(
+            event_nodes.astype(int), return_inverse=True
+        )
+        self._event_times = np.unique(
+            np.concatenate(
+                (self._start, self._stop[np.isfinite(self._stop)])
+            )
+        )
+        self._timeline_index = None
+        self._node_rate = np.zeros(self._nodes.size)
+
+        self.grid.status_at_node[self._nodes] = (
+            self.grid.BC_NODE_IS_FIXED_VALUE
+        )
+
+    @property
+    def next_event_time(self):
+        """The first start or stop time after the current model time.
+
+        Infinity if no event starts or stops after the current model time.
+        """
+        index = np.searchsorted(self._event_times, self.model_time, "right")
+        if index < self._event_times.size:
+            return float(self._event_times[index])
+        return np.inf
+
+    def _update_node_rates(self):
+        """Find the rate of each captured node if an event time was passed."""
+        index = np.searchsorted(self._event_times, self.model_time, "right")
+        if index != self._timeline_index:
+            started = self.model_time >= self._start
+            stopped = self.model_time >= self._stop
+            event_rate = np.where(
+                started, np.where(stopped, self._post_rate, self._rate), 0.0
+            )
+            self._node_rate = np.bincount(
+                self._inverse, weights=event_rate, minlength=self._nodes.size
+            )
+            self._timeline_index = index
+
+    # Only topographic__elevation is changed at the captured node.
+    _COUPLED_FIELDS = ()
+
+    _reads_elevation = False
+
+    def _lowered_nodes(self):
+        """Return the ids of the captured nodes."""
+        return self._nodes
+
+    def _elevation_change(self, step):
+        """Return the elevation change of the captured nodes over step."""
+        self._update_node_rates()
+        return self._node_rate * step
 
     def run_one_step(self, step):
         """Run **CaptureNodeBaselevelHandler** to update captured node
@@ -158,13 +281,7 @@ class CaptureNodeBaselevelHandler(object):
             Duration of model time to advance forward.
         """
         # lower the correct amount.
-        if self.model_time >= self.start:
-            if self.capture_ends:
-                if self.model_time < self.stop:
-                    self.z[self.node] += self.rate * step
-                else:
-                    self.z[self.node] += self.post_capture_incision_rate * step
-            else:
-                self.z[self.node] += self.rate * step
+        self.z[self._nodes] += self._elevation_change(step)
+
         # increment model time
         self.model_time += step
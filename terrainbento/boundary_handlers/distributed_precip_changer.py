@@ -0,0 +1,444 @@
+# coding: utf8
+# !/usr/env/python
+r"""**DistributedPrecipChanger** changes spatially variable precipitation.
+
+This terrainbento boundary-condition handler is the spatially distributed
+counterpart of :py:class:`~terrainbento.boundary_handlers.precip_changer.PrecipChanger`.
+It uses the same theory to relate changes in the fraction of wet days,
+:math:`F`, and the mean wet-day precipitation depth, :math:`p_d`, to changes in
+the water erodibility coefficient:
+
+.. math::
+
+     K = F_{w} K_{0} = \frac{F \Psi}{F_0 \Psi_0} K_{0}
+
+but :math:`F`, :math:`p_d`, and their rates of change may vary from node to
+node, for example to represent an orographic precipitation gradient. The
+shape factor :math:`c` and the infiltration capacity :math:`I_c` may vary
+between a small number of climate zones.
+
+The adjustment factor :math:`F_{w}` is evaluated for all nodes at once: with
+the closed form of :math:`\Psi` where :math:`I_c = 0`, and with one
+interpolation table per climate zone otherwise. No numerical integration is
+done per node.
+"""
+
+import numpy as np
+
+from terrainbento.boundary_handlers.precip_changer import _PsiEvaluator
+
+
+def _node_values(grid, value, zones, n_zones, name):
+    """Return ``value`` as a float array with one value per node.
+
+    ``value`` may be a scalar, the name of an at-node field, an array with
+    one value per node, or an array with one value per climate zone.
+    """
+    if isinstance(value, str):
+        value = grid.at_node[value]
+    value = np.asarray(value, dtype=float)
+    if value.ndim == 0:
+        return np.full(grid.number_of_nodes, float(value))
+    if value.shape == (grid.number_of_nodes,):
+        return value.copy()
+    if zones is not None and value.shape == (n_zones,):
+        return value[zones]
+    raise ValueError(
+        (
+            "terrainbento DistributedPrecipChanger: {name} must be a "
+            "scalar, the name of an at-node field, or an array with one "
+            "value per node or per climate zone.".format(name=name)
+        )
+    )
+
+
+def _zone_values(value, n_zones, name):
+    """Return ``value`` as a float array with one value per climate zone."""
+    value = np.asarray(value, dtype=float)
+    if value.ndim == 0:
+        return np.full(n_zones, float(value))
+    if value.shape == (n_zones,):
+        return value
+    raise ValueError(
+        (
+            "terrainbento DistributedPrecipChanger: {name} must be a "
+            "scalar or have one value per climate zone.".format(name=name)
+        )
+    )
+
+
+class DistributedPrecipChanger(object):
+    """Handle time varying, spatially variable precipitation.
+
+    The **DistributedPrecipChanger** provides the same methods as
+    :py:class:`~terrainbento.boundary_handlers.precip_changer.PrecipChanger`
+    but **get_current_precip_params** and
+    **get_erodibility_adjustment_factor** return arrays with one value per
+    node. Models pick it up in place of a **PrecipChanger**, and multiply
+    their water erodibility by the adjustment factor array.
+
+    Note that **DistributedPrecipChanger** increments time at the end of the
+    **run_one_step** method.
+    """
+
+    # The handler changes the erodibility, not the topography.
+    _modifies_elevation = False
+
+    def __init__(
+        self,
+        grid,
+        daily_rainfall__intermittency_factor=None,
+        daily_rainfall__intermittency_factor_time_rate_of_change=None,
+        rainfall__mean_rate=None,
+        rainfall__mean_rate_time_rate_of_change=None,
+        rainfall__shape_factor=None,
+        infiltration_capacity=None,
+        climate_zones=None,
+        m_sp=0.5,
+        precipchanger_start_time=0,
+        precipchanger_stop_time=None,
+        **kwargs
+    ):
+        """
+        Parameters
+        ----------
+        grid : landlab model grid
+        daily_rainfall_intermittency_factor : float, str, or array
+            Starting value of the daily rainfall intermittency factor
+            :math:`F`. A scalar, the name of an at-node field, or an array
+            with one value per node or per climate zone. This value is a
+            proportion and ranges from 0 (no rain ever) to 1 (rains every
+            day).
+        daily_rainfall_intermittency_factor__time_rate_of_change : float, str, or array
+            Time rate of change of the daily rainfall intermittency factor
+            :math:`F`, given in the same forms.
+        rainfall__mean_rate : float, str, or array
+            Starting value of the mean daily rainfall intensity :math:`p_d`,
+            given in the same forms.
+        rainfall__mean_rate__time_rate_of_change : float, str, or array
+            Time rate of change of the mean daily rainfall intensity
+            :math:`p_d`, given in the same forms.
+        rainfall__shape_factor : float or array
+            Weibull distribution shape factor :math:`c`, either a scalar or
+            one value per climate zone.
+        infiltration_capacity : float or array
+            Infiltration capacity, either a scalar or one value per climate
+            zone.
+        climate_zones : str or array of int, optional
+            Climate zone of each node, numbered from zero, as an array or the
+            name of an at-node field. Default is None, which puts all nodes in
+            a single zone.
+        m_sp : float, optional
+            Drainage area exponent in erosion rule, :math:`m`.  Default value
+            is 0.5.
+        precipchanger_start_time : float, optional
+            Model time at which changing the precipitation should start.
+            Default is at the onset of the model run.
+        precipchanger_stop_time : float, optional
+            Model time at which changing the precipitation statistics should
+            end. Default is no end time.
+
+        Examples
+        --------
+        Start by creating a landlab model grid with a precipitation gradient
+        and two climate zones with different infiltration capacities.
+
+        >>> import numpy as np
+        >>> from landlab import RasterModelGrid
+        >>> mg = RasterModelGrid((3, 4))
+        >>> zones = (mg.x_of_node > 1.5).astype(int)
+
+        Now import the **DistributedPrecipChanger** and instantiate.
+
+        >>> from terrainbento.boundary_handlers import DistributedPrecipChanger
+        >>> bh = DistributedPrecipChanger(
+        ...    mg,
+        ...    daily_rainfall__intermittency_factor=0.3,
+        ...    daily_rainfall__intermittency_factor_time_rate_of_change=0.01,
+        ...    rainfall__mean_rate=1.0 + mg.x_of_node,
+        ...    rainfall__mean_rate_time_rate_of_change=0.2,
+        ...    rainfall__shape_factor=0.65,
+        ...    infiltration_capacity=[0.0, 0.5],
+        ...    climate_zones=zones)
+
+        After ten time units the parameters have changed at every node.
+
+        >>> bh.run_one_step(10.0)
+        >>> I, pd = bh.get_current_precip_params()
+        >>> np.round(I[:4], 2)
+        array([ 0.4,  0.4,  0.4,  0.4])
+        >>> np.round(pd[:4], 2)
+        array([ 3.,  4.,  5.,  6.])
+        >>> fw = bh.get_erodibility_adjustment_factor()
+        >>> fw.shape
+        (12,)
+
+        The adjustment factor can be applied to an erodibility array in
+        place.
+
+        >>> K = np.full(mg.number_of_nodes, 0.001)
+        >>> out = np.empty_like(K)
+        >>> _ = bh.adjust_erodibility(K, out=out)
+        >>> np.allclose(out, K * fw)
+        True
+        """
+        required = {
+            "daily_rainfall__intermittency_factor": (
+                daily_rainfall__intermittency_factor
+            ),
+            "daily_rainfall__intermittency_factor_time_rate_of_change": (
+                daily_rainfall__intermittency_factor_time_rate_of_change
+            ),
+            "rainfall__mean_rate": rainfall__mean_rate,
+            "rainfall__mean_rate_time_rate_of_change": (
+                rainfall__mean_rate_time_rate_of_change
+            ),
+            "rainfall__shape_factor": rainfall__shape_factor,
+            "infiltration_capacity": infiltration_capacity,
+        }
+        for name in required:
+            if required[name] is None:
+                msg = (
+                    "terrainbento DistributedPrecipChanger requires the "
+                    "parameter " + name
+                )
+                raise ValueError(msg)
+
+        self._grid = grid
+
+        if climate_zones is None:
+            zones = None
+            n_zones = 1
+        else:
+            if isinstance(climate_zones, str):
+                climate_zones = grid.at_node[climate_zones]
+            zones = np.asarray(climate_zones, dtype=int)
+            if zones.shape != (grid.number_of_nodes,) or np.any(zones < 0):
+                raise ValueError(
+                    (
+                        "terrainbento DistributedPrecipChanger: "
+                        "climate_zones must give a zone number >= 0 for "
+                        "every node."
+                    )
+                )
+            n_zones = zones.max() + 1
+
+        self.model_time = 0.0
+
+        if precipchanger_stop_time is None:
+            self.no_stop_time = True
+        else:
+            self.no_stop_time = False
+            self.stop_time = precipchanger_stop_time
+        self.start_time = precipchanger_start_time
+
+        self.starting_frac_wet_days = _node_values(
+            grid,
+            daily_rainfall__intermittency_factor,
+            zones,
+            n_zones,
+            "daily_rainfall__intermittency_factor",
+        )
+        self.frac_wet_days_rate_of_change = _node_values(
+            grid,
+            daily_rainfall__intermittency_factor_time_rate_of_change,
+            zones,
+            n_zones,
+            "daily_rainfall__intermittency_factor_time_rate_of_change",
+        )
+        self.starting_daily_mean_depth = _node_values(
+            grid, rainfall__mean_rate, zones, n_zones, "rainfall__mean_rate"
+        )
+        self.mean_depth_rate_of_change = _node_values(
+            grid,
+            rainfall__mean_rate_time_rate_of_change,
+            zones,
+            n_zones,
+            "rainfall__mean_rate_time_rate_of_change",
+        )
+        self.rainfall__shape_factor = _zone_values(
+            rainfall__shape_factor, n_zones, "rainfall__shape_factor"
+        )
+        self.infilt_cap = _zone_values(
+            infiltration_capacity, n_zones, "infiltration_capacity"
+        )
+        self.m = m_sp
+
+        _check_intermittency_values(self.starting_frac_wet_days)
+        _check_mean_depths(self.starting_daily_mean_depth)
+        if np.any(self.infilt_cap < 0.0):
+            raise ValueError(
+                (
+                    "The DistributedPrecipChanger infiltration_capacity has "
+                    "a value of less than zero. This is invalid."
+                )
+            )
+
+        # nodes of each zone, and a Psi evaluator per zone covering the mean
+        # depths at the start and, if known, the end of the change.
+        if zones is None:
+            self._zone_nodes = [slice(None)]
+        else:
+            self._zone_nodes = [
+                np.flatnonzero(zones == zone) for zone in range(n_zones)
+            ]
+        end_depth = self.starting_daily_mean_depth
+        if not self.no_stop_time:
+            end_depth = end_depth + self.mean_depth_rate_of_change * (
+                self.stop_time
+            )
+        self._psi = []
+        for zone, nodes in enumerate(self._zone_nodes):
+            depths = np.concatenate(
+                (self.starting_daily_mean_depth[nodes], end_depth[nodes])
+            )
+            self._psi.append(
+                _PsiEvaluator(
+                    self.infilt_cap[zone],
+                    self.rainfall__shape_factor[zone],
+                    self.m,
+                    mean_depths=np.clip(depths, 0.0, None),
+                )
+            )
+
+        self._frac_wet_days = np.empty(grid.number_of_nodes)
+        self._mean_depth = np.empty(grid.number_of_nodes)
+        self._adjustment_factor = np.ones(grid.number_of_nodes)
+        self._adjustment_factor_time = None
+
+        self.starting_psi = self._evaluate_psi(self.starting_daily_mean_depth)
+        self._starting_denominator = (
+            self.starting_frac_wet_days * self.starting_psi
+        )
+
+    def _evaluate_psi(self, mean_depth):
+        """Evaluate Psi at every node, one climate zone at a time."""
+        psi = np.empty_like(mean_depth)
+        for nodes, evaluator in zip(self._zone_nodes, self._psi):
+            psi[nodes] = evaluator(mean_depth[nodes])
+        return psi
+
+    def get_current_precip_params(self):
+        """Return current values precipitation parameters.
+
+        The arrays returned are updated in place by later calls.
+
+        Returns
+        -------
+        daily_rainfall_rainfall_intermittency_factor : array
+        rainfall__mean_rate : array
+        """
+        # if after start time
+        if self.model_time > self.start_time:
+
+            # get current evaluation time
+            if self.no_stop_time:
+                time = self.model_time
+            else:
+                time = min(self.model_time, self.stop_time)
+
+            # calculate and return updated values
+            np.multiply(
+                self.frac_wet_days_rate_of_change,
+                time,
+                out=self._frac_wet_days,
+            )
+            self._frac_wet_days += self.starting_frac_wet_days
+            np.multiply(
+                self.mean_depth_rate_of_change, time, out=self._mean_depth
+            )
+            self._mean_depth += self.starting_daily_mean_depth
+
+            _check_intermittency_values(self._frac_wet_days)
+            _check_mean_depths(self._mean_depth)
+        else:
+            # otherwise return starting values.
+            self._frac_wet_days[:] = self.starting_frac_wet_days
+            self._mean_depth[:] = self.starting_daily_mean_depth
+        return self._frac_wet_days, self._mean_depth
+
+    def get_erodibility_adjustment_factor(self):
+        r"""Calculate the erodibility adjustment factor at every node.
+
+        .. math::
+
+             K = F_{w} K_{0} = \frac{F \Psi}{F_0 \Psi_0} K_{0}
+
+        The factor is computed once per model time and the same array is
+        returned, and updated in place, on every call.
+
+        Returns
+        -------
+        erodibility_adjustment_factor : array
+        """
+        if self._adjustment_factor_time != self.model_time:
+            if self.model_time > self.start_time:
+                frac_wet, mean_depth = self.get_current_precip_params()
+                np.multiply(
+                    frac_wet,
+                    self._evaluate_psi(mean_depth),
+                    out=self._adjustment_factor,
+                )
+                np.divide(
+                    self._adjustment_factor,
+                    self._starting_denominator,
+                    out=self._adjustment_factor,
+                )
+            else:
+                self._adjustment_factor.fill(1.0)
+            self._adjustment_factor_time = self.model_time
+        return self._adjustment_factor
+
+    def adjust_erodibility(self, erodibility, out=None):
+        """Multiply ``erodibility`` by the current adjustment factor.
+
+        Parameters
+        ----------
+        erodibility : float or array
+            Erodibility before adjustment, :math:`K_0`.
+        out : array, optional
+            Array in which to place the result, e.g. the erodibility field
+            of an eroder. Default is None, which allocates a new array.
+
+        Returns
+        -------
+        array
+        """
+        return np.multiply(
+            erodibility, self.get_erodibility_adjustment_factor(), out=out
+        )
+
+    def run_one_step(self, step):
+        """Run **DistributedPrecipChanger** forward and update model time.
+
+        Parameters
+        ----------
+        step : float
+            Duration of model time to advance forward.
+        """
+        self.model_time += step
+
+
+def _check_intermittency_values(rainfall_intermittency_factor):
+    """Check that rainfall_intermittency_factor is >= 0 and <=1."""
+    if np.any(rainfall_intermittency_factor < 0.0) or np.any(
+        rainfall_intermittency_factor > 1.0
+    ):
+        raise ValueError(
+            (
+                "The DistributedPrecipChanger rainfall_intermittency_factor "
+                "has a value of less than zero or greater than one. "
+                "This is invalid."
+            )
+        )
+
+
+def _check_mean_depths(mean_depth):
+    """Check that mean depth is >= 0."""
+    if np.any(mean_depth < 0):
+        raise ValueError(
+            (
+                "The DistributedPrecipChanger mean depth has a "
+                "value of less than zero. This is invalid."
+            )
+        )
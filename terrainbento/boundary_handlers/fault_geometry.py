@@ -0,0 +1,320 @@
+# coding: utf8
+# !/usr/env/python
+"""Reuse the hanging wall of a **NormalFault** across models.
+
+Landlab's **NormalFault** finds the nodes of its hanging wall, the block that
+is uplifted, when it is created. Models of an ensemble are usually built on
+identical grids with the same fault, so the geometry is the same for every
+member. A **CachedNormalFault** looks the hanging wall up in a
+**FaultGeometryCache** and only finds it when the cache does not have it.
+
+The cache is keyed by the grid geometry (shape, spacing and origin of a
+raster grid, or a hash of the node coordinates of any other grid), the node
+status when boundary nodes are not faulted, and the fault trace. The cached
+arrays are read only, so they are shared by every fault that uses them.
+
+A cache can also be exported to shared memory, so that ensemble workers in
+other processes attach to the hanging walls found by the parent process
+instead of each finding them again:
+
+.. code-block:: python
+
+    shared = FaultGeometryCache.default().export()
+    # pass ``shared`` to each worker, which then calls
+    FaultGeometryCache.default().attach(shared)
+"""
+
+import hashlib
+
+import numpy as np
+from landlab import RasterModelGrid
+from landlab.components import NormalFault
+
+_DEFAULT_FAULT_TRACE = (("x1", 0), ("y1", 0), ("x2", 1), ("y2", 1))
+
+
+def _digest(*arrays):
+    """Return a hash of the contents of some arrays."""
+    sha = hashlib.sha1()
+    for array in arrays:
+        sha.update(np.ascontiguousarray(array).view(np.uint8))
+    return sha.hexdigest()
+
+
+def fault_geometry_key(grid, fault_trace, include_boundaries=False):
+    """Return the key of the hanging wall of a fault on a grid.
+
+    Parameters
+    ----------
+    grid : landlab model grid
+    fault_trace : dict
+        Fault trace, as given to **NormalFault**.
+    include_boundaries : bool, optional
+        Whether boundary nodes are faulted. Default is False.
+
+    Returns
+    -------
+    tuple
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from terrainbento.boundary_handlers.fault_geometry import (
+    ...     fault_geometry_key)
+    >>> trace = {"x1": 0, "y1": 0, "x2": 4, "y2": 3}
+    >>> key = fault_geometry_key(RasterModelGrid((4, 5)), trace)
+    >>> key == fault_geometry_key(RasterModelGrid((4, 5)), trace)
+    True
+    >>> key == fault_geometry_key(RasterModelGrid((5, 5)), trace)
+    False
+    """
+    if isinstance(grid, RasterModelGrid):
+        grid_key = (
+            type(grid).__name__,
+            tuple(grid.shape),
+            tuple(float(d) for d in grid.spacing),
+            tuple(float(c) for c in grid.xy_of_lower_left),
+        )
+    else:
+        grid_key = (
+            type(grid).__name__,
+            grid.number_of_nodes,
+            _digest(grid.x_of_node, grid.y_of_node),
+        )
+    if include_boundaries:
+        status_key = None
+    else:
+        status_key = _digest(grid.status_at_node)
+    trace = dict(fault_trace)
+    trace_key = tuple(
+        float(trace[name]) for name in ("x1", "y1", "x2", "y2")
+    )
+    return (grid_key, status_key, trace_key, bool(include_boundaries))
+
+
+class FaultGeometryCache(object):
+    """Read only hanging walls of faults, shared by key.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.boundary_handlers import FaultGeometryCache
+    >>> cache = FaultGeometryCache()
+    >>> cache.get("key") is None
+    True
+    >>> faulted = cache.store("key", np.array([False, True, True]))
+    >>> cache.get("key") is faulted
+    True
+    >>> faulted.flags.writeable
+    False
+    """
+
+    _default = None
+
+    def __init__(self):
+        self._faulted_nodes = {}
+        self._shared_memory = []
+
+    @classmethod
+    def default(cls):
+        """Return the cache shared by all models in this process."""
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def __len__(self):
+        return len(self._faulted_nodes)
+
+    def get(self, key):
+        """Return the hanging wall stored with ``key``, or None."""
+        return self._faulted_nodes.get(key)
+
+    def store(self, key, faulted_nodes):
+        """Store a read only copy of a hanging wall and return it.
+
+        Parameters
+        ----------
+        key : tuple
+            Key from **fault_geometry_key**.
+        faulted_nodes : array of bool
+            At node array that is True on the hanging wall.
+
+        Returns
+        -------
+        array of bool
+        """
+        faulted_nodes = np.array(faulted_nodes, dtype=bool)
+        faulted_nodes.flags.writeable = False
+        self._faulted_nodes[key] = faulted_nodes
+        return faulted_nodes
+
+    def clear(self):
+        """Forget all hanging walls and release any shared memory.
+
+        Shared memory that is still used by a fault is closed when the fault
+        is deleted.
+        """
+        self._faulted_nodes.clear()
+        for (shm, owner) in self._shared_memory:
+            try:
+                shm.close()
+            except BufferError:
+                pass
+            if owner:
+                shm.unlink()
+        self._shared_memory = []
+
+    def export(self):
+        """Copy the hanging walls into a block of shared memory.
+
+        The block belongs to this cache and is released by **clear**.
+
+        Returns
+        -------
+        tuple
+            Name of the block and the key, offset and size of each hanging
+            wall in it. The tuple can be pickled and sent to other processes,
+            which pass it to **attach**.
+        """
+        from multiprocessing import shared_memory
+
+        keys = list(self._faulted_nodes)
+        sizes = [self._faulted_nodes[key].size for key in keys]
+        shm = shared_memory.SharedMemory(create=True, size=max(sum(sizes), 1))
+        self._shared_memory.append((shm, True))
+
+        layout = []
+        offset = 0
+        for (key, size) in zip(keys, sizes):
+            np.ndarray(size, dtype=bool, buffer=shm.buf, offset=offset)[
+                :
+            ] = self._faulted_nodes[key]
+            layout.append((key, offset, size))
+            offset += size
+        return (shm.name, tuple(layout))
+
+    def attach(self, shared):
+        """Use the hanging walls exported by another cache.
+
+        The hanging walls are read only views of the shared memory, so they
+        are not copied.
+
+        Parameters
+        ----------
+        shared : tuple
+            Value returned by **export**.
+        """
+        from multiprocessing import shared_memory
+
+        (name, layout) = shared
+        shm = shared_memory.SharedMemory(name=name)
+        self._shared_memory.append((shm, False))
+        for (key, offset, size) in layout:
+            faulted_nodes = np.ndarray(
+                size, dtype=bool, buffer=shm.buf, offset=offset
+            )
+            faulted_nodes.flags.writeable = False
+            self._faulted_nodes[key] = faulted_nodes
+
+
+class _CoreFreeGrid(object):
+    """View of a grid with no core nodes, for a fault with a known wall."""
+
+    def __init__(self, grid):
+        self._grid = grid
+
+    @property
+    def core_nodes(self):
+        return np.empty(0, dtype=int)
+
+    def __getitem__(self, at):
+        return self._grid[at]
+
+    def __getattr__(self, name):
+        return getattr(self._grid, name)
+
+
+class CachedNormalFault(NormalFault):
+    """A **NormalFault** whose hanging wall is kept in a cache.
+
+    A **CachedNormalFault** takes the same parameters as landlab's
+    **NormalFault**, and a ``geometry_cache``. It moves the same nodes as a
+    **NormalFault** would, but finds them only if the cache does not already
+    hold the hanging wall for the grid and fault trace.
+
+    Examples
+    --------
+    >>> from landlab import RasterModelGrid
+    >>> from terrainbento.boundary_handlers import (
+    ...     CachedNormalFault,
+    ...     FaultGeometryCache,
+    ... )
+    >>> cache = FaultGeometryCache()
+    >>> trace = {"x1": 0, "y1": 0, "x2": 4, "y2": 3}
+    >>> grids = [RasterModelGrid((4, 5)) for _ in range(2)]
+    >>> for grid in grids:
+    ...     _ = grid.add_zeros("node", "topographic__elevation")
+    >>> faults = [
+    ...     CachedNormalFault(grid, fault_trace=trace, geometry_cache=cache)
+    ...     for grid in grids
+    ... ]
+    >>> len(cache)
+    1
+    >>> faults[0].faulted_nodes is faults[1].faulted_nodes
+    True
+    >>> faults[1].run_one_step(1000.0)
+    >>> print(grids[1].at_node["topographic__elevation"].reshape((4, 5)))
+    [[ 0.  0.  0.  0.  0.]
+     [ 0.  1.  0.  0.  0.]
+     [ 0.  1.  1.  0.  0.]
+     [ 0.  0.  0.  0.  0.]]
+    """
+
+    def __init__(
+        self,
+        grid,
+        fault_trace=_DEFAULT_FAULT_TRACE,
+        include_boundaries=False,
+        geometry_cache=None,
+        **kwds
+    ):
+        """
+        Parameters
+        ----------
+        grid : landlab model grid
+        fault_trace : dict, optional
+            Fault trace, as given to **NormalFault**.
+        include_boundaries : bool, optional
+            Whether boundary nodes are faulted. Default is False.
+        geometry_cache : FaultGeometryCache, optional
+            Cache of hanging walls. Default is the cache shared by all models
+            in the process.
+        **kwds :
+            Other parameters of **NormalFault**.
+        """
+        cache = geometry_cache
+        if cache is None:
+            cache = FaultGeometryCache.default()
+        key = fault_geometry_key(grid, fault_trace, include_boundaries)
+        faulted_nodes = cache.get(key)
+        if faulted_nodes is None:
+            NormalFault.__init__(
+                self,
+                grid,
+                fault_trace=fault_trace,
+                include_boundaries=include_boundaries,
+                **kwds
+            )
+            self._faulted_nodes = cache.store(key, self._faulted_nodes)
+        else:
+            # let NormalFault look at no nodes, then use the cached wall.
+            NormalFault.__init__(
+                self,
+                _CoreFreeGrid(grid),
+                fault_trace=fault_trace,
+                include_boundaries=False,
+                **kwds
+            )
+            self._grid = grid
+            self._include_boundaries = include_boundaries
+            self._faulted_nodes = faulted_nodes
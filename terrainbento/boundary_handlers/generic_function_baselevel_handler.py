@@ -2,6 +2,8 @@
 # !/usr/env/python
 """**GenericFuncBaselevelHandler** modifies elevation for not-core nodes."""
 
+import numpy as np
+
 
 class GenericFuncBaselevelHandler(object):
     """Control the elevation of all nodes that are not core nodes.
@@ -24,6 +26,12 @@ class GenericFuncBaselevelHandler(object):
     is an at-node model grid field. It will modify this field as well as
     the field ``bedrock__elevation``, if it exists.
 
+    The attribute ``nodes_to_lower`` is a boolean array, one value per node,
+    that is True at the nodes the handler changes. It is set from the status
+    of the nodes when the handler is created and is refreshed when a model
+    finds that the status has changed. Each step only touches the ids of
+    these nodes, found once when ``nodes_to_lower`` is set.
+
     Note that **GenericFuncBaselevelHandler** increments time at the end of the
     **run_one_step** method.
     """
@@ -35,6 +43,9 @@ class GenericFuncBaselevelHandler(object):
         function=lambda grid, t: (
             0 * grid.x_of_node + 0 * grid.y_of_node + 0 * t
         ),
+        time_invariant=False,
+        time_function=None,
+        batch_size=1,
         **kwargs
     ):
         """
@@ -52,6 +63,26 @@ class GenericFuncBaselevelHandler(object):
             number of nodes. If a constant value is desired, used
             **NotCoreNodeBaselevelHandler** instead. The default function is:
             ``lambda grid, t: (0 * grid.x_of_node + 0 * grid.y_of_node + 0 * t)``
+            The function may instead return an array with one value for each
+            node to be modified.
+        time_invariant : boolean, optional
+            Declare that ``function`` does not depend on time or on the state
+            of the grid. It is then evaluated once and the result reused, so
+            each step costs a single multiplication. Default is False.
+        time_function : function, optional
+            Function of model time only. If provided, the rate of elevation
+            change is separable: ``function`` gives its spatial pattern and
+            is evaluated once, with ``t=0``, and ``time_function(t)`` scales
+            the pattern at each step. Default is None.
+        batch_size : int, optional
+            Number of steps for which ``function`` (or ``time_function``) is
+            evaluated in one call. If greater than one, the function is called
+            with a column array of future times, ``t`` of shape
+            ``(batch_size, 1)`` (or ``(batch_size,)`` for ``time_function``),
+            and must return one row of values per time. The batch assumes
+            steps of equal length and is evaluated again if the step changes.
+            If the result does not have one row per time, the handler falls
+            back to calling the function once per step. Default is 1.
 
         Examples
         --------
@@ -138,6 +169,26 @@ class GenericFuncBaselevelHandler(object):
         grid in the desired way and then return an array of zeros of size
         (n_nodes,).
 
+        If the rate of change is a fixed spatial pattern scaled by a function
+        of time, declare it with ``time_function``. The pattern is computed
+        once and each step only scales it.
+
+        >>> mg = RasterModelGrid((5, 5))
+        >>> z = mg.add_zeros("node", "topographic__elevation")
+        >>> bh = GenericFuncBaselevelHandler(
+        ...     mg,
+        ...     modify_core_nodes=True,
+        ...     function=lambda grid, t: -grid.x_of_node,
+        ...     time_function=lambda t: 1.0 + t,
+        ... )
+        >>> bh.run_one_step(1.0)
+        >>> bh.run_one_step(1.0)
+        >>> print(z.reshape(mg.shape))
+        [[ 0.  0.  0.  0.  0.]
+         [ 0.  3.  6.  9.  0.]
+         [ 0.  3.  6.  9.  0.]
+         [ 0.  3.  6.  9.  0.]
+         [ 0.  0.  0.  0.  0.]]
         """
         self.model_time = 0.0
         self.grid = grid
@@ -150,22 +201,6 @@ class GenericFuncBaselevelHandler(object):
             )
             raise ValueError(msg)
 
-        test_dzdt = function(self.grid, self.model_time)
-
-        if hasattr(test_dzdt, "shape"):
-            if test_dzdt.shape != self.grid.x_of_node.shape:
-                msg = (
-                    "GenericFuncBaselevelHandler: function must return an "
-                    "array of shape (n_nodes,)"
-                )
-                raise ValueError(msg)
-        else:
-            msg = (
-                "GenericFuncBaselevelHandler: function must return an "
-                "array of shape (n_nodes,)"
-            )
-            raise ValueError(msg)
-
         self.function = function
         self.modify_core_nodes = modify_core_nodes
         self.z = self.grid.at_node["topographic__elevation"]
@@ -178,6 +213,141 @@ class GenericFuncBaselevelHandler(object):
         else:
             self.nodes_to_lower = self.grid.status_at_node != 0
             self.prefactor = 1.0
+        # ids of the nodes to lower, so that each step only touches them.
+        self._node_ids = np.flatnonzero(self.nodes_to_lower)
+
+        self.dzdt = function(self.grid, self.model_time)
+        if not hasattr(self.dzdt, "shape"):
+            msg = (
+                "GenericFuncBaselevelHandler: function must return an "
+                "array of shape (n_nodes,)"
+            )
+            raise ValueError(msg)
+        self._at_lowered_nodes(self.dzdt)
+
+        if time_invariant and time_function is not None:
+            msg = (
+                "GenericFuncBaselevelHandler: a function with a "
+                "time_function cannot also be time_invariant."
+            )
+            raise ValueError(msg)
+        if time_function is not None and not np.isscalar(
+            time_function(self.model_time)
+        ):
+            msg = (
+                "GenericFuncBaselevelHandler: time_function must return a "
+                "scalar."
+            )
+            raise ValueError(msg)
+        if int(batch_size) != batch_size or batch_size < 1:
+            msg = (
+                "GenericFuncBaselevelHandler: batch_size must be a positive "
+                "integer."
+            )
+            raise ValueError(msg)
+
+        self.time_invariant = time_invariant
+        self.time_function = time_function
+        self.batch_size = int(batch_size)
+
+        # the spatial pattern of a time invariant or separable function,
+        # multiplied by the prefactor, at the nodes to lower.
+        self._pattern = None
+        if time_invariant or time_function is not None:
+            self._pattern = self.prefactor * self._at_lowered_nodes(self.dzdt)
+
+        # values of the last batch of evaluations.
+        self._batch_start = None
+        self._batch_step = None
+        self._batch_values = None
+        self._batch_failed = False
+
+    # Fields lowered along with topographic__elevation, if they exist.
+    _COUPLED_FIELDS = ("bedrock__elevation", "lithology_contact__elevation")
+
+    @property
+    def _reads_elevation(self):
+        """True if the function is called, with the grid, at every step."""
+        return self.time_function is None and not self.time_invariant
+
+    def _lowered_nodes(self):
+        """Return the ids of the nodes to lower, refreshed from node status."""
+        if self.modify_core_nodes:
+            nodes_to_lower = self.grid.status_at_node == 0
+        else:
+            nodes_to_lower = self.grid.status_at_node != 0
+        if not np.array_equal(nodes_to_lower, self.nodes_to_lower):
+            self.nodes_to_lower = nodes_to_lower
+            self._node_ids = np.flatnonzero(nodes_to_lower)
+            self._pattern = None
+            self._batch_values = None
+        return self._node_ids
+
+    def _at_lowered_nodes(self, dzdt):
+        """Return the values of ``dzdt`` at the nodes to lower."""
+        if dzdt.shape == self.grid.x_of_node.shape:
+            return dzdt[self._node_ids]
+        elif dzdt.shape == self._node_ids.shape:
+            return dzdt
+        msg = (
+            "GenericFuncBaselevelHandler: function must return an "
+            "array of shape (n_nodes,)"
+        )
+        raise ValueError(msg)
+
+    def _evaluate(self, evaluate, step, column=False):
+        """Return ``evaluate(model_time)``, using batches if requested.
+
+        A batch of times is passed as a column if ``column`` is True, and the
+        result must then be two dimensional; otherwise it must be one
+        dimensional.
+        """
+        if self.batch_size == 1 or self._batch_failed:
+            return evaluate(self.model_time)
+
+        if self._batch_values is not None and step == self._batch_step:
+            index = int(round((self.model_time - self._batch_start) / step))
+            if 0 <= index < self.batch_size and np.isclose(
+                self._batch_start + index * step,
+                self.model_time,
+                rtol=1e-12,
+                atol=0.0,
+            ):
+                return self._batch_values[index]
+
+        times = self.model_time + step * np.arange(self.batch_size)
+        if column:
+            times = times.reshape((-1, 1))
+        values = np.asarray(evaluate(times))
+        if values.ndim != times.ndim or values.shape[0] != self.batch_size:
+            # the function does not broadcast over time.
+            self._batch_failed = True
+            self._batch_values = None
+            return evaluate(self.model_time)
+        self._batch_values = values
+        self._batch_start = self.model_time
+        self._batch_step = step
+        return self._batch_values[0]
+
+    def _elevation_change(self, step):
+        """Return the elevation change of the nodes to lower over step."""
+        if self.time_function is None and not self.time_invariant:
+            if self.batch_size == 1:
+                self.dzdt = self.function(self.grid, self.model_time)
+            else:
+                self.dzdt = self._evaluate(
+                    lambda t: self.function(self.grid, t), step, column=True
+                )
+            return self.prefactor * self._at_lowered_nodes(self.dzdt) * step
+
+        if self._pattern is None:
+            self.dzdt = self.function(self.grid, 0.0)
+            self._pattern = self.prefactor * self._at_lowered_nodes(self.dzdt)
+        if self.time_invariant:
+            return self._pattern * step
+        return self._pattern * (
+            step * self._evaluate(self.time_function, step)
+        )
 
     def run_one_step(self, step):
         """Run **GenericFuncBaselevelHandler** forward and update elevations.
@@ -197,20 +367,15 @@ class GenericFuncBaselevelHandler(object):
         step : float
             Duration of model time to advance forward.
         """
-        self.dzdt = self.function(self.grid, self.model_time)
+        dz = self._elevation_change(step)
 
         # calculate lowering amount and subtract
-        self.z[self.nodes_to_lower] += (
-            self.prefactor * self.dzdt[self.nodes_to_lower] * step
-        )
+        self.z[self._node_ids] += dz
 
         # if bedrock__elevation exists as a field, lower it also
-        other_fields = ["bedrock__elevation", "lithology_contact__elevation"]
-        for of in other_fields:
+        for of in self._COUPLED_FIELDS:
             if of in self.grid.at_node:
-                self.grid.at_node[of][self.nodes_to_lower] += (
-                    self.prefactor * self.dzdt[self.nodes_to_lower] * step
-                )
+                self.grid.at_node[of][self._node_ids] += dz
 
         # increment model time
         self.model_time += step
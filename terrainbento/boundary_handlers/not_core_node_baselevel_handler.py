@@ -5,7 +5,8 @@
 import os
 
 import numpy as np
-from scipy.interpolate import interp1d
+
+from terrainbento.utilities import TimeSeriesInterpolator, load_time_series
 
 
 class NotCoreNodeBaselevelHandler(object):
@@ -25,10 +26,20 @@ class NotCoreNodeBaselevelHandler(object):
     is an at-node model grid field. It will modify this field as well as
     the field ``bedrock__elevation``, if it exists.
 
+    When the lowering follows a ``lowering_file_path``, each step needs the
+    mean elevation of the nodes to lower. Within a **BaselevelUpdatePlan**
+    the handler keeps the mean it set in the last step and takes the mean
+    over the nodes again only when the plan reports that something else may
+    have changed them.
+
     Note that **NotCoreNodeBaselevelHandler** increments time at the end of the
     **run_one_step** method.
     """
 
+    # Set by a BaselevelUpdatePlan and incremented whenever something other
+    # than the handler may have changed the nodes to lower.
+    _elevation_version = None
+
     def __init__(
         self,
         grid,
@@ -57,6 +68,8 @@ class NotCoreNodeBaselevelHandler(object):
             the model grids spatial scale and the time units of ``step``.
             This file should be readable with
             ``np.loadtxt(filename, skiprows=1, delimiter=",")``
+            or be a ``.npy`` file with the same columns, which is memory
+            mapped rather than read into memory.
             Its first column is time and its second colum is the elevation
             change at the outlet since the onset of the model run. Negative
             values mean the outlet lowers.
@@ -147,6 +160,13 @@ class NotCoreNodeBaselevelHandler(object):
         else:
             self.nodes_to_lower = self.grid.status_at_node != 0
             self.prefactor = 1.0
+        # ids of the nodes to lower, so that each step only touches them.
+        self._node_ids = np.flatnonzero(self.nodes_to_lower)
+
+        # mean elevation of the nodes to lower after the last step, and the
+        # elevation version it belongs to.
+        self._tracked_mean = None
+        self._tracked_version = None
 
         if (lowering_file_path is None) and (lowering_rate is None):
             raise ValueError(
@@ -160,15 +180,11 @@ class NotCoreNodeBaselevelHandler(object):
                 # initialize outlet elevation object
                 if os.path.exists(lowering_file_path):
 
-                    elev_change_df = np.loadtxt(
-                        lowering_file_path, skiprows=1, delimiter=","
-                    )
+                    elev_change_df = load_time_series(lowering_file_path)
                     time = elev_change_df[:, 0]
                     elev_change = elev_change_df[:, 1]
 
-                    model_start_elevation = np.mean(
-                        self.z[self.nodes_to_lower]
-                    )
+                    model_start_elevation = np.mean(self.z[self._node_ids])
 
                     if model_end_elevation is None:
                         self.scaling_factor = 1.0
@@ -177,14 +193,13 @@ class NotCoreNodeBaselevelHandler(object):
                             model_start_elevation - model_end_elevation
                         ) / np.abs(elev_change[0] - elev_change[-1])
 
-                    outlet_elevation = (
-                        self.scaling_factor
-                        * self.prefactor
-                        * elev_change_df[:, 1]
-                    ) + model_start_elevation
-
-                    self.outlet_elevation_obj = interp1d(
-                        time, outlet_elevation
+                    # the history is scaled on lookup, so that a memory
+                    # mapped column is not read in full.
+                    self.outlet_elevation_obj = TimeSeriesInterpolator(
+                        time,
+                        elev_change,
+                        scale=self.scaling_factor * self.prefactor,
+                        offset=model_start_elevation,
                     )
                     self.lowering_rate = None
                 else:
@@ -208,6 +223,54 @@ class NotCoreNodeBaselevelHandler(object):
                     )
                 )
 
+    # Fields lowered along with topographic__elevation, if they exist.
+    _COUPLED_FIELDS = ("bedrock__elevation", "lithology_contact__elevation")
+
+    @property
+    def _reads_elevation(self):
+        """True if the elevation change depends on the current elevation."""
+        return self.outlet_elevation_obj is not None
+
+    def _lowered_nodes(self):
+        """Return the ids of the nodes to lower, refreshed from node status."""
+        if self.modify_core_nodes:
+            self.nodes_to_lower = self.grid.status_at_node == 0
+        else:
+            self.nodes_to_lower = self.grid.status_at_node != 0
+        node_ids = np.flatnonzero(self.nodes_to_lower)
+        if not np.array_equal(node_ids, self._node_ids):
+            self._node_ids = node_ids
+            self._tracked_mean = None
+        return self._node_ids
+
+    def _mean_elevation(self):
+        """Return the mean elevation of the nodes to lower.
+
+        The mean set by the last step is used while the elevation version
+        given by a **BaselevelUpdatePlan** has not changed since.
+        """
+        if (
+            self._tracked_mean is not None
+            and self._elevation_version is not None
+            and self._tracked_version == self._elevation_version
+        ):
+            return self._tracked_mean
+        return np.mean(self.z[self._node_ids])
+
+    def _elevation_change(self, step):
+        """Return the elevation change of the nodes to lower over step."""
+        # if we do not have an outlet elevation object, use the rate.
+        if self.outlet_elevation_obj is None:
+            return self.prefactor * self.lowering_rate * step
+
+        # calcuate the topographic change required to match the current
+        # time"s value for outlet elevation.
+        target = self.outlet_elevation_obj(self.model_time)
+        self.topo_change = self._mean_elevation() - target
+        self._tracked_mean = target
+        self._tracked_version = self._elevation_version
+        return -self.topo_change
+
     def run_one_step(self, step):
         """Run **NotCoreNodeBaselevelHandler** forward and update elevations.
 
@@ -226,50 +289,17 @@ class NotCoreNodeBaselevelHandler(object):
         step : float
             Duration of model time to advance forward.
         """
-        # next, lower the correct nodes the desired amount
-        # first, if we do not have an outlet elevation object
-        if self.outlet_elevation_obj is None:
-
-            # calculate lowering amount and subtract
-            self.z[self.nodes_to_lower] += (
-                self.prefactor * self.lowering_rate * step
-            )
-
-            # if bedrock__elevation exists as a field, lower it also
-            other_fields = [
-                "bedrock__elevation",
-                "lithology_contact__elevation",
-            ]
-            for of in other_fields:
-                if of in self.grid.at_node:
-                    self.grid.at_node[of][self.nodes_to_lower] += (
-                        self.prefactor * self.lowering_rate * step
-                    )
-
-        # if there is an outlet elevation object
-        else:
-            # if bedrock__elevation exists as a field, lower it also
-            # calcuate the topographic change required to match the current
-            # time"s value for outlet elevation. This must be done in case
-            # bedrock elevation exists, and must be done before the topography
-            # is lowered
-            mean_z = np.mean(self.z[self.nodes_to_lower])
-            self.topo_change = mean_z - self.outlet_elevation_obj(
-                self.model_time
-            )
-
-            other_fields = [
-                "bedrock__elevation",
-                "lithology_contact__elevation",
-            ]
-            for of in other_fields:
-                if of in self.grid.at_node:
-                    self.grid.at_node[of][
-                        self.nodes_to_lower
-                    ] -= self.topo_change
-
-            # lower topography
-            self.z[self.nodes_to_lower] -= self.topo_change
+        # run on its own, the handler cannot know what else changed the nodes.
+        self._tracked_mean = None
+        dz = self._elevation_change(step)
+
+        # lower the correct nodes the desired amount, and if
+        # bedrock__elevation or lithology_contact__elevation exist as fields,
+        # lower them also.
+        self.z[self._node_ids] += dz
+        for of in self._COUPLED_FIELDS:
+            if of in self.grid.at_node:
+                self.grid.at_node[of][self._node_ids] += dz
 
         # increment model time
         self.model_time += step
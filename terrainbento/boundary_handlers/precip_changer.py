@@ -138,9 +138,9 @@ distribution such that :math:`f(p)` has the form:
 
 The above definition can be substituted in the integrals in the equation for
 :math:`\frac{K}{K_0}`. We are not aware of a closed-form solution to the
-resulting integrals. Therefore, we apply a numerical integration to convert the
-input values of :math:`F`, :math:`c`, and :math:`p_d` into a corresponding new
-value of :math:`K`.
+resulting integrals when :math:`I_c > 0`. Therefore, we apply a numerical
+integration to convert the input values of :math:`F`, :math:`c`, and
+:math:`p_d` into a corresponding new value of :math:`K`.
 
 For computational convenience, we define and calculate :math:`\Psi` which
 represents the portion of the erosion coefficient that depends on
@@ -162,14 +162,62 @@ Finally we define the erodibility adjustment factor :math:`F_{w}`:
 Here :math:`F_0` and :math:`\Psi_0` are the starting fraction of wet days and
 starting value for :math:`\Psi`.
 
+Substituting :math:`p = \lambda u` shows that
+
+.. math::
+
+    \Psi = \lambda^m G(I_c / \lambda), \quad
+    G(x) = \int_x^\infty (u - x)^m c u^{c-1} e^{-u^c} du
+
+where :math:`G` depends only on :math:`c` and :math:`m`, which do not change
+during a model run. When :math:`I_c = 0`, :math:`G(0) = \Gamma(1 + m/c)` and
+:math:`\Psi` is evaluated exactly. Otherwise, with :math:`u = x + t`,
+
+.. math::
+
+    G(x) = e^{-x^c} H(x), \quad
+    H(x) = \int_0^\infty t^m c (x + t)^{c-1} e^{x^c - (x + t)^c} dt
+
+where :math:`H` varies slowly and does not underflow when :math:`G` does.
+:math:`\log H` is integrated numerically once, at the nodes of an
+interpolation table that is refined until the interpolation error is below a
+set tolerance, and :math:`\Psi` is then found by interpolation rather than by
+numerical integration at every step. If the table does not reach the
+tolerance, a warning is raised and :math:`H` is integrated at every step
+instead.
+
 **PrecipChanger** presently supports changes in :math:`F` and :math:`p_d` but
-not :math:`c`.
+not :math:`c`. The changes are either linear trends or a history of
+:math:`F` and :math:`p_d`, such as one derived from a paleoclimate record.
+A history is sampled on a dense time grid, and :math:`F_w` is evaluated at
+every sample, when the **PrecipChanger** is created.
 """
 
+import os
+import warnings
+
 import numpy as np
 from scipy.integrate import quad
+from scipy.interpolate import CubicSpline
 from scipy.special import gamma
 
+# Relative error of the numerical integration of H, and the relative error
+# allowed in interpolated values of Psi, which must be well above it.
+_PSI_QUAD_RTOL = 1.0e-10
+_PSI_RTOL = 1.0e-7
+
+# Number of nodes of a new Psi interpolation table, and the number of times
+# the table may be refined to meet _PSI_RTOL. This caps a table at 1025
+# nodes.
+_PSI_TABLE_NODES = 17
+_PSI_MAX_REFINEMENTS = 6
+
+# Relative error allowed in the erodibility adjustment factor interpolated
+# between the samples of a precipitation history, and the number of times an
+# interval of the history may be halved to meet it.
+_HISTORY_RTOL = 1.0e-6
+_HISTORY_MAX_REFINEMENTS = 16
+
 
 def _integrand(p, Ic, lam, c, m):
     """Calculate the integrand for numerical integration.
@@ -230,6 +278,187 @@ def _scale_fac(pmean, c):
     return pmean * (1.0 / gamma(1.0 + 1.0 / c))
 
 
+class _PsiEvaluator(object):
+    r"""Evaluate :math:`\Psi` for fixed :math:`I_c`, :math:`c`, and :math:`m`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from scipy.integrate import quad
+    >>> from terrainbento.boundary_handlers.precip_changer import (
+    ...     _PsiEvaluator, _integrand, _scale_fac
+    ... )
+
+    With :math:`I_c = 0` the closed form is used.
+
+    >>> psi = _PsiEvaluator(0.0, 0.65, 0.5)
+    >>> lam = _scale_fac(3.0, 0.65)
+    >>> expected, _ = quad(
+    ...     _integrand, 0.0, np.inf, args=(0.0, lam, 0.65, 0.5)
+    ... )
+    >>> bool(np.isclose(psi(3.0), expected))
+    True
+
+    With :math:`I_c > 0` the interpolation table is used. It is extended as
+    needed, and several mean depths can be evaluated at once.
+
+    >>> psi = _PsiEvaluator(2.0, 0.65, 0.5)
+    >>> depths = np.array([1.0, 3.0, 30.0])
+    >>> expected = [
+    ...     quad(
+    ...         _integrand, 2.0, np.inf,
+    ...         args=(2.0, _scale_fac(d, 0.65), 0.65, 0.5)
+    ...     )[0]
+    ...     for d in depths
+    ... ]
+    >>> bool(np.allclose(psi(depths), expected, rtol=1e-7))
+    True
+
+    With :math:`c = 1`, :math:`\Psi = \lambda^m \Gamma(1 + m)
+    e^{-I_c/\lambda}`, which is also found when it is far too small for
+    ``quad`` to integrate.
+
+    >>> from scipy.special import gamma
+    >>> psi = _PsiEvaluator(10.0, 1.0, 0.5)
+    >>> expected = 0.05 ** 0.5 * gamma(1.5) * np.exp(-200.0)
+    >>> bool(np.isclose(psi(0.05), expected, rtol=1e-7, atol=0.0))
+    True
+    """
+
+    def __init__(self, infiltration_capacity, c, m, mean_depths=None):
+        """
+        Parameters
+        ----------
+        infiltration_capacity : float
+            Infiltration capacity, :math:`I_c`.
+        c : float
+            Weibull distribution shape factor.
+        m : float
+            Drainage area exponent.
+        mean_depths : array of float, optional
+            Mean depths the run is expected to visit. If provided, the
+            interpolation table is built to cover them right away.
+        """
+        self._Ic = infiltration_capacity
+        self._c = c
+        self._m = m
+        self._gamma = gamma(1.0 + m / c)
+        self._log_x_range = None
+        self._spline = None
+        # set if the table did not converge, so that H is integrated at
+        # every call instead.
+        self._direct = False
+        if mean_depths is not None and self._Ic > 0.0:
+            self._x(np.asarray(mean_depths, dtype=float))
+
+    def __call__(self, mean_depth):
+        r"""Return :math:`\Psi` for mean depth(s) ``mean_depth``."""
+        mean_depth = np.asarray(mean_depth, dtype=float)
+        lam = _scale_fac(mean_depth, self._c)
+        if self._Ic == 0.0:
+            psi = lam ** self._m * self._gamma
+        else:
+            psi = np.zeros_like(lam)
+            wet = lam > 0.0
+            x = self._x(mean_depth[wet])
+            if self._direct:
+                log_H = self._log_H(np.log(x))
+            else:
+                log_H = self._spline(np.log(x))
+            psi[wet] = lam[wet] ** self._m * np.exp(log_H - x ** self._c)
+        if psi.ndim == 0:
+            return float(psi)
+        return psi
+
+    def _x(self, mean_depth):
+        r"""Return :math:`I_c / \lambda`, extending the table to cover it."""
+        x = self._Ic / _scale_fac(mean_depth[mean_depth > 0.0], self._c)
+        if x.size > 0 and not self._direct:
+            log_x_min = np.log(x.min())
+            log_x_max = np.log(x.max())
+            if (
+                self._log_x_range is None
+                or log_x_min < self._log_x_range[0]
+                or log_x_max > self._log_x_range[1]
+            ):
+                if self._log_x_range is not None:
+                    log_x_min = min(log_x_min, self._log_x_range[0])
+                    log_x_max = max(log_x_max, self._log_x_range[1])
+                # pad by a factor of two so that slow drifts do not cause
+                # frequent rebuilds.
+                self._build_table(
+                    log_x_min - np.log(2.0), log_x_max + np.log(2.0)
+                )
+        return x
+
+    def _log_H(self, log_x):
+        r"""Integrate :math:`\log H` numerically at each of ``exp(log_x)``."""
+        (c, m) = (self._c, self._m)
+
+        def integrand(t, x):
+            return t ** m * c * (x + t) ** (c - 1.0) * np.exp(
+                x ** c - (x + t) ** c
+            )
+
+        out = np.empty_like(log_x)
+        for i, x in enumerate(np.exp(log_x)):
+            value, _ = quad(
+                integrand,
+                0.0,
+                np.inf,
+                args=(x,),
+                epsabs=0.0,
+                epsrel=_PSI_QUAD_RTOL,
+                limit=200,
+            )
+            out[i] = np.log(value) if value > 0.0 else -np.inf
+        return out
+
+    def _build_table(self, log_x_min, log_x_max):
+        r"""Build a cubic spline of :math:`\log H` against :math:`\log x`.
+
+        Intervals are halved until the spline matches the integral at every
+        interval midpoint to within ``_PSI_RTOL``; an absolute error in
+        :math:`\log H` is a relative error in :math:`\Psi`. If that takes
+        more than ``_PSI_MAX_REFINEMENTS`` halvings, a warning is raised and
+        :math:`H` is integrated at every call instead.
+        """
+        log_x = np.linspace(log_x_min, log_x_max, _PSI_TABLE_NODES)
+        log_H = self._log_H(log_x)
+        converged = False
+        for _ in range(_PSI_MAX_REFINEMENTS):
+            if not np.all(np.isfinite(log_H)):
+                break
+            spline = CubicSpline(log_x, log_H)
+            mid = 0.5 * (log_x[1:] + log_x[:-1])
+            log_H_mid = self._log_H(mid)
+            error = np.abs(spline(mid) - log_H_mid)
+            converged = bool(np.all(error <= _PSI_RTOL))
+
+            order = np.argsort(np.concatenate((log_x, mid)))
+            log_x = np.concatenate((log_x, mid))[order]
+            log_H = np.concatenate((log_H, log_H_mid))[order]
+            if converged:
+                break
+        if not converged:
+            warnings.warn(
+                "".join(
+                    [
+                        "PrecipChanger: the interpolation table of Psi did ",
+                        "not reach a relative error of ",
+                        f"{_PSI_RTOL:g}; Psi is integrated numerically at ",
+                        "every step instead.",
+                    ]
+                ),
+                RuntimeWarning,
+            )
+            self._direct = True
+            self._spline = None
+            return
+        self._spline = CubicSpline(log_x, log_H)
+        self._log_x_range = (log_x_min, log_x_max)
+
+
 def _check_intermittency_value(rainfall_intermittency_factor):
     """Check that rainfall_intermittency_factor is >= 0 and <=1."""
     if (rainfall_intermittency_factor < 0.0) or (
@@ -266,6 +495,199 @@ def _check_infiltration_capacity(infiltration_capacity):
         )
 
 
+def _read_precip_history(precip_history):
+    """Return the times, intermittency factors and mean depths of a history.
+
+    Parameters
+    ----------
+    precip_history : str or array of float, shape (number_of_times, 3)
+        Columns of time, daily rainfall intermittency factor and mean daily
+        rainfall intensity, or the path to a comma separated file with one
+        header line and the same three columns.
+    """
+    if isinstance(precip_history, str):
+        if not os.path.exists(precip_history):
+            raise ValueError(
+                (
+                    "The precip_history file provided to PrecipChanger "
+                    "does not exist."
+                )
+            )
+        precip_history = np.loadtxt(precip_history, skiprows=1, delimiter=",")
+    history = np.asarray(precip_history, dtype=float)
+    if history.ndim != 2 or history.shape[1] != 3 or history.shape[0] == 0:
+        raise ValueError(
+            (
+                "The PrecipChanger precip_history must have three columns: "
+                "time, daily_rainfall__intermittency_factor and "
+                "rainfall__mean_rate."
+            )
+        )
+    if np.any(np.diff(history[:, 0]) <= 0.0):
+        raise ValueError(
+            (
+                "The PrecipChanger precip_history times must be strictly "
+                "increasing."
+            )
+        )
+    _check_intermittency_value(history[:, 1].min())
+    _check_intermittency_value(history[:, 1].max())
+    _check_mean_depth(history[:, 2].min())
+    return history[:, 0], history[:, 1], history[:, 2]
+
+
+class _PrecipTimeline(object):
+    """Precipitation parameters sampled on a dense time grid.
+
+    The grid holds every time of the history plus times between them: evenly
+    spaced ones if a time step is given, otherwise the ones needed for the
+    erodibility adjustment factor, which is not linear in the mean depth, to
+    be linear between samples within a relative error of 1e-6. Values between
+    samples are linearly interpolated and values outside the history are held
+    at the first or last value. Model time only moves forward, so the sample
+    before the current time is found by advancing a cursor rather than by a
+    search.
+
+    Examples
+    --------
+    >>> from terrainbento.boundary_handlers.precip_changer import (
+    ...     _PrecipTimeline
+    ... )
+    >>> timeline = _PrecipTimeline(
+    ...     ([0.0, 10.0, 30.0], [0.2, 0.4, 0.4], [1.0, 2.0, 4.0]),
+    ...     time_step=5.0,
+    ... )
+    >>> timeline.time
+    array([  0.,   5.,  10.,  15.,  20.,  25.,  30.])
+    >>> timeline.precip_params(20.0)
+    (0.4, 3.0)
+    >>> timeline.precip_params(100.0)
+    (0.4, 4.0)
+    """
+
+    def __init__(self, history, time_step=None):
+        """
+        Parameters
+        ----------
+        history : tuple of array of float
+            Times, intermittency factors and mean depths of the history.
+        time_step : float, optional
+            Largest spacing of the time grid. Default is to refine the grid
+            where the erodibility adjustment factor needs it, once it is set.
+        """
+        self._history = tuple(
+            np.asarray(values, dtype=float) for values in history
+        )
+        times = self._history[0]
+        self._refine = time_step is None
+        if self._refine:
+            self._sample(times)
+        else:
+            if time_step <= 0.0:
+                raise ValueError(
+                    "PrecipChanger: precip_history_time_step must be positive."
+                )
+            duration = times[-1] - times[0]
+            n_times = int(np.ceil(duration / time_step - 1.0e-9)) + 1
+            self._sample(
+                np.union1d(times, np.linspace(times[0], times[-1], n_times))
+            )
+        self.adjustment_factor = None
+        self._cursor = 0
+
+    def _sample(self, time):
+        """Sample the history at ``time``."""
+        (times, frac_wet_days, mean_depth) = self._history
+        self.time = time
+        self.frac_wet_days = np.interp(time, times, frac_wet_days)
+        self.mean_depth = np.interp(time, times, mean_depth)
+
+    def set_adjustment_factor(self, psi, reference):
+        r"""Evaluate the adjustment factor at every sample in one pass.
+
+        Parameters
+        ----------
+        psi : callable
+            Function returning :math:`\Psi` for an array of mean depths.
+        reference : float
+            The product :math:`F_0 \Psi_0`.
+        """
+        self.adjustment_factor = (
+            self.frac_wet_days * psi(self.mean_depth) / reference
+        )
+        if not self._refine:
+            return
+
+        # halve the intervals where the factor at the middle is not the mean
+        # of the factors at the ends, and check the halves again.
+        left = np.arange(self.time.size - 1)
+        for _ in range(_HISTORY_MAX_REFINEMENTS):
+            if left.size == 0:
+                break
+            (time, factor) = (self.time, self.adjustment_factor)
+            middle = 0.5 * (time[left] + time[left + 1])
+            (times, frac_wet_days, mean_depth) = self._history
+            exact = (
+                np.interp(middle, times, frac_wet_days)
+                * psi(np.interp(middle, times, mean_depth))
+                / reference
+            )
+            guess = 0.5 * (factor[left] + factor[left + 1])
+            coarse = np.abs(exact - guess) > _HISTORY_RTOL * np.abs(exact)
+
+            order = np.argsort(np.concatenate((time, middle)), kind="stable")
+            self._sample(np.concatenate((time, middle))[order])
+            self.adjustment_factor = np.concatenate((factor, exact))[order]
+
+            added = np.searchsorted(self.time, middle[coarse])
+            left = np.sort(np.concatenate((added - 1, added)))
+        else:
+            if left.size > 0:
+                warnings.warn(
+                    "".join(
+                        [
+                            "PrecipChanger: the erodibility adjustment ",
+                            "factor of the precip_history did not reach a ",
+                            f"relative error of {_HISTORY_RTOL:g} between ",
+                            "samples.",
+                        ]
+                    ),
+                    RuntimeWarning,
+                )
+
+    def precip_params(self, time):
+        """Return the intermittency factor and mean depth at ``time``."""
+        return (
+            self._lookup(self.frac_wet_days, time),
+            self._lookup(self.mean_depth, time),
+        )
+
+    def erodibility_adjustment_factor(self, time):
+        """Return the erodibility adjustment factor at ``time``."""
+        return self._lookup(self.adjustment_factor, time)
+
+    def _lookup(self, values, time):
+        """Linearly interpolate ``values`` at ``time``."""
+        if time <= self.time[0]:
+            return float(values[0])
+        if time >= self.time[-1]:
+            return float(values[-1])
+
+        # move the cursor to the last sample at or before time.
+        if time < self.time[self._cursor]:
+            self._cursor = int(np.searchsorted(self.time, time, "right")) - 1
+        while time >= self.time[self._cursor + 1]:
+            self._cursor += 1
+
+        index = self._cursor
+        weight = (time - self.time[index]) / (
+            self.time[index + 1] - self.time[index]
+        )
+        return float(
+            values[index] + weight * (values[index + 1] - values[index])
+        )
+
+
 class PrecipChanger(object):
     """Handle time varying precipitation.
 
@@ -279,6 +701,9 @@ class PrecipChanger(object):
     **run_one_step** method.
     """
 
+    # The handler changes the erodibility, not the topography.
+    _modifies_elevation = False
+
     def __init__(
         self,
         grid,
@@ -291,6 +716,8 @@ class PrecipChanger(object):
         m_sp=0.5,
         precipchanger_start_time=0,
         precipchanger_stop_time=None,
+        precip_history=None,
+        precip_history_time_step=None,
         **kwargs
     ):
         """
@@ -325,6 +752,24 @@ class PrecipChanger(object):
         precipchanger_stop_time : float, optional
             Model time at which changing the precipitation statistics should
             end. Default is no end time.
+        precip_history : str or array of float, optional
+            History of the precipitation parameters, used in place of the
+            linear trend parameters ``daily_rainfall__intermittency_factor``,
+            ``daily_rainfall__intermittency_factor_time_rate_of_change``,
+            ``rainfall__mean_rate`` and
+            ``rainfall__mean_rate_time_rate_of_change``. Either an array with
+            columns of model time, :math:`F` and :math:`p_d`, or the path to a
+            comma separated file with one header line and the same columns.
+            Values are linearly interpolated between the times given and held
+            constant outside them. The starting values :math:`F_0` and
+            :math:`p_{d,0}` are those at model time zero.
+        precip_history_time_step : float, optional
+            Spacing of the time grid on which a ``precip_history`` is sampled
+            when the **PrecipChanger** is created. The erodibility adjustment
+            factor is linearly interpolated between the samples, so the step
+            should be small compared to the changes of the history. Default
+            is to add samples between the history times until the
+            interpolated factor is within a relative error of 1e-6.
 
         Notes
         -----
@@ -387,31 +832,47 @@ class PrecipChanger(object):
         >>> print(round(fw, 3))
         1.721
         """
-        if daily_rainfall__intermittency_factor is None:
-            msg = (
-                "terrainbento PrecipChanger requires the parameter "
-                "daily_rainfall__intermittency_factor"
-            )
-            raise ValueError(msg)
-
-        if daily_rainfall__intermittency_factor_time_rate_of_change is None:
-            msg = (
-                "terrainbento PrecipChanger requires the parameter "
-                "daily_rainfall__intermittency_factor_time_rate_of_change"
-            )
-            raise ValueError(msg)
-
-        if rainfall__mean_rate is None:
-            msg = (
-                "terrainbento PrecipChanger requires the parameter "
-                "rainfall__mean_rate"
-            )
-            raise ValueError(msg)
-
-        if rainfall__mean_rate_time_rate_of_change is None:
+        trend_params = (
+            daily_rainfall__intermittency_factor,
+            daily_rainfall__intermittency_factor_time_rate_of_change,
+            rainfall__mean_rate,
+            rainfall__mean_rate_time_rate_of_change,
+        )
+        if precip_history is None:
+            if daily_rainfall__intermittency_factor is None:
+                msg = (
+                    "terrainbento PrecipChanger requires the parameter "
+                    "daily_rainfall__intermittency_factor"
+                )
+                raise ValueError(msg)
+
+            F_rate = daily_rainfall__intermittency_factor_time_rate_of_change
+            if F_rate is None:
+                msg = (
+                    "terrainbento PrecipChanger requires the parameter "
+                    "daily_rainfall__intermittency_factor_time_rate_of_change"
+                )
+                raise ValueError(msg)
+
+            if rainfall__mean_rate is None:
+                msg = (
+                    "terrainbento PrecipChanger requires the parameter "
+                    "rainfall__mean_rate"
+                )
+                raise ValueError(msg)
+
+            if rainfall__mean_rate_time_rate_of_change is None:
+                msg = (
+                    "terrainbento PrecipChanger requires the parameter "
+                    "rainfall__mean_rate_time_rate_of_change"
+                )
+                raise ValueError(msg)
+
+        elif any(param is not None for param in trend_params):
             msg = (
-                "terrainbento PrecipChanger requires the parameter "
-                "rainfall__mean_rate_time_rate_of_change"
+                "terrainbento PrecipChanger was given both a "
+                "precip_history and linear trend parameters. Please "
+                "provide only one."
             )
             raise ValueError(msg)
 
@@ -438,25 +899,61 @@ class PrecipChanger(object):
             self.stop_time = precipchanger_stop_time
         self.start_time = precipchanger_start_time
 
-        self.starting_frac_wet_days = daily_rainfall__intermittency_factor
-        self.frac_wet_days_rate_of_change = (
-            daily_rainfall__intermittency_factor_time_rate_of_change
-        )
-
-        self.starting_daily_mean_depth = rainfall__mean_rate
-        self.mean_depth_rate_of_change = (
-            rainfall__mean_rate_time_rate_of_change
-        )
-
         self.rainfall__shape_factor = rainfall__shape_factor
         self.infilt_cap = infiltration_capacity
         self.m = m_sp
+        _check_infiltration_capacity(self.infilt_cap)
+
+        if precip_history is None:
+            self._timeline = None
+            self.starting_frac_wet_days = daily_rainfall__intermittency_factor
+            self.frac_wet_days_rate_of_change = (
+                daily_rainfall__intermittency_factor_time_rate_of_change
+            )
+
+            self.starting_daily_mean_depth = rainfall__mean_rate
+            self.mean_depth_rate_of_change = (
+                rainfall__mean_rate_time_rate_of_change
+            )
+
+            _check_intermittency_value(self.starting_frac_wet_days)
+            _check_mean_depth(self.starting_daily_mean_depth)
+
+            # Mean depths at the start and, if known, the end of the change.
+            mean_depths = [self.starting_daily_mean_depth]
+            if not self.no_stop_time:
+                mean_depths.append(
+                    self.starting_daily_mean_depth
+                    + self.mean_depth_rate_of_change * self.stop_time
+                )
+        else:
+            self._timeline = _PrecipTimeline(
+                _read_precip_history(precip_history),
+                time_step=precip_history_time_step,
+            )
+            (
+                self.starting_frac_wet_days,
+                self.starting_daily_mean_depth,
+            ) = self._timeline.precip_params(0.0)
+            self.frac_wet_days_rate_of_change = None
+            self.mean_depth_rate_of_change = None
+            mean_depths = self._timeline.mean_depth
+
+        self._psi = _PsiEvaluator(
+            self.infilt_cap,
+            self.rainfall__shape_factor,
+            self.m,
+            mean_depths=np.clip(mean_depths, 0.0, None),
+        )
+        self._adjustment_factor_time = None
+        self._adjustment_factor = 1.0
 
         self.starting_psi = self.calculate_starting_psi()
 
-        _check_intermittency_value(self.starting_frac_wet_days)
-        _check_mean_depth(self.starting_daily_mean_depth)
-        _check_infiltration_capacity(self.infilt_cap)
+        if self._timeline is not None:
+            self._timeline.set_adjustment_factor(
+                self._psi, self.starting_frac_wet_days * self.starting_psi
+            )
 
     def calculate_starting_psi(self):
         r"""Calculate and store for later the factor :math:`\Psi_0`.
@@ -477,16 +974,13 @@ class PrecipChanger(object):
         :math:`f_0(p)` is the Weibull distribution representing the probability
         distribution of daily precipitation intensity at model run onset.
         """
-        lam = _scale_fac(
-            self.starting_daily_mean_depth, self.rainfall__shape_factor
-        )
-        psi, _ = quad(
-            _integrand,
-            self.infilt_cap,
-            np.inf,
-            args=(self.infilt_cap, lam, self.rainfall__shape_factor, self.m),
-        )
-        return psi
+        return self._psi(self.starting_daily_mean_depth)
+
+    def _evaluation_time(self):
+        """Return the model time, limited to the stop time if there is one."""
+        if self.no_stop_time or self.model_time <= self.stop_time:
+            return self.model_time
+        return self.stop_time
 
     def get_current_precip_params(self):
         """Return current values precipitation parameters.
@@ -500,13 +994,11 @@ class PrecipChanger(object):
         if self.model_time > self.start_time:
 
             # get current evaluation time
-            if self.no_stop_time:
-                time = self.model_time
-            else:
-                if self.model_time > self.stop_time:
-                    time = self.stop_time
-                else:
-                    time = self.model_time
+            time = self._evaluation_time()
+
+            # a history is looked up in the precomputed timeline
+            if self._timeline is not None:
+                return self._timeline.precip_params(time)
 
             # calculate and return updated values
             frac_wet_days = (
@@ -536,42 +1028,59 @@ class PrecipChanger(object):
 
              K = F_{w} K_{0} = \frac{F \Psi}{F_0 \Psi_0} K_{0}
 
+        The factor is computed once per model time, so several callers may
+        ask for it within a step at no extra cost.
+
         Returns
         -------
         erodibility_adjustment_factor : float
         """
         # if after start time
         if self.model_time > self.start_time:
-
-            # get the updated precipitation parameters
-            frac_wet, mean_depth = self.get_current_precip_params()
-
-            # calculate the mean intensity and the scale factor
-            lam = _scale_fac(mean_depth, self.rainfall__shape_factor)
-
-            # calculate current value of Psi
-            psi, _ = quad(
-                _integrand,
-                self.infilt_cap,
-                np.inf,
-                args=(
-                    self.infilt_cap,
-                    lam,
-                    self.rainfall__shape_factor,
-                    self.m,
-                ),
-            )
-
-            # calculate the adjustment factor
-            adj_fac = (frac_wet * psi) / (
-                self.starting_frac_wet_days * self.starting_psi
-            )
-            # and return
-            return adj_fac
+            if self._adjustment_factor_time != self.model_time:
+
+                if self._timeline is not None:
+                    self._adjustment_factor = (
+                        self._timeline.erodibility_adjustment_factor(
+                            self._evaluation_time()
+                        )
+                    )
+                else:
+                    # get the updated precipitation parameters
+                    frac_wet, mean_depth = self.get_current_precip_params()
+
+                    # calculate current value of Psi
+                    psi = self._psi(mean_depth)
+
+                    # calculate the adjustment factor
+                    self._adjustment_factor = (frac_wet * psi) / (
+                        self.starting_frac_wet_days * self.starting_psi
+                    )
+                self._adjustment_factor_time = self.model_time
+            return self._adjustment_factor
         else:
             # if before starting time, return 1.0
             return 1.0
 
+    def adjust_erodibility(self, erodibility, out=None):
+        """Multiply ``erodibility`` by the current adjustment factor.
+
+        Parameters
+        ----------
+        erodibility : float or array
+            Erodibility before adjustment, :math:`K_0`.
+        out : array, optional
+            Array in which to place the result, e.g. the erodibility field
+            of an eroder. Default is None, which allocates a new array.
+
+        Returns
+        -------
+        float or array
+        """
+        return np.multiply(
+            erodibility, self.get_erodibility_adjustment_factor(), out=out
+        )
+
     def run_one_step(self, step):
         """Run **PrecipChanger** forward and update model time.
 
@@ -4,7 +4,8 @@
 import os
 
 import numpy as np
-from scipy.interpolate import interp1d
+
+from terrainbento.utilities import TimeSeriesInterpolator, load_time_series
 
 _OTHER_FIELDS = ["bedrock__elevation", "lithology_contact__elevation"]
 
@@ -56,6 +57,8 @@ class SingleNodeBaselevelHandler(object):
             the model grids spatial scale and the time units of ``step``.
             This file should be readable with
             ``np.loadtxt(filename, skiprows=1, delimiter=",")``
+            or be a ``.npy`` file with the same columns, which is memory
+            mapped rather than read into memory.
             Its first column is time and its second column is the elevation
             change at the outlet since the onset of the model run. Negative
             values mean the outlet lowers.
@@ -121,14 +124,17 @@ class SingleNodeBaselevelHandler(object):
         else:
             self.nodes_to_lower = node_ids != outlet_id
             self.prefactor = -1.0
-            self._outlet_start_values = {
-                "topographic__elevation": self.z[self.outlet_id]
-            }
-            for of in _OTHER_FIELDS:
-                if of in self.grid.at_node:
-                    self._outlet_start_values[of] = self.grid.at_node[of][
-                        self.outlet_id
-                    ]
+            self._outlet_fields = [
+                name
+                for name in ["topographic__elevation"] + _OTHER_FIELDS
+                if name in self.grid.at_node
+            ]
+            self._outlet_start_values = np.array(
+                [
+                    self.grid.at_node[name][self.outlet_id]
+                    for name in self._outlet_fields
+                ]
+            )
 
         if (lowering_file_path is None) and (lowering_rate is None):
             raise ValueError(
@@ -151,9 +157,7 @@ class SingleNodeBaselevelHandler(object):
                 if os.path.exists(lowering_file_path):
 
                     model_start_elevation = self.z[self.outlet_id]
-                    elev_change_df = np.loadtxt(
-                        lowering_file_path, skiprows=1, delimiter=","
-                    )
+                    elev_change_df = load_time_series(lowering_file_path)
                     time = elev_change_df[:, 0]
                     elev_change = elev_change_df[:, 1]
 
@@ -163,11 +167,13 @@ class SingleNodeBaselevelHandler(object):
                         scaling_factor = np.abs(
                             model_start_elevation - model_end_elevation
                         ) / np.abs(elev_change[0] - elev_change[-1])
-                    outlet_elevation = (
-                        scaling_factor * elev_change_df[:, 1]
-                    ) + model_start_elevation
-                    self.outlet_elevation_obj = interp1d(
-                        time, outlet_elevation
+                    # the history is scaled on lookup, so that a memory
+                    # mapped column is not read in full.
+                    self.outlet_elevation_obj = TimeSeriesInterpolator(
+                        time,
+                        elev_change,
+                        scale=scaling_factor,
+                        offset=model_start_elevation,
                     )
                     self.lowering_rate = None
                     self._outlet_start_z = model_start_elevation
@@ -193,6 +199,40 @@ class SingleNodeBaselevelHandler(object):
                     )
                 )
 
+    # Fields changed along with topographic__elevation, if they exist.
+    _COUPLED_FIELDS = tuple(_OTHER_FIELDS)
+
+    @property
+    def _reads_elevation(self):
+        """True if the elevation change depends on the current elevation."""
+        return self.outlet_elevation_obj is not None
+
+    def _lowered_nodes(self):
+        """Return the ids of the nodes to lower."""
+        return np.flatnonzero(self.nodes_to_lower)
+
+    def _reset_values(self):
+        """Return the outlet values restored after the elevation change."""
+        if self.modify_outlet_id:
+            return {}
+        return {
+            name: ([self.outlet_id], self._outlet_start_values[i : i + 1])
+            for (i, name) in enumerate(self._outlet_fields)
+        }
+
+    def _elevation_change(self, step):
+        """Return the elevation change of the nodes to lower over step."""
+        # if we do not have an outlet elevation object, use the rate.
+        if self.outlet_elevation_obj is None:
+            return self.prefactor * self.lowering_rate * step
+
+        # calcuate the topographic change required to match the current
+        # time"s value for outlet elevation.
+        topo_change = self.z[self.outlet_id] - self.outlet_elevation_obj(
+            self.model_time
+        )
+        return -topo_change
+
     def run_one_step(self, step):
         """Run **SingleNodeBaselevelHandler** to update outlet node elevation.
 
@@ -211,50 +251,21 @@ class SingleNodeBaselevelHandler(object):
         step : float
             Duration of model time to advance forward.
         """
-        # first, if we do not have an outlet elevation object
-        if self.outlet_elevation_obj is None:
-
-            # calculate lowering amount and subtract
-            self.z[self.nodes_to_lower] += (
-                self.prefactor * self.lowering_rate * step
-            )
-
-            # if bedrock__elevation exists as a field, lower it also
-
-            for of in _OTHER_FIELDS:
-                if of in self.grid.at_node:
-                    self.grid.at_node[of][self.nodes_to_lower] += (
-                        self.prefactor * self.lowering_rate * step
-                    )
-
-            if self.modify_outlet_id is False:
-                for key in self._outlet_start_values.keys():
-                    self.grid.at_node[key][
-                        self.outlet_id
-                    ] = self._outlet_start_values[key]
-
-        # if there is an outlet elevation object
-        else:
-            # if bedrock__elevation exists as a field, lower it also
-            # calcuate the topographic change required to match the current
-            # time"s value for outlet elevation. This must be done in case
-            # bedrock elevation exists, and must
-            # be done before the topography is lowered
-
-            topo_change = self.z[self.outlet_id] - self.outlet_elevation_obj(
-                self.model_time
-            )
-
-            other_fields = [
-                "bedrock__elevation",
-                "lithology_contact__elevation",
-            ]
-            for of in other_fields:
-                if of in self.grid.at_node:
-                    self.grid.at_node[of][self.outlet_id] -= topo_change
-
-            # lower topography
-            self.z[self.outlet_id] -= topo_change
+        dz = self._elevation_change(step)
+
+        # change the elevation of the nodes to lower, and if
+        # bedrock__elevation or lithology_contact__elevation exist as fields,
+        # change them also.
+        self.z[self.nodes_to_lower] += dz
+        for of in _OTHER_FIELDS:
+            if of in self.grid.at_node:
+                self.grid.at_node[of][self.nodes_to_lower] += dz
+
+        if self.modify_outlet_id is False:
+            for (name, value) in zip(
+                self._outlet_fields, self._outlet_start_values
+            ):
+                self.grid.at_node[name][self.outlet_id] = value
 
         # increment model time
         self.model_time += step
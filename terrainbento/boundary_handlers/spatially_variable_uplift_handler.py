@@ -0,0 +1,215 @@
+# coding: utf8
+# !/usr/env/python
+"""**SpatiallyVariableUpliftHandler** uplifts core nodes at a static rate."""
+
+import numpy as np
+
+from terrainbento.utilities import TimeSeriesInterpolator, load_time_series
+
+
+class SpatiallyVariableUpliftHandler(object):
+    """Uplift the core nodes at a spatially variable, static rate.
+
+    The **SpatiallyVariableUpliftHandler** raises each core node of the model
+    grid at its own rate. The pattern of uplift rate does not change through
+    time, but it may be scaled by a time varying factor, so the elevation
+    change of a core node over a step is::
+
+        uplift_rate * time_scaling(t) * step
+
+    where ``t`` is the model time at the start of the step.
+
+    The uplift rates of the core nodes are stored when the handler is
+    created, so each step is a single in-place update of the core nodes
+    without any call back into Python. Unlike
+    **GenericFuncBaselevelHandler**, no new array is made at each step.
+
+    The **SpatiallyVariableUpliftHandler** expects that
+    ``topographic__elevation`` is an at-node model grid field. It will modify
+    this field as well as the fields ``bedrock__elevation`` and
+    ``lithology_contact__elevation``, if they exist.
+
+    Note that **SpatiallyVariableUpliftHandler** increments time at the end of
+    the **run_one_step** method.
+    """
+
+    def __init__(self, grid, uplift_rate=0.0, time_scaling=None, **kwargs):
+        """
+        Parameters
+        ----------
+        grid : landlab model grid
+        uplift_rate : float, array, or str, optional
+            Rate of uplift, as a single value, an array with one value per
+            node, or the name of an at-node field. Positive values raise the
+            core nodes. Default is 0.0.
+        time_scaling : function, str, or array, optional
+            Factor by which the uplift rate is scaled through time. Either a
+            function of model time, the path to a file read with
+            **load_time_series**, or an array of shape ``(n, 2)`` of time and
+            factor. Values of a file or an array are linearly interpolated
+            and held constant before the first and after the last time.
+            Default is None, which gives a factor of 1.
+
+        Examples
+        --------
+        Start by creating a landlab model grid with a field of uplift rate.
+
+        >>> from landlab import RasterModelGrid
+        >>> mg = RasterModelGrid((4, 5))
+        >>> z = mg.add_zeros("node", "topographic__elevation")
+        >>> _ = mg.add_field("node", "uplift_rate", 0.001 * mg.x_of_node)
+
+        Now import the **SpatiallyVariableUpliftHandler** and instantiate.
+
+        >>> from terrainbento.boundary_handlers import (
+        ...     SpatiallyVariableUpliftHandler)
+        >>> bh = SpatiallyVariableUpliftHandler(
+        ...     mg, uplift_rate="uplift_rate")
+        >>> bh.run_one_step(1000.0)
+
+        Only the core nodes are uplifted.
+
+        >>> print(z.reshape(mg.shape))
+        [[ 0.  0.  0.  0.  0.]
+         [ 0.  1.  2.  3.  0.]
+         [ 0.  1.  2.  3.  0.]
+         [ 0.  0.  0.  0.  0.]]
+
+        The rate can also be scaled through time, here by a factor that
+        increases from one to three over the first 2000 time units.
+
+        >>> bh = SpatiallyVariableUpliftHandler(
+        ...     mg,
+        ...     uplift_rate="uplift_rate",
+        ...     time_scaling=[[0.0, 1.0], [2000.0, 3.0]],
+        ... )
+        >>> for _ in range(3):
+        ...     bh.run_one_step(1000.0)
+        >>> print(z.reshape(mg.shape))
+        [[  0.   0.   0.   0.   0.]
+         [  0.   7.  14.  21.   0.]
+         [  0.   7.  14.  21.   0.]
+         [  0.   0.   0.   0.   0.]]
+        """
+        self.model_time = 0.0
+        self.grid = grid
+        self.z = self.grid.at_node["topographic__elevation"]
+
+        if isinstance(uplift_rate, str):
+            if uplift_rate not in self.grid.at_node:
+                raise ValueError(
+                    (
+                        "SpatiallyVariableUpliftHandler: the uplift_rate "
+                        "field {name} does not exist."
+                    ).format(name=uplift_rate)
+                )
+            uplift_rate = self.grid.at_node[uplift_rate]
+        uplift_rate = np.asarray(uplift_rate, dtype=float)
+        if uplift_rate.ndim == 0:
+            uplift_rate = np.full(self.grid.number_of_nodes, uplift_rate)
+        if uplift_rate.shape != (self.grid.number_of_nodes,):
+            raise ValueError(
+                (
+                    "SpatiallyVariableUpliftHandler: uplift_rate must be a "
+                    "single value or have one value per node."
+                )
+            )
+        self.uplift_rate = uplift_rate.copy()
+
+        if time_scaling is None or callable(time_scaling):
+            self._time_scaling = time_scaling
+        else:
+            if isinstance(time_scaling, str):
+                schedule = load_time_series(time_scaling)
+            else:
+                schedule = np.asarray(time_scaling, dtype=float)
+                if schedule.ndim != 2 or schedule.shape[1] != 2:
+                    raise ValueError(
+                        (
+                            "SpatiallyVariableUpliftHandler: time_scaling "
+                            "must be a function, a file, or an array of "
+                            "shape (n, 2)."
+                        )
+                    )
+            self._time_scaling = _HeldTimeSeries(
+                schedule[:, 0], schedule[:, 1]
+            )
+
+        self._lowered_nodes()
+
+    # Fields uplifted along with topographic__elevation, if they exist.
+    _COUPLED_FIELDS = ("bedrock__elevation", "lithology_contact__elevation")
+
+    _reads_elevation = False
+
+    def _set_core_nodes(self, core_nodes):
+        """Store the core node ids and their uplift rates."""
+        self._core_nodes = core_nodes
+        self._core_rate = self.uplift_rate[core_nodes]
+        self._change = np.empty_like(self._core_rate)
+
+    def _lowered_nodes(self):
+        """Return the ids of the core nodes, refreshed from node status."""
+        core_nodes = np.flatnonzero(self.grid.status_at_node == 0)
+        if not np.array_equal(core_nodes, getattr(self, "_core_nodes", None)):
+            self._set_core_nodes(core_nodes)
+        return self._core_nodes
+
+    def time_scaling(self, time):
+        """Return the factor that scales the uplift rate at ``time``.
+
+        Parameters
+        ----------
+        time : float
+
+        Returns
+        -------
+        float
+        """
+        if self._time_scaling is None:
+            return 1.0
+        return self._time_scaling(time)
+
+    def _elevation_change(self, step):
+        """Return the elevation change of the core nodes over step."""
+        return np.multiply(
+            self._core_rate,
+            self.time_scaling(self.model_time) * step,
+            out=self._change,
+        )
+
+    def run_one_step(self, step):
+        """Run **SpatiallyVariableUpliftHandler** forward and update elevation.
+
+        The **run_one_step** method provides a consistent interface to update
+        the terrainbento boundary condition handlers.
+
+        In the **run_one_step** routine, the **SpatiallyVariableUpliftHandler**
+        uplifts the core nodes, and the bedrock and lithology contact
+        elevations below them if those fields exist.
+
+        Note that **SpatiallyVariableUpliftHandler** increments time at the end
+        of the **run_one_step** method.
+
+        Parameters
+        ----------
+        step : float
+            Duration of model time to advance forward.
+        """
+        dz = self._elevation_change(step)
+        self.z[self._core_nodes] += dz
+        for of in self._COUPLED_FIELDS:
+            if of in self.grid.at_node:
+                self.grid.at_node[of][self._core_nodes] += dz
+
+        # increment model time
+        self.model_time += step
+
+
+class _HeldTimeSeries(TimeSeriesInterpolator):
+    """Interpolate a time series, holding its end values outside of it."""
+
+    def __call__(self, time):
+        return TimeSeriesInterpolator.__call__(
+            self, min(max(time, self._start), self._end)
+        )
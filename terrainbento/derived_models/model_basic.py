@@ -160,12 +160,7 @@ class Basic(ErosionModel):
 
         # If a PrecipChanger is being used, update the eroder"s K value.
         if "PrecipChanger" in self.boundary_handlers:
-            self.eroder.K = (
-                self.K
-                * self.boundary_handlers[
-                    "PrecipChanger"
-                ].get_erodibility_adjustment_factor()
-            )
+            self._adjust_erodibility(self.eroder, "K", self.K)
 
         # Do some water erosion (but not on the flooded nodes)
         self.eroder.run_one_step(step)
@@ -234,12 +234,7 @@ class BasicChSa(ErosionModel):
         # Do some erosion (but not on the flooded nodes)
         # (if we're varying K through time, update that first)
         if "PrecipChanger" in self.boundary_handlers:
-            self.eroder.K = (
-                self.K
-                * self.boundary_handlers[
-                    "PrecipChanger"
-                ].get_erodibility_adjustment_factor()
-            )
+            self._adjust_erodibility(self.eroder, "K", self.K)
 
         self.eroder.run_one_step(step)
 
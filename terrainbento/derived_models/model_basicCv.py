@@ -13,9 +13,9 @@ Landlab components used:
 """
 
 from landlab.components import FastscapeEroder, LinearDiffuser
-from scipy.interpolate import interp1d
 
 from terrainbento.base_class import ErosionModel
+from terrainbento.utilities import TimeSeriesInterpolator
 
 
 class BasicCv(ErosionModel):
@@ -138,7 +138,7 @@ class BasicCv(ErosionModel):
             water_erodibility,
             water_erodibility,
         ]
-        self.K_through_time = interp1d(time, K)
+        self.K_through_time = TimeSeriesInterpolator(time, K)
 
         # Instantiate a FastscapeEroder component
         self.eroder = FastscapeEroder(
@@ -185,7 +185,7 @@ class BasicCv(ErosionModel):
         self.create_and_move_water(step)
 
         # Update erosion based on climate
-        self.eroder.K = float(self.K_through_time(self.model_time))
+        self.eroder.K = self.K_through_time(self.model_time)
 
         # Do some erosion (but not on the flooded nodes)
         self.eroder.run_one_step(step)
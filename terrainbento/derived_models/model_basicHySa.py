@@ -253,11 +253,8 @@ class BasicHySa(ErosionModel):
         # Do some erosion (but not on the flooded nodes)
         # (if we're varying K through time, update that first)
         if "PrecipChanger" in self.boundary_handlers:
-            erode_factor = self.boundary_handlers[
-                "PrecipChanger"
-            ].get_erodibility_adjustment_factor()
-            self.eroder.K_sed = self.K_sed * erode_factor
-            self.eroder.K_br = self.K_br * erode_factor
+            self._adjust_erodibility(self.eroder, "K_sed", self.K_sed)
+            self._adjust_erodibility(self.eroder, "K_br", self.K_br)
 
         self.eroder.run_one_step(step)
 
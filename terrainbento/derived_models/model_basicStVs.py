@@ -157,6 +157,7 @@ class BasicStVs(StochasticErosionModel):
 
         # Run flow routing and lake filler
         self.flow_accumulator.run_one_step()
+        self._update_runoff_cache()
 
         # Instantiate a FastscapeEroder component
         self.eroder = FastscapeEroder(
@@ -173,35 +174,64 @@ class BasicStVs(StochasticErosionModel):
             self.grid, linear_diffusivity=regolith_transport_parameter
         )
 
-    def calc_runoff_and_discharge(self):
-        """Calculate runoff rate and discharge; return runoff."""
-
-        # Here"s the total (surface + subsurface) discharge
-        pa = self.rain_rate * self.grid.at_node["drainage_area"]
+    def _update_runoff_cache(self):
+        """Cache the slope-dependent runoff factors for the current routing.
 
-        # slope > 0
-        active_nodes = np.where(
-            self.grid.at_node["topographic__steepest_slope"] > 0.0
-        )[0]
+        Slope and drainage area only change when flow is re-routed, so the
+        active (sloping) nodes and the subsurface discharge capacity
+        :math:`T\\lambda S` at these nodes are computed once per routing and
+        reused by every call to **calc_runoff_and_discharge**.
+        """
+        slope = self.grid.at_node["topographic__steepest_slope"]
+        self._active_nodes = np.flatnonzero(slope > 0.0)
 
         # Transmissivity x lambda x slope = subsurface discharge capacity
-        tls = (
-            self.tlam[active_nodes]
-            * self.grid.at_node["topographic__steepest_slope"][active_nodes]
-        )
+        tls = self.tlam[self._active_nodes] * slope[self._active_nodes]
+        self._area_active = self.grid.at_node["drainage_area"][
+            self._active_nodes
+        ]
+        self._neg_tls = -tls
+        self._neg_area_over_tls = -self._area_active / tls
 
         # Subsurface discharge: zero where slope is flat
-        self.qss[active_nodes] = 0.0
-        self.qss[active_nodes] = tls * (1.0 - np.exp(-pa[active_nodes] / tls))
+        self.qss.fill(0.0)
+
+        self._qss_active = np.empty_like(tls)
+        self._q_active = np.empty_like(tls)
+
+    def create_and_move_water(self, step):
+        """Create and move water, then refresh the cached runoff factors."""
+        super().create_and_move_water(step)
+        self._update_runoff_cache()
+
+    def calc_runoff_and_discharge(self):
+        """Calculate runoff rate and discharge; return runoff.
+
+        This is evaluated once per stochastic sub-step, so it works in place
+        on the factors cached by **_update_runoff_cache** and allocates no
+        temporary arrays.
+        """
+        q = self.grid.at_node["surface_water__discharge"]
+        qss_active = self._qss_active
+        q_active = self._q_active
+
+        # Here"s the total (surface + subsurface) discharge
+        np.multiply(self.grid.at_node["drainage_area"], self.rain_rate, out=q)
+
+        # Subsurface discharge, Q_ss = TlS [1 - exp(-PA / TlS)]
+        np.multiply(self._neg_area_over_tls, self.rain_rate, out=qss_active)
+        np.expm1(qss_active, out=qss_active)
+        np.multiply(qss_active, self._neg_tls, out=qss_active)
+        np.put(self.qss, self._active_nodes, qss_active)
 
         # Surface discharge = total minus subsurface
         #
         # Note that roundoff errors can sometimes produce a tiny negative
         # value when qss and pa are close; make sure these are set to 0
-        self.grid.at_node["surface_water__discharge"][:] = pa - self.qss
-        self.grid.at_node["surface_water__discharge"][
-            self.grid.at_node["surface_water__discharge"] < 0.0
-        ] = 0.0
+        np.multiply(self._area_active, self.rain_rate, out=q_active)
+        np.subtract(q_active, qss_active, out=q_active)
+        np.maximum(q_active, 0.0, out=q_active)
+        np.put(q, self._active_nodes, q_active)
 
         return np.nan
 
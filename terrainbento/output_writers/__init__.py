@@ -5,9 +5,17 @@ This text to be filled out...
 
 from .generic_output_writer import (
     GenericOutputWriter,
+    OutputBudgetWarning,
     OutputIteratorSkipWarning,
 )
+from .output_manifest import OutputManifest
+from .ow_delta_snapshot import DeltaSnapshotReader, OWDeltaSnapshot
+from .ow_pyramid_netcdf import OWPyramidNetCDF
+from .ow_reductions import OWReductions, OWRunningReductions
+from .ow_region_netcdf import OWRegionNetCDF
+from .ow_ring_buffer import OWRingBuffer, RingBuffer
 from .ow_simple_netcdf import OWSimpleNetCDF
+from .ow_unstructured_netcdf import OWUnstructuredNetCDF
 from .static_interval_adapters import (
     StaticIntervalOutputClassAdapter,
     StaticIntervalOutputFunctionAdapter,
@@ -20,5 +28,16 @@ __all__ = [
     "StaticIntervalOutputClassAdapter",
     "StaticIntervalOutputFunctionAdapter",
     "OutputIteratorSkipWarning",
+    "OutputBudgetWarning",
     "OWSimpleNetCDF",
+    "OWDeltaSnapshot",
+    "DeltaSnapshotReader",
+    "OWRingBuffer",
+    "RingBuffer",
+    "OWRegionNetCDF",
+    "OWReductions",
+    "OWRunningReductions",
+    "OutputManifest",
+    "OWPyramidNetCDF",
+    "OWUnstructuredNetCDF",
 ]
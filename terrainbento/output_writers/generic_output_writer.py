@@ -2,9 +2,16 @@
 
 import itertools
 import os
+import time
 import warnings
 
 
+def _extension(filepath):
+    """Extension of a filepath, without the leading period."""
+    # Note: ''[1:] will return '' (i.e. does not crash if no extension)
+    return os.path.splitext(filepath)[1][1:]
+
+
 class OutputIteratorSkipWarning(UserWarning):
     """
     A UserWarning child class raised when the advancing iterator skips a
@@ -20,6 +27,21 @@ class OutputIteratorSkipWarning(UserWarning):
         )
 
 
+class OutputBudgetWarning(UserWarning):
+    """
+    A UserWarning child class raised when an output writer takes more of the
+    run time than the output budget of the model allows.
+    """
+
+    def get_message(name, share, budget):
+        return "".join(
+            [
+                f"Output writer {name} took {share:.1%} of the run time, ",
+                f"more than the output budget of {budget:.1%}.",
+            ]
+        )
+
+
 class GenericOutputWriter:
     r"""Base class for all new style output writers or converted old style
     output writers.
@@ -136,7 +158,17 @@ class GenericOutputWriter:
             self.vprint("Making output directory at {output_dir}")
             os.mkdir(output_dir)
         self._output_dir = output_dir
-        self._output_filepaths = []
+        # Registered filepaths by extension, in the order they were written.
+        # Dictionaries keep registration and lookups from scanning every
+        # filepath written so far.
+        self._output_filepaths = {}
+        self._filepaths_by_extension = {}
+
+        # Cost accounting: the wall time and bytes written by each call of
+        # **timed_run_one_step**, and the last known size of each file.
+        self._output_costs = []
+        self._file_sizes = {}
+        self._touched_filepaths = None
 
         # Register the times_iter if one was provided.
         if times_iter is not None:
@@ -198,7 +230,23 @@ class GenericOutputWriter:
     def output_filepaths(self):
         """Return a list of all output filepaths that have been written by
         this writer and registered with **register_output_filepath**."""
-        return self._output_filepaths
+        return list(self._output_filepaths)
+
+    @property
+    def output_costs(self):
+        """Return the model time, wall time in seconds and bytes written of
+        each call of **timed_run_one_step**."""
+        return list(self._output_costs)
+
+    @property
+    def total_output_time(self):
+        """Wall time in seconds spent in **timed_run_one_step**."""
+        return sum(cost[1] for cost in self._output_costs)
+
+    @property
+    def total_bytes_written(self):
+        """Bytes written to registered files by **timed_run_one_step**."""
+        return sum(cost[2] for cost in self._output_costs)
 
     # Time iterator methods
     def register_times_iter(self, times_iter):
@@ -220,6 +268,25 @@ class GenericOutputWriter:
 
         self._times_iter = times_iter
 
+    def thin_output_times(self, factor=2):
+        """Keep only every **factor**-th of the output times still to come.
+
+        The next output time, which has already been taken from the times
+        iterator, is kept. Saving the last time step is still honored by
+        **advance_iter**.
+
+        Parameters
+        ----------
+        factor : int, optional
+            Defaults to 2, which halves the number of output times.
+        """
+        if int(factor) < 1:
+            raise ValueError("factor must be at least one.")
+        if self._times_iter is not None and int(factor) > 1:
+            self._times_iter = itertools.islice(
+                self._times_iter, int(factor) - 1, None, int(factor)
+            )
+
     def advance_iter(self):
         r"""Public-facing function for advancing the output times iterator.
 
@@ -395,6 +462,34 @@ class GenericOutputWriter:
             "The inheriting class needs to implement this function."
         )
 
+    def timed_run_one_step(self):
+        """Run **run_one_step** and record what it cost.
+
+        The wall time of the call and the number of bytes it added to the
+        files it registered are appended to **output_costs**. Files that are
+        appended to are counted if the writer registers them again.
+        """
+        self._touched_filepaths = {}
+        start = time.perf_counter()
+        try:
+            self.run_one_step()
+        finally:
+            elapsed = time.perf_counter() - start
+            touched = self._touched_filepaths
+            self._touched_filepaths = None
+
+        bytes_written = 0
+        for filepath in touched:
+            try:
+                size = os.path.getsize(filepath)
+            except OSError:
+                continue
+            bytes_written += max(size - self._file_sizes.get(filepath, 0), 0)
+            self._file_sizes[filepath] = size
+        self._output_costs.append(
+            (self.model.model_time, elapsed, bytes_written)
+        )
+
     # File management
     def make_filepath(self, filename):
         """ Join the output directory to a filename. """
@@ -433,9 +528,53 @@ class GenericOutputWriter:
             Filepath to a new file that will be registered.
         """
 
+        if self._touched_filepaths is not None:
+            self._touched_filepaths[filepath] = None
         if not self.is_file_registered(filepath):
             self.vprint(f"Registering a new filepath {filepath}")
-            self._output_filepaths.append(filepath)
+            file_ext = _extension(filepath)
+            self._output_filepaths[filepath] = file_ext
+            self._filepaths_by_extension.setdefault(file_ext, {})[
+                filepath
+            ] = None
+            manifest = getattr(self.model, "output_manifest", None)
+            if manifest is not None:
+                manifest.add(filepath, self.name, self.model.model_time)
+
+    def delete_output_file(self, filepath):
+        """Delete one registered output file and unregister it.
+
+        Parameters
+        ----------
+        filepath : string
+            Filepath of a file registered by this writer.
+
+        Returns
+        -------
+        deleted : bool
+            False if the operating system did not permit the file to be
+            deleted, in which case it stays registered.
+        """
+        self.vprint(f"Deleting {filepath}")
+        try:
+            os.remove(filepath)
+        except WindowsError:  # pragma: no cover
+            print(
+                "The Windows OS is picky about file-locks and did "
+                "not permit terrainbento to remove the netcdf files."
+            )
+            return False
+
+        file_ext = self._output_filepaths.pop(filepath)
+        same_extension = self._filepaths_by_extension[file_ext]
+        del same_extension[filepath]
+        if not same_extension:
+            del self._filepaths_by_extension[file_ext]
+        self._file_sizes.pop(filepath, None)
+        manifest = getattr(self.model, "output_manifest", None)
+        if manifest is not None:
+            manifest.remove(filepath)
+        return True
 
     def delete_output_files(self, only_extension=None):
         """Delete output files generated by this writer that have been
@@ -449,31 +588,14 @@ class GenericOutputWriter:
             registered.
         """
 
-        output_filepaths = self._output_filepaths
-        keep_filepaths = []
-
         self.vprint("Deleting files...")
-        self.vprint(f"{self.name} wrote: {output_filepaths}")
-        for filepath in output_filepaths:
-            # Note: ''[1:] will return '' (i.e. does not crash if no extension)
-            file_ext = os.path.splitext(filepath)[1][1:]
+        self.vprint(f"{self.name} wrote: {self.output_filepaths}")
+        for (filepath, file_ext) in list(self._output_filepaths.items()):
             if only_extension is None or file_ext in only_extension:
                 # Deleting all files or just the target extension type
-                self.vprint(f"Deleting {filepath}")
-                try:
-                    os.remove(filepath)
-                except WindowsError:  # pragma: no cover
-                    print(
-                        "The Windows OS is picky about file-locks and did "
-                        "not permit terrainbento to remove the netcdf files."
-                    )
-                    keep_filepaths.append(filepath)  # could not delete
+                self.delete_output_file(filepath)
             else:
                 self.vprint(f"Keeping {filepath}")
-                # Not deleting this file
-                keep_filepaths.append(filepath)
-
-        self._output_filepaths = keep_filepaths
 
     def get_output_filepaths(self, only_extension=None):
         """Get a list of all output files created by this writer that have
@@ -493,16 +615,9 @@ class GenericOutputWriter:
             registered.
         """
 
-        output_filepaths = self._output_filepaths
-        return_filepaths = []
-
-        for filepath in output_filepaths:
-            # Note: ''[1:] will return '' (i.e. does not crash if no extension)
-            file_ext = os.path.splitext(filepath)[1][1:]
-            if only_extension is None or file_ext == only_extension:
-                return_filepaths.append(filepath)
-
-        return return_filepaths
+        if only_extension is None:
+            return list(self._output_filepaths)
+        return list(self._filepaths_by_extension.get(only_extension, ()))
 
     def vprint(self, msg):
         """ Print output to the standard output stream if in verbose mode. """
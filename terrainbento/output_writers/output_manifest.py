@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""An index of the files written by output writers.
+
+An **OutputManifest** records, for each output file, the writer that wrote
+it, the model time it was written at and its extension. The files are
+indexed in dictionaries by path and by every combination of writer, time and
+extension, so lookups do not scan the list of files.
+
+The manifest is also kept on disk as a log in the json lines format: each
+file that is registered or removed appends one line. The log is only ever
+appended to, so it is complete up to the last file written even if the run
+crashes, and **OutputManifest.load** rebuilds the index of a finished or
+crashed run without looking at the output directory.
+"""
+
+import itertools
+import json
+import threading
+
+from terrainbento.output_writers.generic_output_writer import _extension
+
+
+class OutputManifest(object):
+    """Index of output files by path, writer and extension.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> from terrainbento.output_writers import OutputManifest
+    >>> log = os.path.join(tempfile.mkdtemp(), "manifest.jsonl")
+    >>> manifest = OutputManifest(log)
+    >>> manifest.add("a_time-0.nc", "netcdf", 0.0)
+    >>> manifest.add("a_time-0.png", "plot", 0.0)
+    >>> manifest.add("a_time-10.nc", "netcdf", 10.0)
+    >>> manifest.paths(extension="nc")
+    ['a_time-0.nc', 'a_time-10.nc']
+    >>> manifest.remove("a_time-0.nc")
+    >>> manifest.paths(writer="netcdf")
+    ['a_time-10.nc']
+    >>> manifest.paths(time=0.0)
+    ['a_time-0.png']
+
+    The log rebuilds the same index.
+
+    >>> OutputManifest.load(log).paths()
+    ['a_time-0.png', 'a_time-10.nc']
+    >>> OutputManifest.load(log).record("a_time-10.nc")
+    {'writer': 'netcdf', 'time': 10.0, 'extension': 'nc'}
+    """
+
+    def __init__(self, filepath=None):
+        """
+        Parameters
+        ----------
+        filepath : str, optional
+            Path of the log. A new log is started there when the first file
+            is added, replacing any earlier log at that path. Default is
+            None, which keeps the manifest in memory only.
+        """
+        self._filepath = filepath
+        self._started = False
+        # writers that run in a thread pool may add files at the same time.
+        self._lock = threading.Lock()
+        self._records = {}
+        # paths by (writer, time, extension), with None in place of any
+        # of them, for every combination.
+        self._index_by_key = {}
+
+    @classmethod
+    def load(cls, filepath):
+        """Rebuild a manifest from its log.
+
+        Files added to the returned manifest are appended to the same log.
+        A last line that was cut off, as by a crash, is ignored.
+
+        Parameters
+        ----------
+        filepath : str
+            Path of the log.
+
+        Returns
+        -------
+        OutputManifest
+        """
+        manifest = cls(filepath)
+        manifest._started = True
+        with open(filepath) as fp:
+            for line in fp:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if entry["action"] == "add":
+                    manifest._index(
+                        entry["path"], entry["writer"], entry["time"]
+                    )
+                else:
+                    manifest._unindex(entry["path"])
+        return manifest
+
+    @property
+    def filepath(self):
+        """Path of the log, or None."""
+        return self._filepath
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, filepath):
+        return filepath in self._records
+
+    def record(self, filepath):
+        """Return the writer, time and extension of a file.
+
+        Parameters
+        ----------
+        filepath : str
+
+        Returns
+        -------
+        dict
+        """
+        return dict(self._records[filepath])
+
+    def paths(self, writer=None, extension=None, time=None):
+        """Return the paths of some files, in the order they were added.
+
+        Parameters
+        ----------
+        writer : str, optional
+            Name of the writer of the files. Default is any writer.
+        extension : str, optional
+            Extension of the files, without the leading period. Default is
+            any extension.
+        time : float, optional
+            Model time the files were written at. Default is any time.
+
+        Returns
+        -------
+        list of str
+        """
+        if time is not None:
+            time = float(time)
+        return list(self._index_by_key.get((writer, time, extension), ()))
+
+    @property
+    def writers(self):
+        """Names of the writers that have files in the manifest."""
+        return [
+            key[0]
+            for key in self._index_by_key
+            if key[0] is not None and key[1:] == (None, None)
+        ]
+
+    def add(self, filepath, writer, time):
+        """Add a file to the index and to the log.
+
+        A file that is already in the manifest is not added again.
+
+        Parameters
+        ----------
+        filepath : str
+        writer : str
+            Name of the writer of the file.
+        time : float
+            Model time the file was written at.
+        """
+        with self._lock:
+            if filepath in self._records:
+                return
+            self._index(filepath, writer, float(time))
+            self._log(
+                {
+                    "action": "add",
+                    "path": filepath,
+                    "writer": writer,
+                    "time": float(time),
+                }
+            )
+
+    def remove(self, filepath):
+        """Remove a file from the index, and log the removal.
+
+        Parameters
+        ----------
+        filepath : str
+        """
+        with self._lock:
+            if filepath in self._records:
+                self._unindex(filepath)
+                self._log({"action": "remove", "path": filepath})
+
+    @staticmethod
+    def _keys(record):
+        """Index keys of a file, with None in place of any field."""
+        fields = (record["writer"], record["time"], record["extension"])
+        return itertools.product(*[(field, None) for field in fields])
+
+    def _index(self, filepath, writer, time):
+        record = {
+            "writer": writer,
+            "time": time,
+            "extension": _extension(filepath),
+        }
+        self._records[filepath] = record
+        for key in self._keys(record):
+            self._index_by_key.setdefault(key, {})[filepath] = None
+
+    def _unindex(self, filepath):
+        record = self._records.pop(filepath, None)
+        if record is not None:
+            for key in self._keys(record):
+                paths = self._index_by_key[key]
+                del paths[filepath]
+                if not paths:
+                    del self._index_by_key[key]
+
+    def _log(self, entry):
+        if self._filepath is None:
+            return
+        mode = "a" if self._started else "w"
+        with open(self._filepath, mode) as fp:
+            fp.write(json.dumps(entry) + "\n")
+        self._started = True
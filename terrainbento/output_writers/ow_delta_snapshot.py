@@ -0,0 +1,475 @@
+#!/usr/bin/env python3
+
+import json
+import os.path
+import zlib
+
+import numpy as np
+import xarray as xr
+from landlab import RasterModelGrid
+
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+_INT_DTYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _smallest_int_dtype(values):
+    """Return the smallest integer dtype that holds all of values."""
+    largest = np.max(np.abs(values)) if values.size else 0
+    for dtype in _INT_DTYPES:
+        if largest <= np.iinfo(dtype).max:
+            return dtype
+    raise ValueError(
+        "Elevation difference is too large to store at the requested "
+        "precision."
+    )
+
+
+class OWDeltaSnapshot(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        output_fields="topographic__elevation",
+        name="delta-snapshot",
+        precision=1e-6,
+        keyframe_interval=10,
+        chunk_size=65536,
+        compression_level=1,
+        **static_interval_kwargs,
+    ):
+        r"""An output writer that stores at-node fields as compressed deltas.
+
+        Consecutive snapshots of a field such as ``topographic__elevation``
+        differ little, so most of each snapshot is redundant. This writer
+        stores every ``keyframe_interval``-th snapshot in full (a keyframe)
+        and, in between, the difference from the previous snapshot quantized
+        to ``precision`` and stored in the smallest integer type that holds
+        it. Each record is split into chunks of ``chunk_size`` nodes that are
+        compressed separately with zlib.
+
+        Differences are taken from the previous snapshot as it will be
+        reconstructed, so the error of any reconstructed value is at most
+        half of ``precision`` and does not grow between keyframes. Keyframes
+        are exact.
+
+        All snapshots of a run go to one data file, with the extension
+        ``tbdelta``, and an index of JSON lines next to it, with the extension
+        ``jsonl``. The first line of the index describes the grid: the shape,
+        spacing and lower left corner of a raster, or, for other grids, the
+        name of a binary ``npy`` file next to the data file that holds the
+        coordinates of the nodes. All of these files are registered, so they
+        are found by **get_output**.
+        Use **DeltaSnapshotReader** to read them, or the **to_xarray_dataset**
+        method of the writer or of the model.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        output_fields : str or list of str, optional
+            At-node fields to write. Defaults to "topographic__elevation".
+
+        name : string, optional
+            The name of the output writer used when generating output
+            filenames. Defaults to "delta-snapshot".
+
+        precision : float, optional
+            Absolute precision of the values stored between keyframes.
+            Defaults to 1e-6.
+
+        keyframe_interval : int, optional
+            Number of snapshots from one keyframe to the next. Defaults to
+            10.
+
+        chunk_size : int, optional
+            Number of nodes compressed together. Reading a sub-region only
+            decompresses the chunks that hold it. Defaults to 65536.
+
+        compression_level : int, optional
+            zlib compression level, from 1 (fastest) to 9 (smallest).
+            Defaults to 1.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWDeltaSnapshot: object
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+
+        if isinstance(output_fields, str):
+            output_fields = [output_fields]
+        self.output_fields = list(output_fields)
+
+        if not precision > 0.0:
+            raise ValueError("OWDeltaSnapshot: precision must be positive.")
+        if int(keyframe_interval) < 1 or int(chunk_size) < 1:
+            raise ValueError(
+                "OWDeltaSnapshot: keyframe_interval and chunk_size must be "
+                "at least one."
+            )
+        self.precision = float(precision)
+        self.keyframe_interval = int(keyframe_interval)
+        self.chunk_size = int(chunk_size)
+        self.compression_level = int(compression_level)
+
+        prefix = "_".join(p for p in (model.output_prefix, self.name) if p)
+        self.data_filepath = self.make_filepath(f"{prefix}.tbdelta")
+        self.index_filepath = f"{self.data_filepath}.jsonl"
+        self.coordinates_filepath = f"{self.data_filepath}.xy.npy"
+        self._reconstructed = {}
+        self._number_of_snapshots = 0
+
+    def _write_header(self):
+        grid = self.model.grid
+        header = {
+            "fields": self.output_fields,
+            "number_of_nodes": int(grid.number_of_nodes),
+            "precision": self.precision,
+            "keyframe_interval": self.keyframe_interval,
+            "chunk_size": self.chunk_size,
+            "shape": None,
+            "coordinates": None,
+        }
+        for filepath in (
+            self.data_filepath,
+            self.index_filepath,
+            self.coordinates_filepath,
+        ):
+            if os.path.exists(filepath):
+                os.remove(filepath)
+        if isinstance(grid, RasterModelGrid):
+            header["shape"] = list(grid.shape)
+            header["xy_spacing"] = [float(grid.dx), float(grid.dy)]
+            header["xy_of_lower_left"] = [
+                float(xy) for xy in grid.xy_of_lower_left
+            ]
+        else:
+            # the coordinates of irregular grids are too large for a line
+            # of JSON, so they go to a binary file.
+            np.save(
+                self.coordinates_filepath,
+                np.vstack((grid.x_of_node, grid.y_of_node)),
+            )
+            header["coordinates"] = os.path.basename(self.coordinates_filepath)
+            self.register_output_filepath(self.coordinates_filepath)
+        with open(self.index_filepath, "w") as f:
+            f.write(json.dumps(header) + "\n")
+
+    def run_one_step(self):
+        """ Append a keyframe or a delta record to the data file. """
+        if self._number_of_snapshots == 0:
+            self._write_header()
+        keyframe = self._number_of_snapshots % self.keyframe_interval == 0
+
+        record = {
+            "time": float(self.model.model_time),
+            "keyframe": keyframe,
+            "dtype": {},
+            "chunks": {},
+        }
+        with open(self.data_filepath, "ab") as f:
+            offset = f.tell()
+            for field in self.output_fields:
+                values = np.asarray(
+                    self.model.grid.at_node[field], dtype=float
+                )
+                if keyframe:
+                    payload = values.copy()
+                    self._reconstructed[field] = payload.copy()
+                else:
+                    reconstructed = self._reconstructed[field]
+                    steps = np.rint((values - reconstructed) / self.precision)
+                    payload = steps.astype(_smallest_int_dtype(steps))
+                    reconstructed += payload * self.precision
+                record["dtype"][field] = payload.dtype.str
+
+                chunks = []
+                for start in range(0, payload.size, self.chunk_size):
+                    blob = zlib.compress(
+                        payload[start : start + self.chunk_size].tobytes(),
+                        self.compression_level,
+                    )
+                    f.write(blob)
+                    chunks.append([offset, len(blob)])
+                    offset += len(blob)
+                record["chunks"][field] = chunks
+
+        with open(self.index_filepath, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        self._number_of_snapshots += 1
+
+        self.register_output_filepath(self.data_filepath)
+        self.register_output_filepath(self.index_filepath)
+
+    def reader(self):
+        """Return a **DeltaSnapshotReader** of the snapshots written so far."""
+        return DeltaSnapshotReader(self.data_filepath)
+
+    def to_xarray_dataset(self, nodes=None):
+        """Return the snapshots written so far as an xarray dataset.
+
+        See :py:meth:`DeltaSnapshotReader.to_xarray_dataset`.
+        """
+        return self.reader().to_xarray_dataset(nodes=nodes)
+
+
+class DeltaSnapshotReader(object):
+    """Read snapshots written by **OWDeltaSnapshot**.
+
+    A snapshot is reconstructed from the keyframe before it and the delta
+    records in between, so reading one snapshot, or a range of them, does not
+    decode the rest of the series. When only some nodes are asked for, only
+    the chunks that hold them are decompressed.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from landlab import RasterModelGrid
+    >>> from terrainbento import Basic, Clock
+    >>> from terrainbento.output_writers import (
+    ...     DeltaSnapshotReader,
+    ...     OWDeltaSnapshot,
+    ... )
+    >>> grid = RasterModelGrid((4, 5))
+    >>> z = grid.add_zeros("node", "topographic__elevation")
+    >>> model = Basic(
+    ...     Clock(step=1.0, stop=6.0),
+    ...     grid,
+    ...     output_writers={
+    ...         "delta": {
+    ...             "class": OWDeltaSnapshot,
+    ...             "kwargs": {"intervals": 1.0, "keyframe_interval": 3},
+    ...         }
+    ...     },
+    ...     output_default_netcdf=False,
+    ...     output_dir=tempfile.mkdtemp(),
+    ... )
+    >>> model.run()
+    >>> path = model.get_output(extension="tbdelta")[0]
+    >>> reader = DeltaSnapshotReader(path)
+    >>> reader.times
+    array([ 0.,  1.,  2.,  3.,  4.,  5.,  6.])
+    >>> reader.read(4).shape
+    (20,)
+    >>> reader.read_series(start=2, stop=5, nodes=[6, 7]).shape
+    (3, 2)
+    """
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the data file, or to its index.
+        """
+        if path.endswith(".jsonl"):
+            path = path[: -len(".jsonl")]
+        index_path = f"{path}.jsonl"
+        if not (os.path.exists(path) and os.path.exists(index_path)):
+            raise ValueError(
+                f"DeltaSnapshotReader: {path} or its index does not exist."
+            )
+        self.path = path
+        with open(index_path) as f:
+            header = json.loads(f.readline())
+            self._records = [json.loads(line) for line in f if line.strip()]
+
+        self.fields = header["fields"]
+        self.number_of_nodes = header["number_of_nodes"]
+        self.precision = header["precision"]
+        self.chunk_size = header["chunk_size"]
+        self.shape = header["shape"]
+        if self.shape is None:
+            self._xy_of_node = np.load(
+                os.path.join(os.path.dirname(path), header["coordinates"]),
+                mmap_mode="r",
+            )
+        else:
+            (ny, nx) = self.shape
+            (dx, dy) = header["xy_spacing"]
+            (x0, y0) = header["xy_of_lower_left"]
+            self._x = x0 + dx * np.arange(nx)
+            self._y = y0 + dy * np.arange(ny)
+        self.times = np.array([r["time"] for r in self._records])
+        self._keyframes = np.flatnonzero(
+            [r["keyframe"] for r in self._records]
+        )
+
+    def __len__(self):
+        return len(self._records)
+
+    def coordinates(self, nodes=None):
+        """Return the x and y coordinates of some nodes.
+
+        Parameters
+        ----------
+        nodes : array of int, optional
+            Nodes to return the coordinates of. Defaults to all nodes.
+
+        Returns
+        -------
+        tuple of array of float
+            The x and the y coordinates of the nodes.
+        """
+        if nodes is None:
+            nodes = np.arange(self.number_of_nodes)
+        nodes = np.asarray(nodes, dtype=int).reshape(-1)
+        if self.shape is None:
+            return (
+                np.array(self._xy_of_node[0, nodes]),
+                np.array(self._xy_of_node[1, nodes]),
+            )
+        (rows, columns) = np.divmod(nodes, self.shape[1])
+        return (self._x[columns], self._y[rows])
+
+    @property
+    def x_of_node(self):
+        """x coordinates of all nodes."""
+        return self.coordinates()[0]
+
+    @property
+    def y_of_node(self):
+        """y coordinates of all nodes."""
+        return self.coordinates()[1]
+
+    def _decode(self, f, record, field, chunks):
+        """Decode some chunks of one record of a field."""
+        dtype = np.dtype(record["dtype"][field])
+        decoded = {}
+        for chunk in chunks:
+            (offset, length) = record["chunks"][field][chunk]
+            f.seek(offset)
+            decoded[chunk] = np.frombuffer(
+                zlib.decompress(f.read(length)), dtype=dtype
+            )
+        return decoded
+
+    def read_series(self, field=None, start=0, stop=None, nodes=None):
+        """Reconstruct a range of snapshots of a field.
+
+        Parameters
+        ----------
+        field : str, optional
+            Field to read. Defaults to the first field written.
+        start, stop : int, optional
+            Range of snapshot numbers, as for a slice. Defaults to all
+            snapshots.
+        nodes : array of int, optional
+            Nodes to read. Defaults to all nodes.
+
+        Returns
+        -------
+        array of float, shape (number of snapshots, number of nodes)
+        """
+        field = self.fields[0] if field is None else field
+        if field not in self.fields:
+            raise ValueError(f"DeltaSnapshotReader: no field {field}.")
+        (start, stop, _) = slice(start, stop).indices(len(self))
+        if nodes is None:
+            nodes = np.arange(self.number_of_nodes)
+        nodes = np.asarray(nodes, dtype=int).reshape(-1)
+        series = np.empty((max(stop - start, 0), nodes.size))
+        if series.shape[0] == 0:
+            return series
+
+        # positions of the nodes in the chunks that hold them.
+        chunks = np.unique(nodes // self.chunk_size)
+        first_node = chunks * self.chunk_size
+        sizes = np.minimum(self.chunk_size, self.number_of_nodes - first_node)
+        where = np.searchsorted(chunks, nodes // self.chunk_size)
+        position = np.concatenate(([0], np.cumsum(sizes)[:-1]))[where] + (
+            nodes % self.chunk_size
+        )
+
+        keyframe = self._keyframes[
+            np.searchsorted(self._keyframes, start, "right") - 1
+        ]
+        with open(self.path, "rb") as f:
+            values = None
+            for i in range(keyframe, stop):
+                record = self._records[i]
+                decoded = self._decode(f, record, field, chunks)
+                payload = np.concatenate([decoded[c] for c in chunks])
+                if record["keyframe"]:
+                    values = payload.astype(float)
+                else:
+                    values += payload * self.precision
+                if i >= start:
+                    series[i - start] = values[position]
+        return series
+
+    def read(self, snapshot, field=None, nodes=None):
+        """Reconstruct one snapshot of a field.
+
+        Parameters
+        ----------
+        snapshot : int
+            Number of the snapshot.
+        field : str, optional
+            Field to read. Defaults to the first field written.
+        nodes : array of int, optional
+            Nodes to read. Defaults to all nodes.
+
+        Returns
+        -------
+        array of float
+        """
+        if snapshot < 0:
+            snapshot += len(self)
+        if not 0 <= snapshot < len(self):
+            raise ValueError(
+                f"DeltaSnapshotReader: no snapshot number {snapshot}."
+            )
+        return self.read_series(
+            field=field, start=snapshot, stop=snapshot + 1, nodes=nodes
+        )[0]
+
+    def to_xarray_dataset(self, nodes=None):
+        """Return all snapshots of all fields as an xarray dataset.
+
+        Raster grids read in full have dimensions of time, y and x; otherwise
+        the dimensions are time and node.
+
+        Parameters
+        ----------
+        nodes : array of int, optional
+            Nodes to read. Defaults to all nodes.
+
+        Returns
+        -------
+        xarray.Dataset
+        """
+        data_vars = {}
+        if nodes is None and self.shape is not None:
+            (ny, nx) = self.shape
+            coords = {"time": self.times, "y": self._y, "x": self._x}
+            for field in self.fields:
+                data_vars[field] = (
+                    ("time", "y", "x"),
+                    self.read_series(field).reshape((-1, ny, nx)),
+                )
+        else:
+            if nodes is None:
+                nodes = np.arange(self.number_of_nodes)
+            nodes = np.asarray(nodes, dtype=int).reshape(-1)
+            (x, y) = self.coordinates(nodes)
+            coords = {
+                "time": self.times,
+                "node": nodes,
+                "x": ("node", x),
+                "y": ("node", y),
+            }
+            for field in self.fields:
+                data_vars[field] = (
+                    ("time", "node"),
+                    self.read_series(field, nodes=nodes),
+                )
+        return xr.Dataset(data_vars, coords=coords)
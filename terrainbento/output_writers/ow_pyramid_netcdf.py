@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import xarray as xr
+from landlab import RasterModelGrid
+
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+
+def _pool(total, count, peak, factor):
+    """Reduce blocks of ``factor`` by ``factor`` cells of a level.
+
+    A level is given by the sum, the number of nodes and the maximum of the
+    nodes under each of its cells. The last row and column of blocks may be
+    partial; they are padded with cells that have no nodes.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.output_writers.ow_pyramid_netcdf import _pool
+    >>> z = np.arange(15.0).reshape((3, 5))
+    >>> (total, count, peak) = _pool(z, np.ones_like(z), z, 2)
+    >>> total / count
+    array([[  3. ,   5. ,   6.5],
+           [ 10.5,  12.5,  14. ]])
+    >>> peak
+    array([[  6.,   8.,   9.],
+           [ 11.,  13.,  14.]])
+    """
+    (ny, nx) = total.shape
+    shape = (-(-ny // factor), factor, -(-nx // factor), factor)
+    pad = ((0, shape[0] * factor - ny), (0, shape[2] * factor - nx))
+    if pad != ((0, 0), (0, 0)):
+        total = np.pad(total, pad)
+        count = np.pad(count, pad)
+        peak = np.pad(peak, pad, constant_values=-np.inf)
+    return (
+        total.reshape(shape).sum(axis=(1, 3)),
+        count.reshape(shape).sum(axis=(1, 3)),
+        peak.reshape(shape).max(axis=(1, 3)),
+    )
+
+
+class OWPyramidNetCDF(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        output_fields="topographic__elevation",
+        name="pyramid-netCDF",
+        factor=2,
+        levels=None,
+        tile_size=256,
+        **static_interval_kwargs,
+    ):
+        """An output writer for fields of a raster and downsampled copies.
+
+        At each output time the writer writes a netCDF4 file with a pyramid
+        of the output fields. Level ``k > 0`` of the pyramid reduces blocks of
+        ``factor**k`` by ``factor**k`` nodes of the grid to a single cell,
+        and holds the mean (``<field>_mean``) and the maximum
+        (``<field>_max``) of each field over those nodes, with the mean
+        coordinates of the nodes as x and y. Level 0 is the grid itself, at
+        full resolution, and holds each field under its own name with the
+        coordinates of the nodes as x and y.
+
+        Each level is in a netCDF group named "level_<k>" and is stored in
+        compressed tiles of ``tile_size`` by ``tile_size`` cells, so that a
+        coarse level, or a small window of a fine level, is read without
+        reading the rest of the file. Use **open_level** to open a level.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        output_fields : str or list of str, optional
+            At-node fields to write. Defaults to "topographic__elevation".
+
+        name : string, optional
+            The name of the output writer used when generating output
+            filenames. Defaults to "pyramid-netCDF".
+
+        factor : int, optional
+            Number of cells along each side of a block that is reduced to one
+            cell of the next level. Defaults to 2.
+
+        levels : int, optional
+            Number of levels written after level 0. Defaults to the number of
+            levels it takes for a level to fit in one tile.
+
+        tile_size : int, optional
+            Number of cells along each side of a tile. Defaults to 256.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWPyramidNetCDF: object
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWPyramidNetCDF
+        >>> grid = RasterModelGrid((6, 8))
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> z[:] = grid.x_of_node
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=2.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "pyramid": {
+        ...             "class": OWPyramidNetCDF,
+        ...             "kwargs": {"intervals": 2.0, "tile_size": 2},
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> writer = model.get_output_writer("pyramid")[0]
+        >>> writer.number_of_levels
+        2
+        >>> level = writer.open_level(2)
+        >>> level["topographic__elevation_max"].values
+        array([[ 3.,  7.],
+               [ 3.,  7.]])
+        >>> level.close()
+        >>> level = writer.open_level(0)
+        >>> level["topographic__elevation"].shape
+        (6, 8)
+        >>> level.close()
+        >>> model.remove_output()
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+
+        grid = self.model.grid
+        if not isinstance(grid, RasterModelGrid):
+            raise ValueError("OWPyramidNetCDF: the grid must be a raster.")
+        if int(factor) < 2:
+            raise ValueError("OWPyramidNetCDF: factor must be at least two.")
+        if int(tile_size) < 1:
+            raise ValueError(
+                "OWPyramidNetCDF: tile_size must be at least one."
+            )
+        self.factor = int(factor)
+        self.tile_size = int(tile_size)
+
+        if levels is None:
+            levels = 1
+            size = max(grid.shape)
+            while -(-size // self.factor ** levels) > self.tile_size:
+                levels += 1
+        if int(levels) < 1:
+            raise ValueError("OWPyramidNetCDF: levels must be at least one.")
+        self.number_of_levels = int(levels)
+
+        if isinstance(output_fields, str):
+            output_fields = [output_fields]
+        self.output_fields = list(output_fields)
+        self.output_times = []
+
+        # coordinates of the cells of each level do not change.
+        self._coordinates = self._pyramid(
+            {
+                "x": grid.x_of_node.reshape(grid.shape),
+                "y": grid.y_of_node.reshape(grid.shape),
+            }
+        )
+
+    def _pyramid(self, arrays):
+        """Return the mean and maximum of some arrays at each level.
+
+        Parameters
+        ----------
+        arrays : dict
+            Arrays shaped like the grid, by name.
+
+        Returns
+        -------
+        list of dict
+            For each level, starting at level 1, the mean and the maximum of
+            each array, by name.
+        """
+        levels = [{} for _ in range(self.number_of_levels)]
+        for (name, values) in arrays.items():
+            values = np.asarray(values, dtype=float)
+            (total, count, peak) = (values, np.ones_like(values), values)
+            for level in levels:
+                (total, count, peak) = _pool(total, count, peak, self.factor)
+                level[name] = (total / count, peak)
+        return levels
+
+    def run_one_step(self):
+        """ Write the pyramid of the output fields to a netCDF file. """
+        grid = self.model.grid
+        pyramid = self._pyramid(
+            {
+                field: grid.at_node[field].reshape(grid.shape)
+                for field in self.output_fields
+            }
+        )
+
+        filepath = self.make_filepath(f"{self.filename_prefix}.nc")
+        self._write_level(
+            filepath,
+            0,
+            {
+                field: (("y", "x"), grid.at_node[field].reshape(grid.shape))
+                for field in self.output_fields
+            },
+            grid.x_of_node[: grid.shape[1]],
+            grid.y_of_node[:: grid.shape[1]],
+        )
+        for (k, (level, coordinates)) in enumerate(
+            zip(pyramid, self._coordinates), start=1
+        ):
+            data_vars = {}
+            for field in self.output_fields:
+                (mean, peak) = level[field]
+                data_vars[f"{field}_mean"] = (("y", "x"), mean)
+                data_vars[f"{field}_max"] = (("y", "x"), peak)
+            self._write_level(
+                filepath,
+                k,
+                data_vars,
+                coordinates["x"][0][0, :],
+                coordinates["y"][0][:, 0],
+            )
+
+        self.register_output_filepath(filepath)
+        self.output_times.append(self.model.model_time)
+
+    def _write_level(self, filepath, k, data_vars, x, y):
+        """Write level ``k`` of a pyramid to its group, in tiles."""
+        ds = xr.Dataset(
+            data_vars,
+            coords={"x": x, "y": y},
+            attrs={"level": k, "block_size": self.factor ** k},
+        )
+        chunks = tuple(min(self.tile_size, n) for n in (len(y), len(x)))
+        encoding = {
+            var: {"chunksizes": chunks, "zlib": True, "complevel": 1}
+            for var in data_vars
+        }
+        ds.to_netcdf(
+            filepath,
+            mode="w" if k == 0 else "a",
+            group=f"level_{k}",
+            format="NETCDF4",
+            encoding=encoding,
+        )
+
+    def open_level(self, level, index=-1):
+        """Open a level of a pyramid written by the writer.
+
+        The level is opened lazily, so only the tiles that are used are
+        read.
+
+        Parameters
+        ----------
+        level : int
+            Level to open, from 0 to **number_of_levels**.
+        index : int, optional
+            Index of the output time. Defaults to the last one written.
+
+        Returns
+        -------
+        xarray.Dataset
+        """
+        if not 0 <= level <= self.number_of_levels:
+            raise ValueError(
+                f"OWPyramidNetCDF: level must be from 0 to "
+                f"{self.number_of_levels}."
+            )
+        filepath = self.get_output_filepaths("nc")[index]
+        return xr.open_dataset(filepath, group=f"level_{level}")
@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""Output writers that reduce the grid to a few numbers.
+
+Many studies only need a handful of summary values of each model state, such
+as the relief or the mean erosion rate. The writers in this module compute
+these reductions in memory and append them as rows to a single csv file, with
+one column per value, instead of writing whole grids.
+
+**OWReductions** writes the reductions at its output times.
+**OWRunningReductions** samples them at every model step and writes, at its
+own interval, the mean, minimum and maximum of the samples since the last
+row. It keeps only those running values, so its memory does not grow with
+the number of steps.
+
+Reductions are given by name or as a dictionary of callables. Built-in
+reductions are:
+
+* ``mean_elevation``: mean elevation of the core nodes.
+* ``relief``: difference between the highest and lowest node that is not
+  closed.
+* ``hypsometric_integral``: (mean - min) / (max - min) of the core node
+  elevations.
+* ``hypsometry``: the hypsometric curve, as the elevations below which a
+  fraction of the core nodes lie. Gives one column per fraction.
+* ``mean_erosion_rate``: rate of lowering of the mean elevation of the core
+  nodes since the previous sample. It is the erosion rate if the core nodes
+  are not uplifted, and the erosion rate minus the uplift rate otherwise.
+* ``outlet_sediment_flux``: sediment leaving the core nodes per unit time.
+  If the grid has a ``sediment__outflux`` field, the outflux of core nodes
+  that drain to a boundary node; otherwise the rate at which the volume of
+  the core cells decreases.
+* ``slope_area``: steepness and concavity of a least squares fit of
+  log(slope) = log(steepness) - concavity * log(area) over the core nodes.
+  Gives two columns.
+* ``fraction_above_contact``: fraction of the core nodes whose elevation is
+  above the ``lithology_contact__elevation`` field.
+
+A custom reduction is a callable that takes the model and returns a float, an
+array of floats or a dictionary of floats. Arrays and dictionaries give one
+column for each value, named after the reduction and the index or key.
+"""
+
+import csv
+import functools
+
+import numpy as np
+import xarray as xr
+
+from terrainbento.output_writers.generic_output_writer import (
+    GenericOutputWriter,
+)
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+_DEFAULT_REDUCTIONS = ("mean_elevation", "relief", "mean_erosion_rate")
+
+
+def _core_elevation(model):
+    grid = model.grid
+    return grid.at_node["topographic__elevation"][grid.core_nodes]
+
+
+def _mean_elevation(model):
+    return np.mean(_core_elevation(model))
+
+
+def _relief(model):
+    grid = model.grid
+    z = grid.at_node["topographic__elevation"]
+    z = z[grid.status_at_node != grid.BC_NODE_IS_CLOSED]
+    return np.max(z) - np.min(z)
+
+
+def _hypsometric_integral(model):
+    z = _core_elevation(model)
+    (z_min, z_max) = (np.min(z), np.max(z))
+    if z_max == z_min:
+        return np.nan
+    return (np.mean(z) - z_min) / (z_max - z_min)
+
+
+def _hypsometry(model, levels=11):
+    fractions = np.linspace(0.0, 1.0, levels)
+    elevations = np.quantile(_core_elevation(model), fractions)
+    return {f"{f:g}": z for (f, z) in zip(fractions, elevations)}
+
+
+def _core_volume(model):
+    grid = model.grid
+    core = grid.core_nodes
+    return np.sum(
+        grid.at_node["topographic__elevation"][core]
+        * grid.cell_area_at_node[core]
+    )
+
+
+def _slope_area(model):
+    grid = model.grid
+    core = grid.core_nodes
+    slope = grid.at_node["topographic__steepest_slope"][core]
+    area = grid.at_node["drainage_area"][core]
+    fitted = (slope > 0.0) & (area > 0.0)
+    if np.count_nonzero(fitted) < 2:
+        return {"steepness": np.nan, "concavity": np.nan}
+    (gradient, intercept) = np.polyfit(
+        np.log10(area[fitted]), np.log10(slope[fitted]), 1
+    )
+    return {"steepness": 10.0 ** intercept, "concavity": -gradient}
+
+
+def _fraction_above_contact(model):
+    grid = model.grid
+    if "lithology_contact__elevation" not in grid.at_node:
+        return np.nan
+    core = grid.core_nodes
+    contact = grid.at_node["lithology_contact__elevation"][core]
+    return np.mean(grid.at_node["topographic__elevation"][core] > contact)
+
+
+class _LoweringRate(object):
+    """Rate at which a quantity decreases between calls."""
+
+    def __init__(self, quantity):
+        self._quantity = quantity
+        self._previous = None
+
+    def __call__(self, model):
+        (time, value) = (model.model_time, self._quantity(model))
+        rate = np.nan
+        if self._previous is not None and time > self._previous[0]:
+            rate = (self._previous[1] - value) / (time - self._previous[0])
+        self._previous = (time, value)
+        return rate
+
+
+class _OutletSedimentFlux(object):
+    """Sediment leaving the core nodes per unit time."""
+
+    def __init__(self):
+        self._volume_loss_rate = _LoweringRate(_core_volume)
+
+    def __call__(self, model):
+        grid = model.grid
+        if "sediment__outflux" not in grid.at_node:
+            return self._volume_loss_rate(model)
+        core = grid.core_nodes
+        receivers = grid.at_node["flow__receiver_node"][core]
+        leaving = core[grid.status_at_node[receivers] != grid.BC_NODE_IS_CORE]
+        return np.sum(grid.at_node["sediment__outflux"][leaving])
+
+
+_REDUCTIONS = {
+    "mean_elevation": _mean_elevation,
+    "relief": _relief,
+    "hypsometric_integral": _hypsometric_integral,
+    "slope_area": _slope_area,
+    "fraction_above_contact": _fraction_above_contact,
+}
+
+
+def _make_reductions(reductions, hypsometry_levels):
+    """Return a dictionary of new reduction callables, by name."""
+    if isinstance(reductions, str):
+        reductions = [reductions]
+    if not isinstance(reductions, dict):
+        reductions = {name: name for name in reductions}
+
+    made = {}
+    for (name, reduction) in reductions.items():
+        if callable(reduction):
+            made[name] = reduction
+        elif reduction == "mean_erosion_rate":
+            made[name] = _LoweringRate(_mean_elevation)
+        elif reduction == "outlet_sediment_flux":
+            made[name] = _OutletSedimentFlux()
+        elif reduction == "hypsometry":
+            made[name] = functools.partial(
+                _hypsometry, levels=hypsometry_levels
+            )
+        elif reduction in _REDUCTIONS:
+            made[name] = _REDUCTIONS[reduction]
+        else:
+            raise ValueError(f"Unknown reduction {reduction!r}.")
+    return made
+
+
+def _evaluate(reductions, model):
+    """Return the column names and values of the reductions of a model."""
+    columns = []
+    values = []
+    for (name, reduction) in reductions.items():
+        value = reduction(model)
+        if isinstance(value, dict):
+            columns += [f"{name}_{key}" for key in value]
+            values += [float(v) for v in value.values()]
+        elif np.ndim(value) > 0:
+            columns += [f"{name}_{i}" for i in range(np.size(value))]
+            values += [float(v) for v in np.ravel(value)]
+        else:
+            columns.append(name)
+            values.append(float(value))
+    return (columns, values)
+
+
+class _ColumnarFile(object):
+    """A csv file with a time column, to which rows are appended."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.columns = None
+
+    def append(self, time, columns, values):
+        if self.columns is None:
+            self.columns = list(columns)
+            with open(self.filepath, "w", newline="") as fp:
+                csv.writer(fp).writerow(["time"] + self.columns)
+        elif list(columns) != self.columns:
+            raise ValueError(
+                "The columns of the reductions changed during the run."
+            )
+        with open(self.filepath, "a", newline="") as fp:
+            row = [float(time)] + [float(value) for value in values]
+            csv.writer(fp).writerow([repr(value) for value in row])
+
+    def to_xarray_dataset(self):
+        if self.columns is None:
+            raise ValueError(f"No rows have been written to {self.filepath}.")
+        with open(self.filepath, newline="") as fp:
+            rows = list(csv.reader(fp))
+        table = np.array(rows[1:], dtype=float).reshape((-1, len(rows[0])))
+        return xr.Dataset(
+            {
+                column: ("time", table[:, i + 1])
+                for (i, column) in enumerate(self.columns)
+            },
+            coords={"time": table[:, 0]},
+        )
+
+
+def _filename(writer):
+    """Name of the csv file of a writer, without a time stamp."""
+    if writer.model.output_prefix:
+        return "_".join([writer.model.output_prefix, writer.name]) + ".csv"
+    return writer.name + ".csv"
+
+
+class OWReductions(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        reductions=_DEFAULT_REDUCTIONS,
+        name="reductions",
+        hypsometry_levels=11,
+        **static_interval_kwargs,
+    ):
+        """An output writer that appends reductions of the grid to a csv file.
+
+        At each output time the writer computes the reductions and appends a
+        row with the model time and their values to one csv file, named after
+        the model prefix and the writer name.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        reductions : str or list of str or dict, optional
+            Names of built-in reductions, or a dictionary of built-in names or
+            callables by column name. Defaults to "mean_elevation", "relief"
+            and "mean_erosion_rate". See
+            :py:mod:`terrainbento.output_writers.ow_reductions`.
+
+        name : string, optional
+            The name of the output writer used when generating the output
+            filename. Defaults to "reductions".
+
+        hypsometry_levels : int, optional
+            Number of evenly spaced fractions, from 0 to 1, at which the
+            "hypsometry" reduction gives an elevation. Defaults to 11.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWReductions: object
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWReductions
+        >>> grid = RasterModelGrid((4, 5))
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> z[grid.core_nodes] = [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=2.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "stats": {
+        ...             "class": OWReductions,
+        ...             "kwargs": {
+        ...                 "intervals": 1.0,
+        ...                 "reductions": ["relief", "hypsometric_integral"],
+        ...             },
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> ds = model.to_xarray_dataset(writer="stats")
+        >>> ds["time"].values
+        array([ 0.,  1.,  2.])
+        >>> float(ds["relief"][0])
+        6.0
+        >>> float(ds["hypsometric_integral"][0])
+        0.5
+        >>> model.remove_output()
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+        self._reductions = _make_reductions(reductions, hypsometry_levels)
+        self._file = _ColumnarFile(self.make_filepath(_filename(self)))
+
+    @property
+    def filepath(self):
+        """Path of the csv file."""
+        return self._file.filepath
+
+    def run_one_step(self):
+        """ Append the reductions of the grid to the csv file. """
+        (columns, values) = _evaluate(self._reductions, self.model)
+        self._file.append(self.model.model_time, columns, values)
+        self.register_output_filepath(self.filepath)
+
+    def to_xarray_dataset(self):
+        """Read the csv file into an xarray dataset with a time dimension."""
+        return self._file.to_xarray_dataset()
+
+
+class OWRunningReductions(GenericOutputWriter):
+    def __init__(
+        self,
+        model,
+        reductions=_DEFAULT_REDUCTIONS,
+        name="running-reductions",
+        interval=None,
+        hypsometry_levels=11,
+        **generic_kwargs,
+    ):
+        """An output writer that samples reductions of the grid every step.
+
+        The writer computes the reductions after every model step and keeps
+        the running mean, minimum and maximum of each column. Every
+        ``interval`` of model time, and at the end of the run, it appends a
+        row with the model time and those statistics of the samples since
+        the previous row to one csv file, then starts again. The columns are
+        named after the reductions with the endings "_mean", "_min" and
+        "_max". If the first time step is saved, the first row holds the
+        reductions at time zero.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        reductions : str or list of str or dict, optional
+            Names of built-in reductions, or a dictionary of built-in names or
+            callables by column name. Defaults to "mean_elevation", "relief"
+            and "mean_erosion_rate". See
+            :py:mod:`terrainbento.output_writers.ow_reductions`.
+
+        name : string, optional
+            The name of the output writer used when generating the output
+            filename. Defaults to "running-reductions".
+
+        interval : float, optional
+            Model time between rows. Defaults to the output interval of the
+            model.
+
+        hypsometry_levels : int, optional
+            Number of evenly spaced fractions, from 0 to 1, at which the
+            "hypsometry" reduction gives an elevation. Defaults to 11.
+
+        generic_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            GenericOutputWriter, except for ``times_iter``, as the writer runs
+            at every step of the model clock. Please see
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWRunningReductions: object
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWRunningReductions
+        >>> grid = RasterModelGrid((4, 5))
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=10.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "stats": {
+        ...             "class": OWRunningReductions,
+        ...             "kwargs": {"interval": 5.0, "reductions": "relief"},
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> ds = model.to_xarray_dataset(writer="stats")
+        >>> ds["time"].values
+        array([  0.,   5.,  10.])
+        >>> list(ds.data_vars)
+        ['relief_mean', 'relief_min', 'relief_max']
+        >>> model.remove_output()
+        """
+        if "times_iter" in generic_kwargs:
+            raise ValueError(
+                "OWRunningReductions runs at every step and takes no "
+                "times_iter."
+            )
+        super().__init__(model, name=name, **generic_kwargs)
+
+        if interval is None:
+            interval = model.output_interval
+        if interval <= 0.0:
+            raise ValueError("OWRunningReductions: interval must be positive.")
+        self._interval = float(interval)
+        self._next_row_time = 0.0 if self._save_first_timestep else interval
+
+        self._reductions = _make_reductions(reductions, hypsometry_levels)
+        self._file = _ColumnarFile(self.make_filepath(_filename(self)))
+        self._columns = None
+        self._samples = 0
+        self._count = self._sum = self._min = self._max = None
+
+        self.register_times_iter(self._step_times())
+
+    def _step_times(self):
+        """Yield the model time after each step, as the model adds it up."""
+        (time, step) = (0.0, self.model.clock.step)
+        while True:
+            time += step
+            yield time
+
+    @property
+    def filepath(self):
+        """Path of the csv file."""
+        return self._file.filepath
+
+    def run_one_step(self):
+        """ Sample the reductions and append a row at the end of an interval.
+        """
+        (columns, values) = _evaluate(self._reductions, self.model)
+        values = np.array(values)
+        if self._samples == 0:
+            self._columns = columns
+            self._count = np.zeros_like(values)
+            self._sum = np.zeros_like(values)
+            self._min = np.full_like(values, np.inf)
+            self._max = np.full_like(values, -np.inf)
+        self._samples += 1
+
+        # samples that are not a number, such as the first erosion rate, are
+        # left out of the statistics.
+        finite = np.isfinite(values)
+        self._count += finite
+        self._sum += np.where(finite, values, 0.0)
+        np.fmin(self._min, values, out=self._min)
+        np.fmax(self._max, values, out=self._max)
+
+        time = self.model.model_time
+        tolerance = 1e-9 * self.model.clock.step
+        if (
+            time >= self._next_row_time - tolerance
+            or time >= self.model.clock.stop - tolerance
+        ):
+            self._write_row(time)
+            while self._next_row_time <= time + tolerance:
+                self._next_row_time += self._interval
+
+    def _write_row(self, time):
+        columns = []
+        for suffix in ("mean", "min", "max"):
+            columns += [f"{column}_{suffix}" for column in self._columns]
+        with np.errstate(invalid="ignore"):
+            values = np.concatenate(
+                [self._sum / self._count, self._min, self._max]
+            )
+        values[~np.isfinite(values)] = np.nan
+        self._file.append(time, columns, values)
+        self.register_output_filepath(self.filepath)
+        self._samples = 0
+
+    def to_xarray_dataset(self):
+        """Read the csv file into an xarray dataset with a time dimension."""
+        return self._file.to_xarray_dataset()
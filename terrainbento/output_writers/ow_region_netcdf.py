@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+
+import numpy as np
+import xarray as xr
+from landlab import RasterModelGrid
+
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+
+def _upstream_nodes(upstream_order, receivers, outlet):
+    """Return the nodes that drain to ``outlet``, the outlet included.
+
+    The upstream node order is built depth first, so the nodes upstream of a
+    node follow it in the order and end before the first node that drains
+    elsewhere.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.output_writers.ow_region_netcdf import (
+    ...     _upstream_nodes)
+    >>> receivers = np.array([0, 0, 1, 3, 3, 1])
+    >>> order = np.array([0, 1, 2, 5, 3, 4])
+    >>> _upstream_nodes(order, receivers, 1)
+    array([1, 2, 5])
+    >>> _upstream_nodes(order, receivers, 3)
+    array([3, 4])
+    """
+    upstream_order = np.asarray(upstream_order)
+    receivers = np.asarray(receivers)
+    position = np.empty_like(upstream_order)
+    position[upstream_order] = np.arange(upstream_order.size)
+
+    start = position[outlet]
+    after = upstream_order[start + 1 :]
+    leaves = (position[receivers[after]] < start) | (receivers[after] == after)
+    if leaves.any():
+        stop = start + 1 + np.argmax(leaves)
+    else:
+        stop = upstream_order.size
+    return np.sort(upstream_order[start:stop])
+
+
+class OWRegionNetCDF(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        output_fields="topographic__elevation",
+        name="region-netCDF",
+        nodes=None,
+        bounding_box=None,
+        watershed_outlet=None,
+        stride=1,
+        **static_interval_kwargs,
+    ):
+        """An output writer for some fields at a region of the grid.
+
+        The region is given by at most one of ``nodes``, ``bounding_box`` and
+        ``watershed_outlet``, and thinned by ``stride``. Its nodes are found
+        at the first output time and do not change afterwards.
+
+        The ids and coordinates of the nodes of the region are written once,
+        to a netCDF file named after the model prefix and the writer name
+        with the ending "_nodes.nc". Each output time then writes a small
+        netCDF file with only the output fields at those nodes, on a "node"
+        dimension that indexes the region.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        output_fields : str or list of str, optional
+            At-node fields to write. Defaults to "topographic__elevation".
+
+        name : string, optional
+            The name of the output writer used when generating output
+            filenames. Defaults to "region-netCDF".
+
+        nodes : array of int or array of bool, optional
+            Ids of the nodes to write, or an at-node mask that is True where
+            nodes are written.
+
+        bounding_box : tuple of float, optional
+            Write the nodes with ``x_min <= x <= x_max`` and
+            ``y_min <= y <= y_max``, given as
+            ``(x_min, x_max, y_min, y_max)``.
+
+        watershed_outlet : int, optional
+            Write the nodes that drain to this node, found from the
+            "flow__upstream_node_order" and "flow__receiver_node" fields. If
+            flow has not been routed yet, the model's flow accumulator is run
+            once to route it.
+
+        stride : int, optional
+            Write every ``stride``-th row and column of a raster grid, or
+            every ``stride``-th node of other grids. Defaults to 1, which
+            writes every node of the region.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWRegionNetCDF: object
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWRegionNetCDF
+        >>> grid = RasterModelGrid((5, 6), xy_spacing=10.0)
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=4.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "region": {
+        ...             "class": OWRegionNetCDF,
+        ...             "kwargs": {
+        ...                 "intervals": 2.0,
+        ...                 "bounding_box": (10.0, 30.0, 10.0, 20.0),
+        ...             },
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> writer = model.get_output_writer("region")[0]
+        >>> writer.region_nodes
+        array([ 7,  8,  9, 13, 14, 15])
+        >>> ds = writer.to_xarray_dataset()
+        >>> ds["time"].values
+        array([ 0.,  2.,  4.])
+        >>> ds["topographic__elevation"].dims
+        ('time', 'node')
+        >>> model.remove_output()
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+
+        selections = [nodes, bounding_box, watershed_outlet]
+        if sum(selection is not None for selection in selections) > 1:
+            raise ValueError(
+                "OWRegionNetCDF: give at most one of nodes, bounding_box and "
+                "watershed_outlet."
+            )
+        if int(stride) < 1:
+            raise ValueError("OWRegionNetCDF: stride must be at least one.")
+
+        if isinstance(output_fields, str):
+            output_fields = [output_fields]
+        self.output_fields = list(output_fields)
+        self.output_times = []
+
+        self._nodes = nodes
+        self._bounding_box = bounding_box
+        self._watershed_outlet = watershed_outlet
+        self._stride = int(stride)
+        self._region_nodes = None
+        self._nodes_filepath = None
+
+    @property
+    def region_nodes(self):
+        """Ids of the nodes written, or None before the first output."""
+        return self._region_nodes
+
+    @property
+    def nodes_filepath(self):
+        """Path of the file with the ids and coordinates of the region."""
+        return self._nodes_filepath
+
+    def _find_region(self):
+        """Return the sorted ids of the nodes of the region."""
+        grid = self.model.grid
+        if self._nodes is not None:
+            nodes = np.asarray(self._nodes)
+            if nodes.dtype == bool:
+                if nodes.size != grid.number_of_nodes:
+                    raise ValueError(
+                        "OWRegionNetCDF: a node mask must have one value per "
+                        "node."
+                    )
+                nodes = np.flatnonzero(nodes)
+            region = np.unique(nodes.astype(int))
+        elif self._bounding_box is not None:
+            (x_min, x_max, y_min, y_max) = self._bounding_box
+            region = np.flatnonzero(
+                (grid.x_of_node >= x_min)
+                & (grid.x_of_node <= x_max)
+                & (grid.y_of_node >= y_min)
+                & (grid.y_of_node <= y_max)
+            )
+        elif self._watershed_outlet is not None:
+            upstream_order = grid.at_node["flow__upstream_node_order"]
+            if np.any(upstream_order < 0):
+                self.model.flow_accumulator.run_one_step()
+            region = _upstream_nodes(
+                grid.at_node["flow__upstream_node_order"],
+                grid.at_node["flow__receiver_node"],
+                self._watershed_outlet,
+            )
+        else:
+            region = np.arange(grid.number_of_nodes)
+
+        if self._stride > 1:
+            if isinstance(grid, RasterModelGrid):
+                rows = np.arange(0, grid.shape[0], self._stride)
+                columns = np.arange(0, grid.shape[1], self._stride)
+                strided = (rows[:, None] * grid.shape[1] + columns).ravel()
+            else:
+                strided = np.arange(0, grid.number_of_nodes, self._stride)
+            region = np.intersect1d(region, strided)
+
+        if region.size == 0:
+            raise ValueError("OWRegionNetCDF: the region has no nodes.")
+        return region
+
+    def _write_region(self):
+        """Find the region and write its node ids and coordinates."""
+        self._region_nodes = self._find_region()
+        grid = self.model.grid
+        ds = xr.Dataset(
+            {
+                "node_id": ("node", self._region_nodes),
+                "x": ("node", grid.x_of_node[self._region_nodes]),
+                "y": ("node", grid.y_of_node[self._region_nodes]),
+            }
+        )
+        if self.model.output_prefix:
+            prefix = "_".join([self.model.output_prefix, self.name])
+        else:
+            prefix = self.name
+        self._nodes_filepath = self.make_filepath(f"{prefix}_nodes.nc")
+        ds.to_netcdf(self._nodes_filepath, format="NETCDF4")
+        self.register_output_filepath(self._nodes_filepath)
+
+    def run_one_step(self):
+        """ Write the output fields at the region to a netCDF file. """
+        if self._region_nodes is None:
+            self._write_region()
+
+        at_node = self.model.grid.at_node
+        time = self.model.model_time
+        nodes = self._region_nodes
+        ds = xr.Dataset(
+            {
+                field: (("time", "node"), at_node[field][None, nodes])
+                for field in self.output_fields
+            },
+            coords={"time": [time]},
+        )
+        filepath = self.make_filepath(f"{self.filename_prefix}.nc")
+        ds.to_netcdf(filepath, format="NETCDF4")
+        self.register_output_filepath(filepath)
+        self.output_times.append(time)
+
+    def to_xarray_dataset(self):
+        """Read the output into an xarray dataset.
+
+        The fields have dimensions of time and node, with the ids and
+        coordinates of the nodes as coordinates on the node dimension.
+        """
+        if self._region_nodes is None:
+            raise ValueError(
+                f"Output writer {self.name} has not written any output."
+            )
+        with xr.open_dataset(self._nodes_filepath) as ds:
+            region = ds.load()
+        snapshots = []
+        for filepath in self.get_output_filepaths("nc"):
+            if filepath != self._nodes_filepath:
+                with xr.open_dataset(filepath) as ds:
+                    snapshots.append(ds.load())
+        ds = xr.concat(snapshots, dim="time")
+        return ds.assign_coords(
+            node_id=region["node_id"], x=region["x"], y=region["y"]
+        )
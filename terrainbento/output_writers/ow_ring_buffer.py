@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+
+import weakref
+
+import numpy as np
+import xarray as xr
+from landlab import RasterModelGrid
+
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+
+def _release(shm, owner):
+    """Close a shared memory block, and unlink it if it is owned."""
+    try:
+        shm.close()
+    except BufferError:  # pragma: no cover
+        # arrays still look at the block; it is closed when they are freed.
+        pass
+    if owner:
+        shm.unlink()
+
+
+class RingBuffer(object):
+    """The last few snapshots of some at-node fields, kept in memory.
+
+    A **RingBuffer** holds ``slots`` snapshots. Once it is full, each new
+    snapshot replaces the oldest one. The buffer is allocated once, either
+    as NumPy arrays or in a block of shared memory, so that a parent process
+    can read the snapshots written by a model run in another process.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.output_writers import RingBuffer
+    >>> buffer = RingBuffer(["z"], number_of_nodes=3, slots=2)
+    >>> for time in (0.0, 1.0, 2.0):
+    ...     buffer.append(time, {"z": np.full(3, time)})
+    >>> buffer.times
+    array([ 1.,  2.])
+    >>> buffer.snapshots("z")
+    array([[ 1.,  1.,  1.],
+           [ 2.,  2.,  2.]])
+
+    The same buffer in shared memory can be opened from its descriptor, for
+    example in a parent process.
+
+    >>> shared = RingBuffer(["z"], 3, 2, shared_memory=True)
+    >>> shared.append(5.0, {"z": np.arange(3.0)})
+    >>> view = RingBuffer.from_descriptor(shared.descriptor())
+    >>> view.snapshots("z")
+    array([[ 0.,  1.,  2.]])
+    >>> view.close()
+    >>> shared.close()
+    """
+
+    def __init__(self, fields, number_of_nodes, slots, shared_memory=None):
+        """
+        Parameters
+        ----------
+        fields : list of str
+            Names of the fields.
+        number_of_nodes : int
+        slots : int
+            Number of snapshots held.
+        shared_memory : bool or str, optional
+            If True, allocate the buffer in a new block of shared memory. If
+            the name of a block, use that block, which must have been made by
+            a **RingBuffer** with the same fields, number of nodes and slots.
+            Default is None, which allocates NumPy arrays.
+        """
+        self.fields = list(fields)
+        self.number_of_nodes = int(number_of_nodes)
+        self.slots = int(slots)
+        if self.slots < 1:
+            raise ValueError("RingBuffer: slots must be at least one.")
+
+        # one block: the snapshot count, the times, then each field.
+        size = 1 + self.slots * (1 + len(self.fields) * self.number_of_nodes)
+        self._shm = None
+        if shared_memory is None or shared_memory is False:
+            block = np.zeros(size)
+        else:
+            from multiprocessing import shared_memory as shm_module
+
+            owner = shared_memory is True
+            if owner:
+                self._shm = shm_module.SharedMemory(create=True, size=8 * size)
+            else:
+                self._shm = shm_module.SharedMemory(name=shared_memory)
+            block = np.ndarray(size, dtype=float, buffer=self._shm.buf)
+            if owner:
+                block[:] = 0.0
+            self._finalizer = weakref.finalize(
+                self, _release, self._shm, owner
+            )
+
+        self._count = block[0:1]
+        self._times = block[1 : 1 + self.slots]
+        start = 1 + self.slots
+        self._data = {}
+        for field in self.fields:
+            stop = start + self.slots * self.number_of_nodes
+            self._data[field] = block[start:stop].reshape(
+                (self.slots, self.number_of_nodes)
+            )
+            start = stop
+
+    @classmethod
+    def from_descriptor(cls, descriptor):
+        """Open a shared **RingBuffer** from its **descriptor**."""
+        return cls(**descriptor)
+
+    def descriptor(self):
+        """Return a picklable description of a shared buffer.
+
+        Returns
+        -------
+        dict
+            Keyword arguments of **RingBuffer** that open the same block.
+        """
+        if self._shm is None:
+            raise ValueError("RingBuffer: the buffer is not in shared memory.")
+        return {
+            "fields": self.fields,
+            "number_of_nodes": self.number_of_nodes,
+            "slots": self.slots,
+            "shared_memory": self._shm.name,
+        }
+
+    def __len__(self):
+        return int(min(self._count[0], self.slots))
+
+    def append(self, time, arrays):
+        """Copy a snapshot into the buffer.
+
+        Parameters
+        ----------
+        time : float
+        arrays : dict
+            Array of each field, by name.
+        """
+        slot = int(self._count[0]) % self.slots
+        self._times[slot] = time
+        for field in self.fields:
+            self._data[field][slot] = arrays[field]
+        self._count[0] += 1
+
+    def _order(self):
+        """Slots of the snapshots held, from the oldest to the newest."""
+        count = int(self._count[0])
+        if count <= self.slots:
+            return np.arange(count)
+        return np.arange(count, count + self.slots) % self.slots
+
+    @property
+    def times(self):
+        """Times of the snapshots held, from the oldest to the newest."""
+        return self._times[self._order()]
+
+    def snapshots(self, field):
+        """Return a copy of the snapshots of a field, oldest first."""
+        return self._data[field][self._order()]
+
+    def to_xarray_dataset(self, shape=None, x_of_node=None, y_of_node=None):
+        """Return a copy of the snapshots held as an xarray dataset.
+
+        Parameters
+        ----------
+        shape : tuple of int, optional
+            Shape of a raster grid. If given, the fields have dimensions of
+            time, y and x, otherwise of time and node.
+        x_of_node, y_of_node : array of float, optional
+            Coordinates of the nodes.
+
+        Returns
+        -------
+        xarray.Dataset
+        """
+        coords = {"time": self.times}
+        if shape is not None:
+            dims = ("time", "y", "x")
+            if x_of_node is not None:
+                coords["x"] = np.reshape(x_of_node, shape)[0, :]
+                coords["y"] = np.reshape(y_of_node, shape)[:, 0]
+        else:
+            dims = ("time", "node")
+            coords["node"] = np.arange(self.number_of_nodes)
+            if x_of_node is not None:
+                coords["x"] = ("node", np.asarray(x_of_node))
+                coords["y"] = ("node", np.asarray(y_of_node))
+        data_vars = {}
+        for field in self.fields:
+            values = self.snapshots(field)
+            if shape is not None:
+                values = values.reshape((-1,) + tuple(shape))
+            data_vars[field] = (dims, values)
+        return xr.Dataset(data_vars, coords=coords)
+
+    def close(self):
+        """Release the shared memory, if any.
+
+        The block is unlinked if this buffer made it.
+        """
+        if self._shm is not None:
+            self._count = self._times = None
+            self._data = {}
+            self._finalizer()
+
+
+class OWRingBuffer(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        output_fields="topographic__elevation",
+        name="ring-buffer",
+        slots=10,
+        shared_memory=False,
+        buffer_descriptor=None,
+        **static_interval_kwargs,
+    ):
+        """An output writer that keeps the last snapshots in memory.
+
+        At each output time the writer copies the output fields into a
+        preallocated **RingBuffer** of ``slots`` snapshots, replacing the
+        oldest once the buffer is full. Nothing is written to disk; use
+        **to_xarray_dataset** (of the writer or of the model) to read the
+        snapshots.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        output_fields : str or list of str, optional
+            At-node fields to keep. Defaults to "topographic__elevation".
+
+        name : string, optional
+            The name of the output writer. Defaults to "ring-buffer".
+
+        slots : int, optional
+            Number of snapshots kept. Defaults to 10.
+
+        shared_memory : bool, optional
+            Allocate the buffer in a new block of shared memory, which other
+            processes can open with the **descriptor** of **buffer**.
+            Defaults to False.
+
+        buffer_descriptor : dict, optional
+            Descriptor of a shared **RingBuffer** made by another process,
+            for example the parent of an ensemble, to write into instead of
+            allocating a buffer. Its fields and number of nodes must match
+            the model. Defaults to None.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWRingBuffer: object
+
+        Examples
+        --------
+        >>> from landlab import RasterModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWRingBuffer
+        >>> grid = RasterModelGrid((4, 5))
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=10.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "ring": {
+        ...             "class": OWRingBuffer,
+        ...             "kwargs": {"intervals": 1.0, "slots": 3},
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> ds = model.to_xarray_dataset(writer="ring")
+        >>> ds["time"].values
+        array([  8.,   9.,  10.])
+        >>> ds["topographic__elevation"].shape
+        (3, 4, 5)
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+
+        if isinstance(output_fields, str):
+            output_fields = [output_fields]
+        self.output_fields = list(output_fields)
+
+        grid = self.model.grid
+        if buffer_descriptor is not None:
+            self.buffer = RingBuffer.from_descriptor(buffer_descriptor)
+            if (
+                self.buffer.fields != self.output_fields
+                or self.buffer.number_of_nodes != grid.number_of_nodes
+            ):
+                raise ValueError(
+                    "OWRingBuffer: the shared buffer does not match the "
+                    "output fields and the grid."
+                )
+        else:
+            self.buffer = RingBuffer(
+                self.output_fields,
+                grid.number_of_nodes,
+                slots,
+                shared_memory=True if shared_memory else None,
+            )
+
+    def run_one_step(self):
+        """ Copy the output fields into the ring buffer. """
+        at_node = self.model.grid.at_node
+        self.buffer.append(
+            self.model.model_time,
+            {field: at_node[field] for field in self.output_fields},
+        )
+
+    def to_xarray_dataset(self):
+        """Return the snapshots held as an xarray dataset.
+
+        Raster grids have dimensions of time, y and x; other grids of time
+        and node.
+        """
+        grid = self.model.grid
+        shape = grid.shape if isinstance(grid, RasterModelGrid) else None
+        return self.buffer.to_xarray_dataset(
+            shape=shape, x_of_node=grid.x_of_node, y_of_node=grid.y_of_node
+        )
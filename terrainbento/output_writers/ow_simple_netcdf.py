@@ -2,6 +2,8 @@
 
 import os.path
 
+import numpy as np
+import xarray as xr
 from landlab import RasterModelGrid
 from landlab.io.netcdf import to_netcdf, write_raster_netcdf
 
@@ -16,6 +18,7 @@ class OWSimpleNetCDF(StaticIntervalOutputWriter):
         model,
         output_fields,
         name="simple-netCDF",
+        keep_in_memory=False,
         **static_interval_kwargs,
     ):
 
@@ -23,6 +26,11 @@ class OWSimpleNetCDF(StaticIntervalOutputWriter):
         intervals. Mimics the built-in netCDF writing code in older versions of
         terrainbento.
 
+        Grids that are not rasters are written whole, with every field and
+        the geometry of the grid, at each output time. Use
+        :py:class:`OWUnstructuredNetCDF` to write only some fields of such
+        grids.
+
         Parameters
         ----------
         model : a terrainbento ErosionModel instance
@@ -34,6 +42,11 @@ class OWSimpleNetCDF(StaticIntervalOutputWriter):
             The name of the output writer used when generating output
             filenames. Defaults to 'simple-netCDF'
 
+        keep_in_memory : bool, optional
+            Indicates whether a copy of the output fields should also be kept
+            in memory at each output time, so that **to_xarray_dataset** does
+            not read the files back. Defaults to False.
+
         static_interval_kwargs : keyword args, optional
             Keyword arguments that will be passed directly to
             StaticIntervalOutputWriter. These include:
@@ -60,6 +73,9 @@ class OWSimpleNetCDF(StaticIntervalOutputWriter):
         super().__init__(model, name=name, **static_interval_kwargs)
 
         self.output_fields = output_fields
+        self.keep_in_memory = keep_in_memory
+        self.output_times = []
+        self._in_memory = {}
 
     def run_one_step(self):
         """ Write output to file as a netCDF.  """
@@ -76,3 +92,44 @@ class OWSimpleNetCDF(StaticIntervalOutputWriter):
             to_netcdf(grid, filepath, format="NETCDF4")
 
         self.register_output_filepath(filepath)
+        self.output_times.append(self.model.model_time)
+        if self.keep_in_memory:
+            for name in self._field_names():
+                self._in_memory.setdefault(name, []).append(
+                    grid.at_node[name].copy()
+                )
+
+    def _field_names(self):
+        if isinstance(self.output_fields, str):
+            return [self.output_fields]
+        return list(self.output_fields)
+
+    def to_xarray_dataset(self):
+        """Return the output kept in memory as an xarray dataset.
+
+        The time coordinate holds the model times the output was written at.
+        Raster grids have dimensions of time, y and x; other grids of time
+        and node. Only available if the writer keeps its output in memory.
+        """
+        if not self.keep_in_memory:
+            raise ValueError(
+                f"Output writer {self.name} does not keep its output in "
+                "memory."
+            )
+        grid = self.model.grid
+        coords = {"time": np.asarray(self.output_times, dtype=float)}
+        if isinstance(grid, RasterModelGrid):
+            shape = (len(self.output_times),) + tuple(grid.shape)
+            dims = ("time", "y", "x")
+            coords["x"] = grid.x_of_node.reshape(grid.shape)[0, :]
+            coords["y"] = grid.y_of_node.reshape(grid.shape)[:, 0]
+        else:
+            shape = (len(self.output_times), grid.number_of_nodes)
+            dims = ("time", "node")
+            coords["x"] = ("node", grid.x_of_node)
+            coords["y"] = ("node", grid.y_of_node)
+        data_vars = {}
+        for name in self._field_names():
+            values = self._in_memory.get(name, [])
+            data_vars[name] = (dims, np.reshape(values, shape))
+        return xr.Dataset(data_vars, coords=coords)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+import netCDF4
+import xarray as xr
+
+from terrainbento.output_writers.static_interval_writer import (
+    StaticIntervalOutputWriter,
+)
+
+
+class OWUnstructuredNetCDF(StaticIntervalOutputWriter):
+    def __init__(
+        self,
+        model,
+        output_fields="topographic__elevation",
+        name="unstructured-netCDF",
+        append=False,
+        chunk_size=2 ** 20,
+        **static_interval_kwargs,
+    ):
+        """An output writer for fields of grids that are not rasters.
+
+        The geometry of the grid does not change during a run, so it is
+        written only once, at the first output time, to a netCDF file named
+        after the model prefix and the writer name with the ending
+        "_grid.nc". It holds the coordinates and status of the nodes, the
+        nodes at each link and, if the grid has patches, the nodes at each
+        patch.
+
+        Each output time then writes only the output fields, as one array
+        over the "node" dimension per field. By default each output time
+        writes its own small netCDF file. With ``append`` all output times
+        are instead appended to a single netCDF4 file along an unlimited
+        "time" dimension. Each chunk of that file holds one output time of
+        at most ``chunk_size`` nodes, so that the file grows by the size of
+        the fields at each output time.
+
+        The writer works with any grid, rasters included, but is meant for
+        grids such as a HexModelGrid for which **OWSimpleNetCDF** writes
+        the whole grid at every output time.
+
+        Parameters
+        ----------
+        model : a terrainbento ErosionModel instance
+
+        output_fields : str or list of str, optional
+            At-node fields to write. Defaults to "topographic__elevation".
+
+        name : string, optional
+            The name of the output writer used when generating output
+            filenames. Defaults to "unstructured-netCDF".
+
+        append : bool, optional
+            Append all output times to one file instead of writing one file
+            per output time. Defaults to False.
+
+        chunk_size : int, optional
+            Largest number of nodes in each chunk of the file written with
+            ``append``. Defaults to 2**20.
+
+        static_interval_kwargs : keyword args, optional
+            Keyword arguments that will be passed directly to
+            StaticIntervalOutputWriter. Please see
+            :py:class:`StaticIntervalOutputWriter` and
+            :py:class:`GenericOutputWriter` for more detail.
+
+        Returns
+        -------
+        OWUnstructuredNetCDF: object
+
+        Examples
+        --------
+        >>> from landlab import HexModelGrid
+        >>> from terrainbento import Basic, Clock
+        >>> from terrainbento.output_writers import OWUnstructuredNetCDF
+        >>> grid = HexModelGrid((3, 3))
+        >>> z = grid.add_zeros("node", "topographic__elevation")
+        >>> model = Basic(
+        ...     Clock(step=1.0, stop=4.0),
+        ...     grid,
+        ...     output_writers={
+        ...         "hex": {
+        ...             "class": OWUnstructuredNetCDF,
+        ...             "kwargs": {"intervals": 2.0, "append": True},
+        ...         }
+        ...     },
+        ...     output_default_netcdf=False,
+        ... )
+        >>> model.run()
+        >>> writer = model.get_output_writer("hex")[0]
+        >>> len(writer.get_output_filepaths("nc"))
+        2
+        >>> ds = writer.to_xarray_dataset()
+        >>> ds["time"].values
+        array([ 0.,  2.,  4.])
+        >>> ds["topographic__elevation"].dims
+        ('time', 'node')
+        >>> model.remove_output()
+        """
+
+        super().__init__(model, name=name, **static_interval_kwargs)
+
+        if int(chunk_size) < 1:
+            raise ValueError(
+                "OWUnstructuredNetCDF: chunk_size must be at least one."
+            )
+        if isinstance(output_fields, str):
+            output_fields = [output_fields]
+        self.output_fields = list(output_fields)
+        self.append = bool(append)
+        self.chunk_size = int(chunk_size)
+        self.output_times = []
+
+        self._geometry_filepath = None
+        self._append_filepath = None
+
+    @property
+    def geometry_filepath(self):
+        """Path of the file with the geometry of the grid, or None."""
+        return self._geometry_filepath
+
+    def _prefix(self):
+        if self.model.output_prefix:
+            return "_".join([self.model.output_prefix, self.name])
+        return self.name
+
+    def _write_geometry(self):
+        """Write the coordinates and connectivity of the grid."""
+        grid = self.model.grid
+        data_vars = {
+            "x_of_node": ("node", grid.x_of_node),
+            "y_of_node": ("node", grid.y_of_node),
+            "status_at_node": ("node", grid.status_at_node),
+            "nodes_at_link": (("link", "nodes_per_link"), grid.nodes_at_link),
+        }
+        try:
+            nodes_at_patch = grid.nodes_at_patch
+        except AttributeError:
+            nodes_at_patch = None
+        if nodes_at_patch is not None:
+            data_vars["nodes_at_patch"] = (
+                ("patch", "nodes_per_patch"),
+                nodes_at_patch,
+            )
+        self._geometry_filepath = self.make_filepath(
+            f"{self._prefix()}_grid.nc"
+        )
+        xr.Dataset(data_vars).to_netcdf(
+            self._geometry_filepath, format="NETCDF4"
+        )
+        self.register_output_filepath(self._geometry_filepath)
+
+    def _create_append_file(self):
+        """Create the file that output times are appended to."""
+        grid = self.model.grid
+        self._append_filepath = self.make_filepath(f"{self._prefix()}.nc")
+        with netCDF4.Dataset(
+            self._append_filepath, "w", format="NETCDF4"
+        ) as nc:
+            nc.createDimension("time", None)
+            nc.createDimension("node", grid.number_of_nodes)
+            nc.createVariable("time", "f8", ("time",))
+            for field in self.output_fields:
+                nc.createVariable(
+                    field,
+                    grid.at_node[field].dtype,
+                    ("time", "node"),
+                    chunksizes=(
+                        1,
+                        min(self.chunk_size, grid.number_of_nodes),
+                    ),
+                )
+        self.register_output_filepath(self._append_filepath)
+
+    def run_one_step(self):
+        """ Write the output fields to a netCDF file. """
+        if self._geometry_filepath is None:
+            self._write_geometry()
+
+        at_node = self.model.grid.at_node
+        time = self.model.model_time
+        if self.append:
+            if self._append_filepath is None:
+                self._create_append_file()
+            with netCDF4.Dataset(self._append_filepath, "a") as nc:
+                index = nc.dimensions["time"].size
+                nc["time"][index] = time
+                for field in self.output_fields:
+                    nc[field][index, :] = at_node[field]
+            # register again so the bytes appended are counted as output.
+            self.register_output_filepath(self._append_filepath)
+        else:
+            ds = xr.Dataset(
+                {
+                    field: ("node", at_node[field])
+                    for field in self.output_fields
+                },
+                coords={"time": time},
+            )
+            filepath = self.make_filepath(f"{self.filename_prefix}.nc")
+            ds.to_netcdf(filepath, format="NETCDF4")
+            self.register_output_filepath(filepath)
+        self.output_times.append(time)
+
+    def to_xarray_dataset(self):
+        """Read the output into an xarray dataset.
+
+        The fields have dimensions of time and node, with the coordinates of
+        the nodes as x and y on the node dimension.
+        """
+        if self._geometry_filepath is None:
+            raise ValueError(
+                f"Output writer {self.name} has not written any output."
+            )
+        with xr.open_dataset(self._geometry_filepath) as ds:
+            geometry = ds.load()
+        if self.append:
+            with xr.open_dataset(self._append_filepath) as ds:
+                ds = ds.load()
+        else:
+            snapshots = []
+            for filepath in self.get_output_filepaths("nc"):
+                if filepath != self._geometry_filepath:
+                    with xr.open_dataset(filepath) as ds:
+                        snapshots.append(ds.load())
+            ds = xr.concat(snapshots, dim="time")
+        return ds.assign_coords(
+            x=geometry["x_of_node"], y=geometry["y_of_node"]
+        )
@@ -37,9 +37,30 @@ class RandomPrecipitator(object):
            [ 0.81,  0.3 ,  0.1 ,  0.68,  0.44],
            [ 0.12,  0.5 ,  0.03,  0.91,  0.26],
            [ 0.66,  0.31,  0.52,  0.55,  0.18]])
+
+    Rather than the global ``np.random`` state, a **RandomPrecipitator** can
+    draw from its own ``numpy.random.Generator``. When it is used by a model
+    constructed with ``random_streams``, the model attaches the
+    ``"precipitator"`` stream with **set_random_generator**.
+
+    >>> from terrainbento.utilities import RandomStreams
+    >>> streams = RandomStreams(42)
+    >>> a = RandomPrecipitator(
+    ...     RasterModelGrid((5, 5)),
+    ...     random_generator=streams.generator("precipitator"))
+    >>> streams.reset()
+    >>> b = RandomPrecipitator(
+    ...     RasterModelGrid((5, 5)),
+    ...     random_generator=streams.generator("precipitator"))
+    >>> np.array_equal(
+    ...     a._grid.at_node["rainfall__flux"],
+    ...     b._grid.at_node["rainfall__flux"])
+    True
     """
 
-    def __init__(self, grid, distribution="uniform", **kwargs):
+    def __init__(
+        self, grid, distribution="uniform", random_generator=None, **kwargs
+    ):
         """
         Parameters
         ----------
@@ -47,6 +68,9 @@ class RandomPrecipitator(object):
         distribution : str, optional
             Name of the distribution provided by the np.random
             submodule. Default is "uniform".
+        random_generator : numpy.random.Generator, optional
+            Generator to draw from. Default is None, which uses the global
+            ``np.random`` state.
         kwargs : dict
             Keyword arguments to pass to the ``np.random`` distribution
             function.
@@ -54,8 +78,25 @@ class RandomPrecipitator(object):
         self._grid = grid
         if "rainfall__flux" not in grid.at_node:
             grid.add_ones("node", "rainfall__flux")
-        self.function = np.random.__dict__[distribution]
+        self._distribution = distribution
         self._kwargs = kwargs
+        if random_generator is None:
+            self.function = np.random.__dict__[distribution]
+            self.run_one_step(0.0)
+        else:
+            self.set_random_generator(random_generator)
+
+    def set_random_generator(self, random_generator):
+        """Draw all further values from ``random_generator``.
+
+        The ``rainfall__flux`` field is redrawn from the new generator so that
+        the initial field is reproducible as well.
+
+        Parameters
+        ----------
+        random_generator : numpy.random.Generator
+        """
+        self.function = getattr(random_generator, self._distribution)
         self.run_one_step(0.0)
 
     def run_one_step(self, step):
@@ -1,3 +1,19 @@
 from terrainbento.utilities.file_compare import filecmp
+from terrainbento.utilities.random_streams import RandomStreams
+from terrainbento.utilities.storm_sequence import (
+    StormSequence,
+    StormSequenceCursor,
+)
+from terrainbento.utilities.time_series import (
+    TimeSeriesInterpolator,
+    load_time_series,
+)
 
-__all__ = ["filecmp"]
+__all__ = [
+    "filecmp",
+    "RandomStreams",
+    "StormSequence",
+    "StormSequenceCursor",
+    "TimeSeriesInterpolator",
+    "load_time_series",
+]
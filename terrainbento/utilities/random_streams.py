@@ -0,0 +1,192 @@
+# coding: utf8
+# !/usr/env/python
+"""**RandomStreams** provides reproducible, independent random number streams.
+
+A terrainbento model that uses random numbers (e.g. a stochastic storm
+generator, a **RandomPrecipitator**, or a stochastic boundary handler) can
+draw each of these from its own child stream of a single root
+`numpy.random.SeedSequence <https://numpy.org/doc/stable/reference/random/bit_generators/generated/numpy.random.SeedSequence.html>`_.
+Child streams are identified by name rather than by the order in which they
+are requested, so adding a new consumer does not change the numbers drawn by
+the existing ones.
+
+Ensembles spawn the streams of member ``i`` from the same root with
+**spawn_member**. The streams of a member depend only on the root seed and
+the member index, so member ``i`` is bit-identical whether it is run serially
+or on any worker of a parallel pool.
+"""
+
+import zlib
+
+import numpy as np
+
+# Prefixes appended to the spawn key so that named streams and ensemble
+# members can never collide with each other.
+_STREAM_KEY = 0
+_MEMBER_KEY = 1
+
+
+def _name_to_key(name):
+    """Convert a stream name into a stable unsigned 32 bit integer.
+
+    Python's built-in ``hash`` is salted per process, so a CRC-32 checksum is
+    used instead to ensure that all processes agree on the key.
+
+    Examples
+    --------
+    >>> from terrainbento.utilities.random_streams import _name_to_key
+    >>> _name_to_key("storm_generator") == _name_to_key("storm_generator")
+    True
+    >>> _name_to_key("storm_generator") == _name_to_key("precipitator")
+    False
+    """
+    return zlib.crc32(name.encode("utf8")) & 0xFFFFFFFF
+
+
+class RandomStreams(object):
+    """Independent random number streams spawned from one root seed.
+
+    **RandomStreams** owns a root ``numpy.random.SeedSequence`` and hands out
+    ``numpy.random.Generator`` instances for named consumers. Asking twice for
+    the same name returns the same generator, so its state advances as the
+    consumer draws from it.
+
+    Examples
+    --------
+    >>> from terrainbento.utilities import RandomStreams
+    >>> streams = RandomStreams(42)
+    >>> storms = streams.generator("storm_generator")
+    >>> storms is streams.generator("storm_generator")
+    True
+
+    Streams with different names are independent.
+
+    >>> precip = streams.generator("precipitator")
+    >>> storms.random() == precip.random()
+    False
+
+    An ensemble spawns the streams of each member by index. The member streams
+    do not depend on which other members have been spawned, or in which
+    order.
+
+    >>> a = RandomStreams(42).spawn_member(17).generator("storm_generator")
+    >>> b = RandomStreams(42, member=17).generator("storm_generator")
+    >>> a.random() == b.random()
+    True
+
+    Calling **reset** restarts every stream from its beginning.
+
+    >>> streams.reset()
+    >>> first = streams.generator("storm_generator").random()
+    >>> streams.generator("storm_generator").random() == first
+    False
+    >>> streams.reset()
+    >>> streams.generator("storm_generator").random() == first
+    True
+    """
+
+    def __init__(self, seed=0, member=None):
+        """
+        Parameters
+        ----------
+        seed : int, sequence of int, or numpy.random.SeedSequence, optional
+            Entropy of the root seed sequence. Default is 0.
+        member : int, optional
+            Ensemble member index. If provided, all streams are spawned from
+            the child sequence of ``seed`` belonging to this member.
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            root = seed
+        else:
+            root = np.random.SeedSequence(seed)
+
+        if member is not None:
+            if int(member) < 0:
+                raise ValueError(
+                    "RandomStreams: the ensemble member index must be >= 0."
+                )
+            root = np.random.SeedSequence(
+                root.entropy,
+                spawn_key=tuple(root.spawn_key) + (_MEMBER_KEY, int(member)),
+            )
+
+        self._root = root
+        self._member = member
+        self._generators = {}
+
+    @property
+    def seed_sequence(self):
+        """The root ``numpy.random.SeedSequence``."""
+        return self._root
+
+    @property
+    def member(self):
+        """Ensemble member index, or None if these are not member streams."""
+        return self._member
+
+    def spawn_member(self, member):
+        """Return the **RandomStreams** of ensemble member ``member``.
+
+        Parameters
+        ----------
+        member : int
+            Ensemble member index.
+
+        Returns
+        -------
+        RandomStreams
+        """
+        return RandomStreams(self._root, member=member)
+
+    def seed_sequence_for(self, name):
+        """Return the child ``numpy.random.SeedSequence`` for stream ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stream, e.g. ``"storm_generator"``.
+
+        Returns
+        -------
+        numpy.random.SeedSequence
+        """
+        return np.random.SeedSequence(
+            self._root.entropy,
+            spawn_key=tuple(self._root.spawn_key)
+            + (_STREAM_KEY, _name_to_key(name)),
+        )
+
+    def generator(self, name):
+        """Return the ``numpy.random.Generator`` for stream ``name``.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stream, e.g. ``"storm_generator"``.
+
+        Returns
+        -------
+        numpy.random.Generator
+        """
+        if name not in self._generators:
+            self._generators[name] = np.random.Generator(
+                np.random.PCG64(self.seed_sequence_for(name))
+            )
+        return self._generators[name]
+
+    def reset(self, name=None):
+        """Restart streams from their beginning.
+
+        Generators handed out before the reset keep their state; ask for the
+        stream again with **generator** to get the restarted one.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the stream to restart. Default is None, which restarts
+            all streams.
+        """
+        if name is None:
+            self._generators = {}
+        else:
+            self._generators.pop(name, None)
@@ -0,0 +1,353 @@
+# coding: utf8
+# !/usr/env/python
+"""**StormSequence** stores a storm/interstorm sequence for replay.
+
+A **StormSequence** is a realization of the stochastic-duration climate used
+by :py:class:`~terrainbento.base_class.stochastic_erosion_model.StochasticErosionModel`
+when ``opt_stochastic_duration=True``. It is generated once, can be saved to a
+compact binary ``.npy`` file or placed in shared memory, and can then be
+replayed by any number of models so that they all experience exactly the same
+climate.
+
+The sequence is held as a single ``(number_of_events, 2)`` float64 array whose
+columns are event duration and rainfall intensity; interstorm periods have an
+intensity of zero. Loading from file uses a memory map and attaching to shared
+memory wraps the existing buffer, so replay never copies the sequence.
+"""
+
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Bytes used at the start of a shared memory block to store the event count.
+_HEADER_BYTES = 8
+
+
+class StormSequence(object):
+    """A replayable sequence of storm and interstorm events.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from terrainbento.utilities import StormSequence
+
+    Generate 1000 time units of storms and interstorms.
+
+    >>> sequence = StormSequence.generate(
+    ...     1000.0,
+    ...     mean_storm_duration=2.0,
+    ...     mean_interstorm_duration=3.0,
+    ...     mean_storm_depth=1.0,
+    ...     random_generator=42,
+    ... )
+    >>> bool(np.isclose(sequence.durations.sum(), 1000.0))
+    True
+    >>> bool(np.all(sequence.intensities[1::2] == 0.0))
+    True
+
+    Each model replays the sequence with its own cursor. A cursor remembers
+    its position, so calls may use any step and runtime.
+
+    >>> cursor = sequence.cursor()
+    >>> first = list(cursor.advance(1.0, 10.0))
+    >>> second = list(cursor.advance(7.0, 990.0))
+    >>> bool(np.isclose(sum(d for (d, i) in first + second), 1000.0))
+    True
+    >>> bool(np.isclose(cursor.time, 1000.0))
+    True
+    """
+
+    def __init__(self, events, shared_memory_block=None):
+        """
+        Parameters
+        ----------
+        events : array of float, shape (number_of_events, 2)
+            Duration (first column) and rainfall intensity (second column) of
+            each event. The array is used without copying.
+        shared_memory_block : multiprocessing.shared_memory.SharedMemory, optional
+            Shared memory block that holds ``events``. It is kept open for as
+            long as the **StormSequence** is alive.
+        """
+        events = np.asarray(events, dtype=float)
+        if events.ndim != 2 or events.shape[1] != 2:
+            raise ValueError(
+                "StormSequence: events must have shape (number_of_events, 2)."
+            )
+        if np.any(events[:, 0] < 0.0) or np.any(events[:, 1] < 0.0):
+            raise ValueError(
+                "StormSequence: event durations and intensities must be "
+                "non-negative."
+            )
+        self._events = events
+        self._shm = shared_memory_block
+
+    @classmethod
+    def generate(
+        cls,
+        total_time,
+        mean_storm_duration=1.0,
+        mean_interstorm_duration=1.0,
+        mean_storm_depth=1.0,
+        random_generator=None,
+    ):
+        """Generate a storm sequence that lasts ``total_time``.
+
+        Storm and interstorm durations are drawn from exponential
+        distributions and storm depths from a gamma distribution, as in the
+        Landlab PrecipitationDistribution component. All events are drawn in
+        blocks rather than one at a time. The sequence starts with a storm and
+        the final event is clipped so that the sequence ends at
+        ``total_time``.
+
+        Parameters
+        ----------
+        total_time : float
+            Duration of the sequence.
+        mean_storm_duration : float, optional
+            Mean storm duration. Default is 1.
+        mean_interstorm_duration : float, optional
+            Mean interstorm duration. Default is 1.
+        mean_storm_depth : float, optional
+            Mean storm depth. Default is 1.
+        random_generator : numpy.random.Generator or int, optional
+            Generator, or seed for a new generator, to draw from. Default is
+            None, which uses fresh entropy.
+
+        Returns
+        -------
+        StormSequence
+        """
+        if total_time <= 0.0:
+            raise ValueError("StormSequence: total_time must be positive.")
+        if not isinstance(random_generator, np.random.Generator):
+            random_generator = np.random.default_rng(random_generator)
+
+        mean_pair = mean_storm_duration + mean_interstorm_duration
+        block = int(np.ceil(1.2 * total_time / mean_pair)) + 16
+
+        storms = []
+        interstorms = []
+        elapsed = 0.0
+        while elapsed < total_time:
+            storm_duration = random_generator.exponential(
+                mean_storm_duration, size=block
+            )
+            interstorm_duration = random_generator.exponential(
+                mean_interstorm_duration, size=block
+            )
+            storms.append(storm_duration)
+            interstorms.append(interstorm_duration)
+            elapsed += storm_duration.sum() + interstorm_duration.sum()
+        storm_duration = np.concatenate(storms)
+        interstorm_duration = np.concatenate(interstorms)
+
+        storm_depth = random_generator.gamma(
+            storm_duration / mean_storm_duration, mean_storm_depth
+        )
+
+        events = np.zeros((2 * storm_duration.size, 2))
+        events[0::2, 0] = storm_duration
+        events[1::2, 0] = interstorm_duration
+        np.divide(
+            storm_depth,
+            storm_duration,
+            out=events[0::2, 1],
+            where=storm_duration > 0.0,
+        )
+
+        end_time = np.cumsum(events[:, 0])
+        n_events = int(np.searchsorted(end_time, total_time)) + 1
+        events = events[:n_events].copy()
+        events[-1, 0] -= end_time[n_events - 1] - total_time
+        return cls(events)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a **StormSequence** saved with **save**.
+
+        Parameters
+        ----------
+        path : str
+            Path to the ``.npy`` file.
+        mmap : bool, optional
+            If True (default) the file is memory mapped read only instead of
+            being read into memory.
+
+        Returns
+        -------
+        StormSequence
+        """
+        return cls(np.load(path, mmap_mode="r" if mmap else None))
+
+    def save(self, path):
+        """Save the sequence to a ``.npy`` file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to write.
+        """
+        np.save(path, np.ascontiguousarray(self._events))
+
+    def to_shared_memory(self, name=None):
+        """Copy the sequence into a new shared memory block.
+
+        Other processes can then use **from_shared_memory** with the block
+        name to replay the sequence without copying it. The caller owns the
+        block and must ``unlink`` it once all processes are done with it.
+
+        Parameters
+        ----------
+        name : str, optional
+            Name of the shared memory block. Default is None, which lets the
+            operating system choose a unique name.
+
+        Returns
+        -------
+        multiprocessing.shared_memory.SharedMemory
+        """
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=_HEADER_BYTES + self._events.nbytes
+        )
+        np.ndarray((1,), dtype=np.int64, buffer=shm.buf)[0] = self.size
+        np.ndarray(
+            self._events.shape,
+            dtype=float,
+            buffer=shm.buf,
+            offset=_HEADER_BYTES,
+        )[:] = self._events
+        return shm
+
+    @classmethod
+    def from_shared_memory(cls, name):
+        """Attach to a sequence placed in shared memory by another process.
+
+        Parameters
+        ----------
+        name : str
+            Name of the shared memory block.
+
+        Returns
+        -------
+        StormSequence
+        """
+        shm = shared_memory.SharedMemory(name=name)
+        size = int(np.ndarray((1,), dtype=np.int64, buffer=shm.buf)[0])
+        events = np.ndarray(
+            (size, 2), dtype=float, buffer=shm.buf, offset=_HEADER_BYTES
+        )
+        return cls(events, shared_memory_block=shm)
+
+    def close(self):
+        """Release the shared memory block, if any, held by this sequence."""
+        if self._shm is not None:
+            self._events = self._events.copy()
+            self._shm.close()
+            self._shm = None
+
+    @property
+    def size(self):
+        """Number of events in the sequence."""
+        return self._events.shape[0]
+
+    @property
+    def events(self):
+        """The ``(number_of_events, 2)`` array of durations and intensities."""
+        return self._events
+
+    @property
+    def durations(self):
+        """Event durations (a view, not a copy)."""
+        return self._events[:, 0]
+
+    @property
+    def intensities(self):
+        """Event rainfall intensities (a view, not a copy)."""
+        return self._events[:, 1]
+
+    @property
+    def total_time(self):
+        """Total duration of the sequence."""
+        return float(self._events[:, 0].sum())
+
+    def cursor(self):
+        """Return a new replay cursor positioned at the start of the sequence.
+
+        Returns
+        -------
+        StormSequenceCursor
+        """
+        return StormSequenceCursor(self)
+
+
+class StormSequenceCursor(object):
+    """Replay position within a **StormSequence**.
+
+    A cursor yields ``(duration, intensity)`` pairs in the same form as
+    the ``yield_storm_interstorm_duration_intensity`` method of the Landlab
+    PrecipitationDistribution component: storms are split into pieces no
+    longer than ``step`` and interstorm periods are yielded whole. Unlike
+    that method, an event that straddles the end of ``runtime`` is not
+    discarded; its remainder is replayed by the next call to **advance**.
+    """
+
+    def __init__(self, sequence):
+        """
+        Parameters
+        ----------
+        sequence : StormSequence
+        """
+        self._sequence = sequence
+        self.rewind()
+
+    def rewind(self):
+        """Return to the start of the sequence."""
+        self._index = -1
+        self._remaining = 0.0
+        self._time = 0.0
+
+    @property
+    def time(self):
+        """Time replayed so far."""
+        return self._time
+
+    @property
+    def index(self):
+        """Index of the current event, or -1 before the first event."""
+        return self._index
+
+    def advance(self, step, runtime):
+        """Yield the events of the next ``runtime`` of the sequence.
+
+        Parameters
+        ----------
+        step : float
+            Maximum duration of a yielded storm piece.
+        runtime : float
+            Duration to replay.
+
+        Yields
+        ------
+        (duration, intensity) : tuple of float
+        """
+        events = self._sequence.events
+        elapsed = 0.0
+        while elapsed < runtime:
+            if self._remaining <= 0.0:
+                self._index += 1
+                if self._index >= events.shape[0]:
+                    raise ValueError(
+                        "StormSequence: the storm sequence ended at time "
+                        "{time} and is too short for this model "
+                        "run.".format(time=self._time)
+                    )
+                self._remaining = float(events[self._index, 0])
+                continue
+            intensity = float(events[self._index, 1])
+            duration = min(self._remaining, runtime - elapsed)
+            if intensity > 0.0:
+                duration = min(duration, step)
+            self._remaining -= duration
+            self._time += duration
+            elapsed += duration
+            yield (duration, intensity)
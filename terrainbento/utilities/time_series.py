@@ -0,0 +1,206 @@
+# coding: utf8
+# !/usr/env/python
+"""Fast linear interpolation of time series as model time advances.
+
+Boundary handlers and model programs look up a value from a history (for
+example the elevation of an outlet or an erodibility) once per step, with a
+model time that only moves forward. A **TimeSeriesInterpolator** keeps a
+cursor into the history so that each lookup is an amortized constant time
+operation instead of a search, and it works on memory mapped arrays so that
+histories with millions of rows are not read into memory.
+"""
+
+import os
+
+import numpy as np
+
+# Number of rows the cursor steps through one at a time before it falls back
+# to a binary search of the rest of the history.
+_LINEAR_STEPS = 8
+
+
+def load_time_series(path, mmap=True):
+    """Load a two column time series from a file.
+
+    Files ending in ``.npy`` are read with ``np.load`` and are memory mapped
+    read only if ``mmap`` is True. Any other file is read with
+    ``np.loadtxt(path, skiprows=1, delimiter=",")``, that is as comma
+    separated text with one header line.
+
+    Parameters
+    ----------
+    path : str
+        Path to the file.
+    mmap : bool, optional
+        Memory map ``.npy`` files. Default is True.
+
+    Returns
+    -------
+    array of float, shape (number_of_rows, 2)
+        Columns of time and value.
+
+    Examples
+    --------
+    >>> import os
+    >>> import tempfile
+    >>> import numpy as np
+    >>> from terrainbento.utilities import load_time_series
+    >>> path = os.path.join(tempfile.mkdtemp(), "history.npy")
+    >>> np.save(path, np.array([[0.0, 0.0], [10.0, -1.0]]))
+    >>> load_time_series(path)
+    memmap([[  0.,   0.],
+            [ 10.,  -1.]])
+    """
+    if not os.path.exists(path):
+        raise ValueError(
+            "The time series file {path} does not exist.".format(path=path)
+        )
+    if path.endswith(".npy"):
+        series = np.load(path, mmap_mode="r" if mmap else None)
+    else:
+        series = np.loadtxt(path, skiprows=1, delimiter=",", ndmin=2)
+    if series.ndim != 2 or series.shape[1] < 2:
+        raise ValueError(
+            "The time series file {path} must have a column of time and a "
+            "column of values.".format(path=path)
+        )
+    return series
+
+
+class TimeSeriesInterpolator(object):
+    """Linearly interpolate a time series with a forward-moving cursor.
+
+    Like ``scipy.interpolate.interp1d`` with its default arguments, a
+    **TimeSeriesInterpolator** raises a ValueError when asked for a time
+    outside of the series. Times may be asked for in any order, but lookups
+    are fastest when each time is at or after the previous one.
+
+    Examples
+    --------
+    >>> from terrainbento.utilities import TimeSeriesInterpolator
+    >>> f = TimeSeriesInterpolator([0.0, 10.0, 30.0], [0.0, -1.0, -5.0])
+    >>> f(5.0)
+    -0.5
+    >>> f(20.0)
+    -3.0
+    >>> f(30.0)
+    -5.0
+    >>> f(40.0)
+    Traceback (most recent call last):
+    ...
+    ValueError: TimeSeriesInterpolator: time 40.0 is outside of the range 0.0 to 30.0.
+
+    A scale and an offset are applied to the two values around the time
+    asked for, so a stored history can be rescaled without copying it.
+
+    >>> g = TimeSeriesInterpolator(
+    ...     [0.0, 10.0, 30.0], [0.0, -1.0, -5.0], scale=2.0, offset=100.0
+    ... )
+    >>> g(5.0)
+    99.0
+    """
+
+    def __init__(self, time, values, scale=1.0, offset=0.0):
+        """
+        Parameters
+        ----------
+        time : array of float
+            Times of the series, in non-decreasing order. The array is used
+            without copying, so it may be memory mapped.
+        values : array of float
+            Values of the series at ``time``. Like ``time``, the array is
+            used without copying.
+        scale : float, optional
+            Factor the values are multiplied by. Default is 1.
+        offset : float, optional
+            Number added to the scaled values. Default is 0.
+        """
+        self.time = np.asanyarray(time, dtype=float)
+        self.values = np.asanyarray(values, dtype=float)
+        if (
+            self.time.ndim != 1
+            or self.time.shape != self.values.shape
+            or self.time.size < 2
+        ):
+            raise ValueError(
+                "TimeSeriesInterpolator: time and values must be one "
+                "dimensional, of the same length, and have at least two "
+                "entries."
+            )
+        if np.any(np.diff(self.time) < 0.0):
+            raise ValueError(
+                "TimeSeriesInterpolator: time must be in non-decreasing "
+                "order."
+            )
+        self.scale = float(scale)
+        self.offset = float(offset)
+        self._start = float(self.time[0])
+        self._end = float(self.time[-1])
+        self._last = self.time.size - 2
+        self._index = 0
+
+    @classmethod
+    def from_file(cls, path, mmap=True):
+        """Create a **TimeSeriesInterpolator** from a file.
+
+        The file is read with **load_time_series**; its first column is time
+        and its second column is the value.
+
+        Parameters
+        ----------
+        path : str
+            Path to the file.
+        mmap : bool, optional
+            Memory map ``.npy`` files. Default is True.
+
+        Returns
+        -------
+        TimeSeriesInterpolator
+        """
+        series = load_time_series(path, mmap=mmap)
+        return cls(series[:, 0], series[:, 1])
+
+    def __call__(self, time):
+        """Return the value of the series at ``time``.
+
+        Parameters
+        ----------
+        time : float
+
+        Returns
+        -------
+        float
+        """
+        if time < self._start or time > self._end:
+            raise ValueError(
+                "TimeSeriesInterpolator: time {time} is outside of the "
+                "range {start} to {end}.".format(
+                    time=time, start=self._start, end=self._end
+                )
+            )
+
+        # find the row k with time[k] <= time < time[k + 1], starting from
+        # the row found by the previous lookup.
+        index = self._index
+        if time < self.time[index]:
+            index = int(np.searchsorted(self.time, time, "right")) - 1
+        else:
+            for _ in range(_LINEAR_STEPS):
+                if index == self._last or time < self.time[index + 1]:
+                    break
+                index += 1
+            else:
+                index += (
+                    int(np.searchsorted(self.time[index:], time, "right")) - 1
+                )
+        index = min(index, self._last)
+        self._index = index
+
+        x_lo = self.time[index]
+        x_hi = self.time[index + 1]
+        y_lo = self.scale * self.values[index] + self.offset
+        y_hi = self.scale * self.values[index + 1] + self.offset
+        if x_hi == x_lo:
+            return float(y_hi)
+        slope = (y_hi - y_lo) / (x_hi - x_lo)
+        return float(slope * (time - x_lo) + y_lo)
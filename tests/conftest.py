@@ -1,7 +1,78 @@
+import numpy as np
 import pytest
 from landlab import RasterModelGrid
 
-from terrainbento import Clock
+from terrainbento import Basic, Clock, NotCoreNodeBaselevelHandler
+from terrainbento.output_writers import StaticIntervalOutputWriter
+
+
+class _Recorder(StaticIntervalOutputWriter):
+    """Keep the output times and a copy of the topography at each."""
+
+    def __init__(self, model, **kwargs):
+        super().__init__(model, **kwargs)
+        self.times = []
+        self.snapshots = []
+
+    def run_one_step(self):
+        z = self.model.grid.at_node["topographic__elevation"]
+        self.times.append(self.model.model_time)
+        self.snapshots.append(z.copy())
+
+
+@pytest.fixture()
+def make_model(tmpdir):
+    """Return a function that makes a model that writes output to tmpdir.
+
+    The topography of the grid is a plane of slope ``gradient`` plus
+    uniform noise of amplitude ``relief``, over ``soil_depth`` of soil. The
+    not-core nodes are lowered with ``lowering``, the keyword arguments of
+    a **NotCoreNodeBaselevelHandler**. With ``record``, a writer named
+    "truth" keeps the topography at the output times, or at intervals of
+    ``record`` if it is a number.
+    """
+
+    def make_model(
+        grid,
+        output_writers=None,
+        step=1.0,
+        stop=4.0,
+        relief=1.0,
+        gradient=(0.0, 0.0),
+        soil_depth=0.0,
+        lowering=None,
+        record=None,
+        model_class=Basic,
+        **kwargs
+    ):
+        z = grid.add_zeros("node", "topographic__elevation")
+        z += gradient[0] * grid.x_of_node + gradient[1] * grid.y_of_node
+        z += np.random.default_rng(0).uniform(0.0, relief, size=z.size)
+        grid.add_field("node", "soil__depth", np.full(z.size, soil_depth))
+
+        output_writers = dict(output_writers or {})
+        if record is not None:
+            output_writers["truth"] = {
+                "class": _Recorder,
+                "kwargs": {} if record is True else {"intervals": record},
+            }
+        if lowering is not None:
+            kwargs["boundary_handlers"] = {
+                "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+                    grid, **lowering
+                )
+            }
+        kwargs.setdefault("water_erodibility", 0.001)
+        kwargs.setdefault("output_default_netcdf", False)
+        kwargs.setdefault("output_dir", str(tmpdir))
+        return model_class(
+            Clock(step=step, stop=stop),
+            grid,
+            output_writers=output_writers,
+            **kwargs
+        )
+
+    return make_model
 
 
 @pytest.fixture()
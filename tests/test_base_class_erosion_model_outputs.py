@@ -181,3 +181,57 @@ def test_write_synthesis_netcdf_one_field_first_timestep_false(
         ds.close()
 
         model.remove_output_netcdfs()
+
+
+def test_write_synthesis_in_memory(tmpdir, basic_raster_inputs_for_nc_yaml):
+    truth = os.path.join(_TEST_DATA_DIR, "truth.nc")
+    with tmpdir.as_cwd():
+        basic_raster_inputs_for_nc_yaml += "".join(
+            [
+                "\n",
+                "    output_prefix: tb_synth_output_in_memory\n",
+                f"    output_dir: {tmpdir}\n",
+                "    output_in_memory: True\n",
+            ]
+        )
+        with open("params.yaml", "w") as fp:
+            fp.write(basic_raster_inputs_for_nc_yaml)
+        model = Basic.from_file("./params.yaml")
+        model.run()
+
+        # the netcdf files are not read back.
+        model.remove_output_netcdfs()
+        ds = model.to_xarray_dataset(time_unit="years", space_unit="meter")
+        truth = xr.open_dataset(truth, decode_times=False)
+
+        assert truth.dims == ds.dims
+        xr.testing.assert_identical(truth, ds[list(truth.data_vars)])
+        truth.close()
+
+
+def test_to_xarray_dataset_output_times(tmpdir, basic_raster_inputs_yaml):
+    # the last output is at the stop time, not a multiple of the interval.
+    datasets = []
+    for in_memory in (False, True):
+        with tmpdir.as_cwd():
+            inputs = basic_raster_inputs_yaml.replace(
+                "output_interval: 50", "output_interval: 30"
+            )
+            inputs += "".join(
+                [
+                    "\n",
+                    f"    output_prefix: tb_times_{in_memory}\n",
+                    f"    output_dir: {tmpdir}\n",
+                    f"    output_in_memory: {in_memory}\n",
+                ]
+            )
+            with open("params.yaml", "w") as fp:
+                fp.write(inputs)
+            model = Basic.from_file("./params.yaml")
+            model.run()
+            ds = model.to_xarray_dataset()
+            times = [0, 30, 60, 90, 120, 150, 180, 200]
+            assert list(ds["time"].values) == times
+            datasets.append(ds.load())
+            model.remove_output_netcdfs()
+    xr.testing.assert_allclose(datasets[0], datasets[1])
@@ -474,3 +474,204 @@ def test_runoff_equals_zero(clock_07, grid_1):
     model.run_one_step(1.0)
     runoff = model.calc_runoff_and_discharge()
     assert runoff == 0
+
+
+@pytest.mark.parametrize("step,runtime", [(10.0, 1000.0), (0.7, 35.3)])
+def test_generate_storm_events_matches_landlab(clock_04, grid_0, step, runtime):
+    from landlab.components import PrecipitationDistribution
+
+    params = {
+        "grid": grid_0,
+        "clock": clock_04,
+        "opt_stochastic_duration": True,
+        "mean_storm_duration": 2.0,
+        "mean_interstorm_duration": 3.0,
+        "mean_storm_depth": 1.0,
+        "random_seed": 1234,
+    }
+    model = BasicSt(**params)
+    events = model.generate_storm_events(step, runtime)
+
+    generator = PrecipitationDistribution(
+        mean_storm_duration=2.0,
+        mean_interstorm_duration=3.0,
+        mean_storm_depth=1.0,
+        total_t=clock_04.stop,
+        delta_t=step,
+        random_seed=1234,
+    )
+    generator._run_time = runtime
+    expected = np.array(
+        list(generator.yield_storm_interstorm_duration_intensity())
+    )
+    np.testing.assert_array_almost_equal(events, expected, decimal=10)
+    assert events[events[:, 1] > 0, 0].max() <= step + 1e-12
+
+
+def test_run_storm_events(clock_04, grid_0):
+    params = {
+        "grid": grid_0,
+        "clock": clock_04,
+        "opt_stochastic_duration": True,
+        "record_rain": True,
+        "random_seed": 1234,
+    }
+    model = BasicSt(**params)
+    events = model.generate_storm_events(10.0, 200.0)
+    model.run_storm_events(events)
+    np.testing.assert_almost_equal(model.model_time, 200.0)
+    np.testing.assert_array_equal(
+        model.rain_record["event_duration"], events[:, 0]
+    )
+    assert model.storm_events is events
+
+
+def test_stream_storm_events_independent_of_split(clock_04):
+    from landlab import RasterModelGrid
+
+    from terrainbento.utilities import RandomStreams
+
+    def _model():
+        grid = RasterModelGrid((3, 3))
+        grid.add_zeros("node", "topographic__elevation")
+        return BasicSt(
+            grid=grid,
+            clock=clock_04,
+            opt_stochastic_duration=True,
+            random_streams=RandomStreams(8),
+        )
+
+    def _merge(events):
+        # join pieces of the same storm or interstorm.
+        start = np.flatnonzero(np.diff(events[:, 1], prepend=-1.0) != 0.0)
+        return np.column_stack(
+            (np.add.reduceat(events[:, 0], start), events[start, 1])
+        )
+
+    for step in (1.0e9, 1.0):
+        whole = _model().generate_storm_events(step, 20.0)
+        model = _model()
+        split = np.concatenate(
+            [model.generate_storm_events(step, 10.0) for _ in range(2)]
+        )
+        (whole, split) = (_merge(whole), _merge(split))
+        assert whole.shape == split.shape
+        np.testing.assert_allclose(whole[:, 0], split[:, 0], atol=1e-10)
+        np.testing.assert_array_equal(whole[:, 1], split[:, 1])
+
+    # the events are also the same when split at many places.
+    whole = _merge(_model().generate_storm_events(1.0e9, 2000.0))
+    model = _model()
+    split = _merge(
+        np.concatenate(
+            [model.generate_storm_events(1.0e9, 7.0) for _ in range(285)]
+            + [model.generate_storm_events(1.0e9, 5.0)]
+        )
+    )
+    assert whole.shape == split.shape
+    np.testing.assert_allclose(whole[:, 0], split[:, 0], atol=1e-9)
+    np.testing.assert_array_equal(whole[:, 1], split[:, 1])
+
+
+def _adaptive_params(clock, grid, **kwargs):
+    params = {
+        "grid": grid,
+        "clock": clock,
+        "opt_stochastic_duration": False,
+        "water_erodibility": 0.001,
+        "regolith_transport_parameter": 0.0,
+        "rainfall__mean_rate": 1.0,
+        "rainfall__shape_factor": 0.6,
+        "number_of_sub_time_steps": 4,
+        "adaptive_sub_time_steps": True,
+        "random_seed": 1234,
+    }
+    params.update(kwargs)
+    return params
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"opt_stochastic_duration": True},
+        {"sub_time_step_relative_error": 0.0},
+        {"min_sub_time_steps": 0},
+        {"min_sub_time_steps": 10, "max_sub_time_steps": 5},
+        {"sub_time_step_window": 1},
+        {"sub_time_step_samples": 0},
+    ],
+)
+def test_bad_adaptive_sub_time_steps(clock_simple, grid_1, kwargs):
+    with pytest.raises(ValueError):
+        BasicSt(**_adaptive_params(clock_simple, grid_1, **kwargs))
+
+
+def test_adaptive_sub_time_steps(clock_simple, grid_1):
+    grid_1.at_node["topographic__elevation"][:] = grid_1.x_of_node / 100.0
+    model = BasicSt(
+        **_adaptive_params(
+            clock_simple,
+            grid_1,
+            min_sub_time_steps=2,
+            max_sub_time_steps=50,
+            sub_time_step_relative_error=0.2,
+        )
+    )
+    for _ in range(10):
+        model.run_one_step(10.0)
+
+    counts = model.sub_time_step_counts
+    assert len(counts) == 10
+    assert counts[0] == 4
+    assert all(2 <= n <= 50 for n in counts)
+
+    n_rates = min(model._erosion_rate_count, 50)
+    variance = model._erosion_rate_variance * n_rates / (n_rates - 1)
+    expected = np.ceil(variance / (0.2 * model._erosion_rate_mean) ** 2)
+    assert model.n_sub_steps == int(np.clip(expected, 2, 50))
+
+
+def test_adaptive_follows_variance_down(clock_simple, grid_1):
+    grid_1.at_node["topographic__elevation"][:] = grid_1.x_of_node / 100.0
+    model = BasicSt(
+        **_adaptive_params(
+            clock_simple,
+            grid_1,
+            max_sub_time_steps=50,
+            sub_time_step_relative_error=0.2,
+            sub_time_step_window=20,
+        )
+    )
+    for _ in range(10):
+        model.run_one_step(10.0)
+    assert model.n_sub_steps > 10
+
+    # With a constant rain rate the sub-timestep erosion rates hardly vary.
+    model._generate_rain_rate = lambda: model.rainfall__mean_rate
+    for _ in range(30):
+        model.run_one_step(10.0)
+    assert model.sub_time_step_counts[-1] == 1
+
+
+def test_adaptive_samples_sub_time_steps(clock_simple, grid_1):
+    grid_1.at_node["topographic__elevation"][:] = grid_1.x_of_node / 100.0
+    model = BasicSt(
+        **_adaptive_params(
+            clock_simple,
+            grid_1,
+            number_of_sub_time_steps=30,
+            sub_time_step_samples=4,
+        )
+    )
+    model.run_one_step(10.0)
+    assert model.sub_time_step_counts == [30]
+    assert model._erosion_rate_count == 4
+
+
+def test_adaptive_no_erosion_uses_min(clock_simple, grid_1):
+    model = BasicSt(
+        **_adaptive_params(clock_simple, grid_1, min_sub_time_steps=3)
+    )
+    model.run_one_step(10.0)
+    model.run_one_step(10.0)
+    assert model.sub_time_step_counts == [4, 3]
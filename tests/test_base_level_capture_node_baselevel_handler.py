@@ -1,6 +1,8 @@
 # coding: utf8
 # !/usr/env/python
 
+import numpy as np
+import pytest
 from landlab import HexModelGrid, RasterModelGrid
 
 from terrainbento.boundary_handlers import CaptureNodeBaselevelHandler
@@ -37,3 +39,86 @@ def test_no_stop_time():
         bh.run_one_step(10)
 
     assert z[3] == -3.0 * 10 * 10
+
+
+def test_events_match_single_handlers():
+    nodes = [3, 7, 7, 12]
+    start = [0.0, 5.0, 12.0, 30.0]
+    stop = [20.0, 15.0, np.nan, 35.0]
+    rate = [-1.0, -0.5, -0.25, -2.0]
+    post = [-0.1, 0.0, 0.0, -0.3]
+
+    mg = RasterModelGrid((5, 5))
+    z = mg.add_zeros("node", "topographic__elevation")
+    bh = CaptureNodeBaselevelHandler(
+        mg,
+        capture_node=nodes,
+        capture_start_time=start,
+        capture_stop_time=stop,
+        capture_incision_rate=rate,
+        post_capture_incision_rate=post,
+    )
+
+    single_mg = RasterModelGrid((5, 5))
+    single_z = single_mg.add_zeros("node", "topographic__elevation")
+    singles = [
+        CaptureNodeBaselevelHandler(
+            single_mg,
+            capture_node=n,
+            capture_start_time=t0,
+            capture_stop_time=None if np.isnan(t1) else t1,
+            capture_incision_rate=r,
+            post_capture_incision_rate=p,
+        )
+        for (n, t0, t1, r, p) in zip(nodes, start, stop, rate, post)
+    ]
+
+    for _ in range(50):
+        bh.run_one_step(1.0)
+        for single in singles:
+            single.run_one_step(1.0)
+    np.testing.assert_allclose(z, single_z)
+    np.testing.assert_array_equal(
+        mg.status_at_node[nodes], mg.BC_NODE_IS_FIXED_VALUE
+    )
+
+
+def test_next_event_time():
+    mg = RasterModelGrid((5, 5))
+    mg.add_zeros("node", "topographic__elevation")
+    bh = CaptureNodeBaselevelHandler(
+        mg,
+        capture_node=[3, 7],
+        capture_start_time=[2.0, 4.5],
+        capture_stop_time=[6.0, np.nan],
+    )
+    event_times = []
+    while np.isfinite(bh.next_event_time):
+        event_times.append(bh.next_event_time)
+        bh.run_one_step(bh.next_event_time - bh.model_time)
+    assert event_times == [2.0, 4.5, 6.0]
+
+
+def test_shared_scalars():
+    mg = RasterModelGrid((5, 5))
+    z = mg.add_zeros("node", "topographic__elevation")
+    bh = CaptureNodeBaselevelHandler(
+        mg, capture_node=[3, 7, 11], capture_incision_rate=-2.0
+    )
+    bh.run_one_step(1.0)
+    np.testing.assert_array_equal(z[[3, 7, 11]], -2.0)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"capture_node": None},
+        {"capture_node": [3, 7], "capture_start_time": [0.0, 1.0, 2.0]},
+        {"capture_node": [[3, 7]]},
+    ],
+)
+def test_bad_events(kwargs):
+    mg = RasterModelGrid((5, 5))
+    mg.add_zeros("node", "topographic__elevation")
+    with pytest.raises(ValueError):
+        CaptureNodeBaselevelHandler(mg, **kwargs)
@@ -2,9 +2,12 @@
 # !/usr/env/python
 import numpy as np
 import pytest
-from landlab import HexModelGrid
+from landlab import HexModelGrid, RasterModelGrid
 
-from terrainbento.boundary_handlers import GenericFuncBaselevelHandler
+from terrainbento.boundary_handlers import (
+    BaselevelUpdatePlan,
+    GenericFuncBaselevelHandler,
+)
 
 
 def test_function_of_four_variables():
@@ -36,3 +39,162 @@ def test_function_that_returns_float():
 
     with pytest.raises(ValueError):
         GenericFuncBaselevelHandler(mg, function=lambda mg, t: 1.0)
+
+
+def _run(mg, steps=(1.0, 1.0, 2.0, 1.0, 1.0), **kwargs):
+    z = mg.add_zeros("node", "topographic__elevation")
+    b = mg.add_ones("node", "bedrock__elevation")
+    bh = GenericFuncBaselevelHandler(mg, modify_core_nodes=True, **kwargs)
+    for step in steps:
+        bh.run_one_step(step)
+    return z, b
+
+
+class _Counter(object):
+    def __init__(self, function):
+        self.calls = 0
+        self.function = function
+
+    def __call__(self, *args):
+        self.calls += 1
+        return self.function(*args)
+
+
+def test_time_invariant():
+    z, b = _run(
+        RasterModelGrid((4, 5)), function=lambda grid, t: 0.1 * grid.x_of_node
+    )
+    counter = _Counter(lambda grid, t: 0.1 * grid.x_of_node)
+    counter.__code__ = counter.function.__code__
+    z_cached, b_cached = _run(
+        RasterModelGrid((4, 5)), function=counter, time_invariant=True
+    )
+    np.testing.assert_array_equal(z, z_cached)
+    np.testing.assert_array_equal(b, b_cached)
+    assert counter.calls == 1
+
+
+def test_separable():
+    z, b = _run(
+        RasterModelGrid((4, 5)),
+        function=lambda grid, t: grid.x_of_node * np.exp(-0.1 * t),
+    )
+    z_separable, b_separable = _run(
+        RasterModelGrid((4, 5)),
+        function=lambda grid, t: grid.x_of_node,
+        time_function=lambda t: np.exp(-0.1 * t),
+    )
+    np.testing.assert_allclose(z, z_separable, rtol=1e-14)
+    np.testing.assert_allclose(b, b_separable, rtol=1e-14)
+
+
+def test_values_at_lowered_nodes_only():
+    mg = RasterModelGrid((4, 5))
+    core = mg.core_nodes
+    z, _ = _run(mg, function=lambda grid, t: grid.x_of_node[core] + t)
+    z_full, _ = _run(
+        RasterModelGrid((4, 5)), function=lambda grid, t: grid.x_of_node + t
+    )
+    np.testing.assert_array_equal(z, z_full)
+
+
+@pytest.mark.parametrize("separable", [False, True])
+def test_batches(separable):
+    if separable:
+        kwargs = {
+            "function": lambda grid, t: grid.x_of_node,
+            "time_function": lambda t: 1.0 + np.sin(t),
+        }
+    else:
+        kwargs = {
+            "function": lambda grid, t: grid.x_of_node * (1.0 + np.sin(t))
+        }
+    z, _ = _run(RasterModelGrid((4, 5)), **kwargs)
+
+    name = "time_function" if separable else "function"
+    counter = _Counter(kwargs[name])
+    counter.__code__ = kwargs[name].__code__
+    kwargs[name] = counter
+    z_batched, _ = _run(RasterModelGrid((4, 5)), batch_size=8, **kwargs)
+    np.testing.assert_allclose(z, z_batched, rtol=1e-14)
+
+    # one call when created and one per batch; each change of step starts a
+    # new batch.
+    assert counter.calls == 4
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"function": lambda grid, t: 0.1 * grid.x_of_node},
+        {"function": lambda grid, t: np.sum(t) + grid.x_of_node},
+        {
+            "function": lambda grid, t: grid.x_of_node,
+            "time_function": lambda t: 2.0,
+        },
+    ],
+)
+def test_batches_not_over_time(kwargs):
+    z, _ = _run(RasterModelGrid((4, 5)), **kwargs)
+    z_batched, _ = _run(RasterModelGrid((4, 5)), batch_size=8, **kwargs)
+    np.testing.assert_allclose(z, z_batched, rtol=1e-14)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"time_invariant": True, "time_function": lambda t: t},
+        {"time_function": lambda t: np.ones(3)},
+        {"batch_size": 0},
+        {"batch_size": 1.5},
+    ],
+)
+def test_bad_options(kwargs):
+    mg = RasterModelGrid((4, 5))
+    mg.add_zeros("node", "topographic__elevation")
+    with pytest.raises(ValueError):
+        GenericFuncBaselevelHandler(
+            mg, function=lambda grid, t: grid.x_of_node, **kwargs
+        )
+
+
+def test_cached_pattern_follows_node_status():
+    mg = RasterModelGrid((4, 5))
+    z = mg.add_zeros("node", "topographic__elevation")
+    bh = GenericFuncBaselevelHandler(
+        mg,
+        function=lambda grid, t: np.ones(grid.number_of_nodes),
+        time_invariant=True,
+    )
+    plan = BaselevelUpdatePlan(mg, {"GenericFuncBaselevelHandler": bh})
+    plan.run_one_step(1.0)
+    assert z[7] == 0.0
+    mg.status_at_node[7] = mg.BC_NODE_IS_FIXED_VALUE
+    plan.run_one_step(1.0)
+    assert z[7] == 1.0
+    np.testing.assert_array_equal(
+        bh._node_ids, np.flatnonzero(bh.nodes_to_lower)
+    )
+
+
+@pytest.mark.parametrize("modify_core_nodes", [False, True])
+def test_node_ids_match_mask(modify_core_nodes):
+    mg = HexModelGrid((7, 6))
+    z = mg.add_zeros("node", "topographic__elevation")
+    b = mg.add_zeros("node", "bedrock__elevation")
+    bh = GenericFuncBaselevelHandler(
+        mg,
+        modify_core_nodes=modify_core_nodes,
+        function=lambda grid, t: grid.x_of_node + t,
+    )
+    np.testing.assert_array_equal(
+        bh._node_ids, np.flatnonzero(bh.nodes_to_lower)
+    )
+
+    expected = np.zeros(mg.number_of_nodes)
+    for _ in range(3):
+        dzdt = bh.prefactor * (mg.x_of_node + bh.model_time)
+        expected[bh.nodes_to_lower] += dzdt[bh.nodes_to_lower] * 2.0
+        bh.run_one_step(2.0)
+    np.testing.assert_allclose(z, expected)
+    np.testing.assert_allclose(b, expected)
@@ -8,7 +8,11 @@ import pytest
 from landlab import HexModelGrid, RasterModelGrid
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 
-from terrainbento.boundary_handlers import NotCoreNodeBaselevelHandler
+from terrainbento.boundary_handlers import (
+    BaselevelUpdatePlan,
+    NotCoreNodeBaselevelHandler,
+    SingleNodeBaselevelHandler,
+)
 
 _TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 
@@ -207,3 +211,120 @@ def test_outlet_lowering_object_with_scaling():
 
     # not closed should stayed the same
     assert_array_equal(z[not_closed], np.zeros(np.sum(not_closed)))
+
+
+def _full_reduction(handler):
+    # the elevation change found from the mean over all lowered nodes.
+    mean_z = np.mean(handler.z[handler.nodes_to_lower])
+    return handler.outlet_elevation_obj(handler.model_time) - mean_z
+
+
+def test_node_ids_match_full_reduction():
+    mg = RasterModelGrid((40, 50))
+    z = mg.add_field("node", "topographic__elevation", mg.x_of_node / 10.0)
+    file = os.path.join(_TEST_DATA_DIR, "outlet_history.txt")
+    bh = NotCoreNodeBaselevelHandler(mg, lowering_file_path=file)
+    assert bh._node_ids.dtype.kind == "i"
+    for _ in range(240):
+        expected = _full_reduction(bh)
+        dz = bh._elevation_change(10.0)
+        assert dz == pytest.approx(expected, abs=1e-10)
+        z[bh._node_ids] += dz
+        bh.model_time += 10.0
+
+
+@pytest.mark.parametrize("changed", [slice(None, 1), slice(64, None)])
+def test_other_changes_of_lowered_nodes(changed):
+    mg = RasterModelGrid((40, 40))
+    z = mg.add_zeros("node", "topographic__elevation")
+    file = os.path.join(_TEST_DATA_DIR, "outlet_history.txt")
+    bh = NotCoreNodeBaselevelHandler(mg, lowering_file_path=file)
+    for _ in range(5):
+        bh.run_one_step(10.0)
+
+    # something other than the handler changes some of the lowered nodes.
+    z[bh._node_ids[changed]] += 5.0
+    target = bh.outlet_elevation_obj(bh.model_time)
+    bh.run_one_step(10.0)
+    assert np.mean(z[bh.nodes_to_lower]) == pytest.approx(target)
+
+
+def test_shared_nodes_reach_target():
+    mg = RasterModelGrid((10, 10))
+    z = mg.add_zeros("node", "topographic__elevation")
+    file = os.path.join(_TEST_DATA_DIR, "outlet_history.txt")
+    handlers = {
+        "SingleNodeBaselevelHandler": SingleNodeBaselevelHandler(
+            mg, outlet_id=0, lowering_rate=-1.0
+        ),
+        "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+            mg, lowering_file_path=file
+        ),
+    }
+    plan = BaselevelUpdatePlan(mg, handlers)
+    bh = handlers["NotCoreNodeBaselevelHandler"]
+    for _ in range(10):
+        plan.run_one_step(10.0)
+        mean_z = np.mean(z[bh.nodes_to_lower])
+        target = bh.outlet_elevation_obj(bh.model_time - 10.0)
+        assert mean_z == pytest.approx(target)
+
+
+def _tracking_plan(modify_core_nodes=False, **kwargs):
+    mg = RasterModelGrid((20, 30))
+    z = mg.add_field("node", "topographic__elevation", mg.x_of_node / 10.0)
+    file = os.path.join(_TEST_DATA_DIR, "outlet_history.txt")
+    bh = NotCoreNodeBaselevelHandler(
+        mg, modify_core_nodes=modify_core_nodes, lowering_file_path=file
+    )
+    plan = BaselevelUpdatePlan(
+        mg, {"NotCoreNodeBaselevelHandler": bh}, **kwargs
+    )
+    return (z, bh, plan)
+
+
+def test_tracked_mean_matches_full_reduction():
+    (z, bh, plan) = _tracking_plan(fixed_boundaries=True)
+    plan.run_one_step(10.0)
+    version = bh._elevation_version
+    for _ in range(100):
+        expected = _full_reduction(bh)
+        plan.run_one_step(10.0)
+        assert -bh.topo_change == pytest.approx(expected, abs=1e-10)
+    # nothing else changed the nodes, so the mean was never taken again.
+    assert bh._elevation_version == version
+
+
+def test_tracked_mean_needs_declared_changes():
+    (z, bh, plan) = _tracking_plan(fixed_boundaries=True)
+    for _ in range(5):
+        plan.run_one_step(10.0)
+
+    # a change the plan is not told about is not seen.
+    z[bh._node_ids] += 5.0
+    target = bh.outlet_elevation_obj(bh.model_time)
+    plan.run_one_step(10.0)
+    assert np.mean(z[bh.nodes_to_lower]) == pytest.approx(target + 5.0)
+
+    z[bh._node_ids[3:]] += 5.0
+    plan.mark_elevation_changed(bh._node_ids[3:])
+    target = bh.outlet_elevation_obj(bh.model_time)
+    plan.run_one_step(10.0)
+    assert np.mean(z[bh.nodes_to_lower]) == pytest.approx(target)
+
+
+@pytest.mark.parametrize(
+    "modify_core_nodes, fixed_boundaries", [(False, False), (True, True)]
+)
+def test_changes_between_steps(modify_core_nodes, fixed_boundaries):
+    # nodes that may change between steps are always reduced again.
+    (z, bh, plan) = _tracking_plan(
+        modify_core_nodes=modify_core_nodes,
+        fixed_boundaries=fixed_boundaries,
+    )
+    for _ in range(5):
+        plan.run_one_step(10.0)
+        z[bh._node_ids[-7:]] -= 3.0
+        target = bh.outlet_elevation_obj(bh.model_time)
+        plan.run_one_step(10.0)
+        assert np.mean(z[bh.nodes_to_lower]) == pytest.approx(target)
@@ -1,6 +1,7 @@
 # coding: utf8
 # !/usr/env/python
 
+import numpy as np
 import pytest
 from landlab import HexModelGrid, RasterModelGrid
 from scipy.integrate import IntegrationWarning
@@ -183,3 +184,238 @@ def test_bad_infiltration():
                 rainfall__shape_factor=0.65,
                 infiltration_capacity=-0.001,
             )
+
+
+@pytest.mark.parametrize("infiltration_capacity", [0.0, 2.0])
+@pytest.mark.parametrize("stop_time", [None, 30.0])
+def test_adjustment_factor_matches_quadrature(infiltration_capacity, stop_time):
+    from scipy.integrate import quad
+
+    from terrainbento.boundary_handlers.precip_changer import (
+        _integrand,
+        _scale_fac,
+    )
+
+    def psi(mean_depth):
+        lam = _scale_fac(mean_depth, 0.65)
+        return quad(
+            _integrand,
+            infiltration_capacity,
+            np.inf,
+            args=(infiltration_capacity, lam, 0.65, 0.5),
+        )[0]
+
+    mg = RasterModelGrid((5, 5))
+    pc = PrecipChanger(
+        mg,
+        daily_rainfall__intermittency_factor=0.3,
+        daily_rainfall__intermittency_factor_time_rate_of_change=0.001,
+        rainfall__mean_rate=3.0,
+        rainfall__mean_rate_time_rate_of_change=0.2,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=infiltration_capacity,
+        m_sp=0.5,
+        precipchanger_stop_time=stop_time,
+    )
+    np.testing.assert_allclose(pc.starting_psi, psi(3.0), rtol=1e-7)
+    for _ in range(8):
+        pc.run_one_step(5.0)
+        frac_wet, mean_depth = pc.get_current_precip_params()
+        expected = (frac_wet * psi(mean_depth)) / (0.3 * psi(3.0))
+        np.testing.assert_allclose(
+            pc.get_erodibility_adjustment_factor(), expected, rtol=1e-7
+        )
+
+
+@pytest.mark.parametrize(
+    "infiltration_capacity, c, m",
+    [(1.0, 0.65, 0.5), (10.0, 0.65, 0.5), (5.0, 1.5, 0.5), (2.0, 1.0, 1.0)],
+)
+def test_psi_table_matches_quadrature(infiltration_capacity, c, m):
+    import warnings
+
+    from scipy.integrate import quad
+
+    from terrainbento.boundary_handlers.precip_changer import (
+        _PsiEvaluator,
+        _integrand,
+        _scale_fac,
+    )
+
+    depths = np.geomspace(0.05, 50.0, 40)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        psi = _PsiEvaluator(infiltration_capacity, c, m, mean_depths=depths)
+    assert psi._spline.x.size <= 1025
+
+    lam = _scale_fac(depths, c)
+    # the integrand underflows where (Ic / lambda)**c is large.
+    checked = (infiltration_capacity / lam) ** c < 600.0
+    assert checked.sum() > 10
+    expected = []
+    for scale in lam[checked]:
+        args = (infiltration_capacity, scale, c, m)
+        split = infiltration_capacity + 50.0 * scale
+        expected.append(
+            sum(
+                quad(_integrand, a, b, args=args, epsabs=0.0, epsrel=1e-12)[0]
+                for (a, b) in [(infiltration_capacity, split), (split, np.inf)]
+            )
+        )
+    np.testing.assert_allclose(psi(depths[checked]), expected, rtol=1e-6)
+    assert np.all(np.isfinite(psi(depths)))
+
+
+def test_psi_table_falls_back_to_quadrature(monkeypatch):
+    from terrainbento.boundary_handlers import precip_changer
+
+    monkeypatch.setattr(precip_changer, "_PSI_MAX_REFINEMENTS", 1)
+    monkeypatch.setattr(precip_changer, "_PSI_RTOL", 1e-30)
+    with pytest.warns(RuntimeWarning):
+        psi = precip_changer._PsiEvaluator(2.0, 0.65, 0.5, mean_depths=[1.0])
+    assert psi._direct
+    table = precip_changer._PsiEvaluator(2.0, 0.65, 0.5)
+    depths = np.array([0.5, 1.0, 30.0])
+    np.testing.assert_allclose(psi(depths), table(depths), rtol=1e-7)
+
+
+def test_adjustment_factor_memoized():
+    mg = RasterModelGrid((5, 5))
+    pc = PrecipChanger(
+        mg,
+        daily_rainfall__intermittency_factor=0.3,
+        daily_rainfall__intermittency_factor_time_rate_of_change=0.001,
+        rainfall__mean_rate=3.0,
+        rainfall__mean_rate_time_rate_of_change=0.2,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=2.0,
+    )
+    pc.run_one_step(1.0)
+    first = pc.get_erodibility_adjustment_factor()
+    assert pc._adjustment_factor_time == 1.0
+    pc._psi = None  # not used again until the time changes
+    assert pc.get_erodibility_adjustment_factor() == first
+
+
+def test_history_equals_linear_trend():
+    # a two point history reproduces the linear trend.
+    mg = RasterModelGrid((3, 3))
+    trend = PrecipChanger(
+        mg,
+        daily_rainfall__intermittency_factor=0.3,
+        daily_rainfall__intermittency_factor_time_rate_of_change=0.001,
+        rainfall__mean_rate=3.0,
+        rainfall__mean_rate_time_rate_of_change=0.2,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=2.0,
+        precipchanger_stop_time=50.0,
+    )
+    history = PrecipChanger(
+        mg,
+        precip_history=[[0.0, 0.3, 3.0], [50.0, 0.35, 13.0]],
+        precip_history_time_step=0.5,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=2.0,
+        precipchanger_stop_time=50.0,
+    )
+    for _ in range(12):
+        np.testing.assert_allclose(
+            history.get_current_precip_params(),
+            trend.get_current_precip_params(),
+        )
+        np.testing.assert_allclose(
+            history.get_erodibility_adjustment_factor(),
+            trend.get_erodibility_adjustment_factor(),
+            rtol=1e-5,
+        )
+        history.run_one_step(5.0)
+        trend.run_one_step(5.0)
+
+
+def test_history_sampled_between_its_times():
+    # Psi is far from linear in the mean depth here, so the default time grid
+    # must sample it between the two times of the history.
+    mg = RasterModelGrid((3, 3))
+    trend = PrecipChanger(
+        mg,
+        daily_rainfall__intermittency_factor=0.3,
+        daily_rainfall__intermittency_factor_time_rate_of_change=0.001,
+        rainfall__mean_rate=1.0,
+        rainfall__mean_rate_time_rate_of_change=0.58,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=10.0,
+        precipchanger_stop_time=50.0,
+    )
+    history = PrecipChanger(
+        mg,
+        precip_history=[[0.0, 0.3, 1.0], [50.0, 0.35, 30.0]],
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=10.0,
+        precipchanger_stop_time=50.0,
+    )
+    for step in [3.0, 7.0, 11.5, 3.5, 14.0, 8.0]:
+        history.run_one_step(step)
+        trend.run_one_step(step)
+        np.testing.assert_allclose(
+            history.get_erodibility_adjustment_factor(),
+            trend.get_erodibility_adjustment_factor(),
+            rtol=1e-5,
+        )
+    assert history._timeline.time.size < 10000
+
+
+def test_history_from_file(tmpdir):
+    path = str(tmpdir.join("precip.csv"))
+    history = np.array(
+        [[-10.0, 0.2, 2.0], [20.0, 0.5, 5.0], [40.0, 0.1, 1.0]]
+    )
+    np.savetxt(path, history, delimiter=",", header="time,F,pd")
+    pc = PrecipChanger(
+        RasterModelGrid((3, 3)),
+        precip_history=path,
+        precip_history_time_step=0.1,
+        rainfall__shape_factor=0.65,
+        infiltration_capacity=0.0,
+    )
+    assert pc.starting_frac_wet_days == pytest.approx(0.3)
+    assert pc.starting_daily_mean_depth == pytest.approx(3.0)
+
+    pc.run_one_step(30.0)
+    frac_wet, mean_depth = pc.get_current_precip_params()
+    assert frac_wet == pytest.approx(0.3)
+    assert mean_depth == pytest.approx(3.0)
+    assert pc.get_erodibility_adjustment_factor() == pytest.approx(
+        1.0, rel=1e-4
+    )
+
+    # values are held after the end of the history.
+    pc.run_one_step(100.0)
+    assert pc.get_current_precip_params() == pytest.approx((0.1, 1.0))
+    assert pc.get_erodibility_adjustment_factor() == pytest.approx(
+        (0.1 / 0.3) * (1.0 / 3.0) ** 0.5
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"precip_history": "not_a_file.csv"},
+        {"precip_history": [[0.0, 0.3]]},
+        {"precip_history": [[0.0, 0.3, 3.0], [0.0, 0.3, 3.0]]},
+        {"precip_history": [[0.0, 1.3, 3.0]]},
+        {"precip_history": [[0.0, 0.3, -3.0]]},
+        {"precip_history": [[0.0, 0.3, 3.0]], "rainfall__mean_rate": 3.0},
+        {
+            "precip_history": [[0.0, 0.3, 3.0], [1.0, 0.3, 3.0]],
+            "precip_history_time_step": 0.0,
+        },
+    ],
+)
+def test_bad_history(kwargs):
+    with pytest.raises(ValueError):
+        PrecipChanger(
+            RasterModelGrid((3, 3)),
+            rainfall__shape_factor=0.65,
+            infiltration_capacity=0.0,
+            **kwargs
+        )
@@ -0,0 +1,158 @@
+# coding: utf8
+# !/usr/env/python
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento.boundary_handlers import (
+    BaselevelUpdatePlan,
+    CaptureNodeBaselevelHandler,
+    GenericFuncBaselevelHandler,
+    NotCoreNodeBaselevelHandler,
+    SingleNodeBaselevelHandler,
+)
+from terrainbento.boundary_handlers.baselevel_update_plan import _FusedSegment
+
+_FIELDS = (
+    "topographic__elevation",
+    "bedrock__elevation",
+    "lithology_contact__elevation",
+)
+
+
+def _grid():
+    mg = RasterModelGrid((5, 6))
+    for (i, name) in enumerate(_FIELDS):
+        mg.add_field("node", name, mg.x_of_node + mg.y_of_node - i)
+    return mg
+
+
+def _handlers(mg, tmpdir):
+    path = str(tmpdir.join("outlet_history.txt"))
+    np.savetxt(path, [[0.0, 0.0], [100.0, -5.0]], delimiter=",", header="t,z")
+    return {
+        "CaptureNodeBaselevelHandler": CaptureNodeBaselevelHandler(
+            mg,
+            capture_node=11,
+            capture_incision_rate=-0.1,
+            capture_start_time=20.0,
+            capture_stop_time=60.0,
+        ),
+        "GenericFuncBaselevelHandler": GenericFuncBaselevelHandler(
+            mg,
+            modify_core_nodes=True,
+            function=lambda grid, t: (
+                1e-3 * grid.at_node["topographic__elevation"] + 1e-4 * t
+            ),
+        ),
+        "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+            mg, lowering_rate=-0.01
+        ),
+        "SingleNodeBaselevelHandler": SingleNodeBaselevelHandler(
+            mg, outlet_id=0, lowering_file_path=path
+        ),
+        "other": NotCoreNodeBaselevelHandler(
+            mg, modify_core_nodes=True, lowering_rate=0.002
+        ),
+    }
+
+
+def test_fused_matches_sequential(tmpdir):
+    fused_grid = _grid()
+    plan = BaselevelUpdatePlan(fused_grid, _handlers(fused_grid, tmpdir))
+
+    sequential_grid = _grid()
+    handlers = _handlers(sequential_grid, tmpdir)
+    for _ in range(10):
+        plan.run_one_step(10.0)
+        for handler in handlers.values():
+            handler.run_one_step(10.0)
+
+    for name in _FIELDS:
+        np.testing.assert_allclose(
+            fused_grid.at_node[name],
+            sequential_grid.at_node[name],
+            rtol=1e-12,
+        )
+
+
+def test_capture_node_moves_only_topography():
+    mg = _grid()
+    bedrock = mg.at_node["bedrock__elevation"].copy()
+    handlers = {
+        "CaptureNodeBaselevelHandler": CaptureNodeBaselevelHandler(
+            mg, capture_node=11, capture_incision_rate=-0.1
+        )
+    }
+    BaselevelUpdatePlan(mg, handlers).run_one_step(10.0)
+    np.testing.assert_array_equal(mg.at_node["bedrock__elevation"], bedrock)
+
+
+def _outlet_reset_handlers(mg):
+    return {
+        "SingleNodeBaselevelHandler": SingleNodeBaselevelHandler(
+            mg, outlet_id=0, modify_outlet_id=False, lowering_rate=-0.1
+        ),
+        "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+            mg, lowering_rate=-0.01
+        ),
+    }
+
+
+def test_outlet_reset_is_fused():
+    fused_grid = _grid()
+    plan = BaselevelUpdatePlan(fused_grid, _outlet_reset_handlers(fused_grid))
+
+    sequential_grid = _grid()
+    handlers = _outlet_reset_handlers(sequential_grid)
+    for _ in range(3):
+        plan.run_one_step(10.0)
+        for handler in handlers.values():
+            handler.run_one_step(10.0)
+
+    assert all(isinstance(s, _FusedSegment) for s in plan._segments)
+    for name in _FIELDS:
+        np.testing.assert_array_equal(
+            fused_grid.at_node[name], sequential_grid.at_node[name]
+        )
+
+    # the outlet is reset every step and then lowered by the later handler.
+    z = fused_grid.at_node["topographic__elevation"]
+    assert z[0] == pytest.approx(-0.1)
+
+
+def test_recompiled_only_on_status_change():
+    mg = _grid()
+    z = mg.at_node["topographic__elevation"]
+    handlers = {
+        "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+            mg, lowering_rate=-0.1
+        )
+    }
+    plan = BaselevelUpdatePlan(mg, handlers)
+    plan.run_one_step(1.0)
+    segments = plan._segments
+    plan.run_one_step(1.0)
+    assert plan._segments is segments
+
+    # a core node that becomes a boundary node is lowered from then on.
+    before = z[8]
+    mg.status_at_node[8] = mg.BC_NODE_IS_FIXED_VALUE
+    plan.run_one_step(1.0)
+    assert plan._segments is not segments
+    assert z[8] == before - 0.1
+
+
+def test_handlers_added_later():
+    mg = _grid()
+    z = mg.at_node["topographic__elevation"]
+    handlers = {}
+    plan = BaselevelUpdatePlan(mg, handlers)
+    plan.run_one_step(1.0)
+    handlers["SingleNodeBaselevelHandler"] = SingleNodeBaselevelHandler(
+        mg, lowering_rate=-0.5
+    )
+    before = z[0]
+    plan.run_one_step(1.0)
+    assert z[0] == before - 0.5
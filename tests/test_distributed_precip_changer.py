@@ -0,0 +1,200 @@
+# coding: utf8
+# !/usr/env/python
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento import (
+    Basic,
+    BasicDd,
+    BasicSt,
+    BasicTh,
+    BasicVs,
+    DistributedPrecipChanger,
+    NotCoreNodeBaselevelHandler,
+    PrecipChanger,
+)
+
+_PARAMS = {
+    "daily_rainfall__intermittency_factor": 0.3,
+    "daily_rainfall__intermittency_factor_time_rate_of_change": 0.001,
+    "rainfall__mean_rate": 3.0,
+    "rainfall__mean_rate_time_rate_of_change": 0.2,
+    "rainfall__shape_factor": 0.65,
+    "infiltration_capacity": 2.0,
+}
+
+
+@pytest.mark.parametrize("missing", list(_PARAMS))
+def test_missing_parameter(missing):
+    params = dict(_PARAMS)
+    params.pop(missing)
+    with pytest.raises(ValueError):
+        DistributedPrecipChanger(RasterModelGrid((3, 3)), **params)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"rainfall__mean_rate": [1.0, 2.0]},
+        {"rainfall__shape_factor": [0.65, 0.7]},
+        {"climate_zones": np.zeros(4)},
+        {"climate_zones": -np.ones(9)},
+        {"daily_rainfall__intermittency_factor": 1.5},
+        {"rainfall__mean_rate": -1.0},
+        {"infiltration_capacity": -0.1},
+    ],
+)
+def test_bad_values(kwargs):
+    params = dict(_PARAMS)
+    params.update(kwargs)
+    with pytest.raises(ValueError):
+        DistributedPrecipChanger(RasterModelGrid((3, 3)), **params)
+
+
+@pytest.mark.parametrize("stop_time", [None, 15.0])
+def test_matches_scalar_precip_changer(stop_time):
+    # each zone behaves as a scalar PrecipChanger with its own parameters.
+    grid = RasterModelGrid((3, 4))
+    zones = (grid.x_of_node > 1.5).astype(int)
+    zone_params = [
+        {"rainfall__mean_rate": 3.0, "infiltration_capacity": 2.0},
+        {"rainfall__mean_rate": 5.0, "infiltration_capacity": 0.0},
+    ]
+    params = dict(_PARAMS)
+    params["rainfall__mean_rate"] = [3.0, 5.0]
+    params["infiltration_capacity"] = [2.0, 0.0]
+    dpc = DistributedPrecipChanger(
+        grid,
+        climate_zones=zones,
+        precipchanger_start_time=2.0,
+        precipchanger_stop_time=stop_time,
+        **params
+    )
+
+    scalar = []
+    for zone_param in zone_params:
+        params = dict(_PARAMS)
+        params.update(zone_param)
+        scalar.append(
+            PrecipChanger(
+                grid,
+                precipchanger_start_time=2.0,
+                precipchanger_stop_time=stop_time,
+                **params
+            )
+        )
+
+    for _ in range(5):
+        fw = dpc.get_erodibility_adjustment_factor()
+        frac_wet, mean_depth = dpc.get_current_precip_params()
+        for zone, pc in enumerate(scalar):
+            np.testing.assert_allclose(
+                fw[zones == zone],
+                pc.get_erodibility_adjustment_factor(),
+                rtol=1e-7,
+            )
+            expected_frac_wet, expected_depth = pc.get_current_precip_params()
+            np.testing.assert_allclose(
+                frac_wet[zones == zone], expected_frac_wet
+            )
+            np.testing.assert_allclose(
+                mean_depth[zones == zone], expected_depth
+            )
+            pc.run_one_step(5.0)
+        dpc.run_one_step(5.0)
+
+
+def test_field_parameters():
+    grid = RasterModelGrid((3, 4))
+    grid.add_field("node", "mean_rate", 1.0 + grid.x_of_node)
+    params = dict(_PARAMS)
+    params["rainfall__mean_rate"] = "mean_rate"
+    params["infiltration_capacity"] = 0.0
+    dpc = DistributedPrecipChanger(grid, **params)
+    dpc.run_one_step(10.0)
+    fw = dpc.get_erodibility_adjustment_factor()
+
+    # with zero infiltration capacity, Psi scales with mean depth ** m.
+    depth = 1.0 + grid.x_of_node
+    expected = (0.31 / 0.3) * ((depth + 2.0) / depth) ** 0.5
+    np.testing.assert_allclose(fw, expected)
+    assert dpc.get_erodibility_adjustment_factor() is fw
+
+
+@pytest.mark.parametrize(
+    "model_class, names",
+    [
+        (Basic, {"K": "water_erodibility"}),
+        (BasicTh, {"K": "water_erodibility"}),
+        (BasicVs, {"K": "water_erodibility"}),
+        (BasicDd, {"K": "water_erodibility"}),
+    ],
+)
+def test_model_uses_distributed_changer(clock_simple, model_class, names):
+    grid = RasterModelGrid((3, 5), xy_spacing=100.0)
+    grid.add_zeros("node", "topographic__elevation")
+    grid.add_ones("node", "soil__depth")
+    params = dict(_PARAMS)
+    params["rainfall__mean_rate"] = 1.0 + grid.x_of_node / 100.0
+    dpc = DistributedPrecipChanger(grid, **params)
+    model = model_class(
+        clock=clock_simple,
+        grid=grid,
+        boundary_handlers={
+            "orographic": dpc,
+            "NotCoreNodeBaselevelHandler": NotCoreNodeBaselevelHandler(
+                grid, lowering_rate=-0.001
+            ),
+        },
+        **{param: 0.001 for param in names.values()},
+    )
+    assert model.boundary_handlers["PrecipChanger"] is dpc
+    model.run_one_step(10.0)
+
+    # a step uses the factor from before its boundary handlers advance.
+    expected = 0.001 * dpc.get_erodibility_adjustment_factor()
+    assert np.ptp(expected) > 0.0
+    model.run_one_step(10.0)
+    erodibility = {name: getattr(model.eroder, name) for name in names}
+    for name in names:
+        np.testing.assert_allclose(erodibility[name], expected)
+
+    expected = 0.001 * dpc.get_erodibility_adjustment_factor()
+    model.run_one_step(10.0)
+    for name in names:
+        # the eroder's array is updated in place.
+        assert getattr(model.eroder, name) is erodibility[name]
+        np.testing.assert_allclose(erodibility[name], expected)
+
+
+def test_model_rejects_two_changers(clock_simple):
+    grid = RasterModelGrid((3, 5), xy_spacing=100.0)
+    grid.add_zeros("node", "topographic__elevation")
+    with pytest.raises(ValueError):
+        Basic(
+            clock=clock_simple,
+            grid=grid,
+            boundary_handlers={
+                "PrecipChanger": PrecipChanger(grid, **_PARAMS),
+                "DistributedPrecipChanger": DistributedPrecipChanger(
+                    grid, **_PARAMS
+                ),
+            },
+        )
+
+
+def test_stochastic_model_rejects_distributed_changer(clock_simple):
+    grid = RasterModelGrid((3, 5), xy_spacing=100.0)
+    grid.add_zeros("node", "topographic__elevation")
+    with pytest.raises(ValueError):
+        BasicSt(
+            clock=clock_simple,
+            grid=grid,
+            boundary_handlers={
+                "DistributedPrecipChanger": DistributedPrecipChanger(
+                    grid, **_PARAMS
+                )
+            },
+        )
@@ -0,0 +1,122 @@
+# coding: utf8
+# !/usr/env/python
+
+import copy
+
+import numpy as np
+import pytest
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.components import NormalFault
+
+from terrainbento import Basic
+from terrainbento.boundary_handlers import (
+    CachedNormalFault,
+    FaultGeometryCache,
+)
+from terrainbento.boundary_handlers.fault_geometry import fault_geometry_key
+
+_TRACE = {"x1": 0.0, "y1": 1.0, "x2": 9.0, "y2": 6.0}
+_PARAMS = {
+    "fault_trace": _TRACE,
+    "fault_throw_rate_through_time": {"time": [0, 50], "rate": [0.1, 0.2]},
+    "fault_dip_angle": 60.0,
+}
+
+
+def _grid(hex):
+    if hex:
+        grid = HexModelGrid((8, 9))
+    else:
+        grid = RasterModelGrid((8, 10))
+    grid.add_zeros("node", "topographic__elevation")
+    return grid
+
+
+@pytest.mark.parametrize("hex", [False, True])
+@pytest.mark.parametrize("include_boundaries", [False, True])
+def test_matches_normal_fault(hex, include_boundaries):
+    cache = FaultGeometryCache()
+    expected = _grid(hex)
+    fault = NormalFault(
+        expected, include_boundaries=include_boundaries, **_PARAMS
+    )
+
+    grids = [_grid(hex) for _ in range(3)]
+    faults = [
+        CachedNormalFault(
+            grid,
+            include_boundaries=include_boundaries,
+            geometry_cache=cache,
+            **_PARAMS
+        )
+        for grid in grids
+    ]
+    assert len(cache) == 1
+    for _ in range(10):
+        fault.run_one_step(10.0)
+        for cached in faults:
+            cached.run_one_step(10.0)
+    for (grid, cached) in zip(grids, faults):
+        assert cached.faulted_nodes is faults[0].faulted_nodes
+        np.testing.assert_array_equal(
+            cached.faulted_nodes, fault.faulted_nodes
+        )
+        np.testing.assert_array_equal(
+            grid.at_node["topographic__elevation"],
+            expected.at_node["topographic__elevation"],
+        )
+
+
+def test_key_depends_on_status():
+    grid = _grid(False)
+    key = fault_geometry_key(grid, _TRACE)
+    assert key == fault_geometry_key(_grid(False), _TRACE)
+    assert key != fault_geometry_key(grid, _TRACE, include_boundaries=True)
+    grid.status_at_node[12] = grid.BC_NODE_IS_FIXED_VALUE
+    assert key != fault_geometry_key(grid, _TRACE)
+
+
+def test_shared_memory():
+    parent = FaultGeometryCache()
+    CachedNormalFault(_grid(False), geometry_cache=parent, **_PARAMS)
+    CachedNormalFault(_grid(True), geometry_cache=parent, **_PARAMS)
+    shared = parent.export()
+
+    worker = FaultGeometryCache()
+    worker.attach(shared)
+    assert len(worker) == 2
+    grid = _grid(False)
+    fault = CachedNormalFault(grid, geometry_cache=worker, **_PARAMS)
+    key = fault_geometry_key(grid, _TRACE)
+    np.testing.assert_array_equal(fault.faulted_nodes, parent.get(key))
+    assert not fault.faulted_nodes.flags.writeable
+    del fault
+    worker.clear()
+    parent.clear()
+    assert len(parent) == 0
+
+
+def test_model_uses_cached_fault():
+    params = {
+        "grid": {
+            "RasterModelGrid": [
+                (8, 10),
+                {
+                    "fields": {
+                        "node": {
+                            "topographic__elevation": {
+                                "constant": [{"value": 0.0}]
+                            }
+                        }
+                    }
+                },
+            ]
+        },
+        "clock": {"step": 10.0, "stop": 100.0},
+        "boundary_handlers": {"NormalFault": _PARAMS},
+        "output_default_netcdf": False,
+    }
+    models = [Basic.from_dict(copy.deepcopy(params)) for _ in range(2)]
+    faults = [model.boundary_handlers["NormalFault"] for model in models]
+    assert isinstance(faults[0], CachedNormalFault)
+    assert faults[0].faulted_nodes is faults[1].faulted_nodes
@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 from numpy.testing import assert_array_almost_equal
 
@@ -57,3 +58,28 @@ def test_steady_without_stochastic_duration(
     assert_array_almost_equal(
         actual_slopes[ic], predicted_slopes[ic], decimal=4
     )
+
+
+@pytest.mark.parametrize("rain_rate", [0.0, 0.01, 1.0, 100.0])
+def test_runoff_matches_formula(clock_simple, grid_2, rain_rate):
+    grid_2.at_node["topographic__elevation"][:] = grid_2.x_of_node / 100.0
+    grid_2.at_node["soil__depth"][:] = 2.0
+    model = BasicStVs(
+        clock=clock_simple, grid=grid_2, hydraulic_conductivity=0.5
+    )
+    model.create_and_move_water(1.0)
+    model.rain_rate = rain_rate
+    model.calc_runoff_and_discharge()
+
+    slope = model.grid.at_node["topographic__steepest_slope"]
+    pa = rain_rate * model.grid.at_node["drainage_area"]
+    active = slope > 0.0
+    tls = model.tlam[active] * slope[active]
+    qss = np.zeros_like(pa)
+    qss[active] = tls * (1.0 - np.exp(-pa[active] / tls))
+
+    assert_array_almost_equal(model.qss, qss)
+    assert_array_almost_equal(
+        model.grid.at_node["surface_water__discharge"],
+        np.maximum(pa - qss, 0.0),
+    )
@@ -0,0 +1,170 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+import time
+import warnings
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento import Basic, Clock, OutputBudgetWarning
+from terrainbento.output_writers import (
+    OWReductions,
+    StaticIntervalOutputWriter,
+)
+
+
+class _Clock(object):
+    """A wall clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(time, "perf_counter", fake)
+    return fake
+
+
+class _Slow(StaticIntervalOutputWriter):
+    """Take some wall time and record the output times."""
+
+    def __init__(self, model, delay=0.0, clock=None, **kwargs):
+        super().__init__(model, **kwargs)
+        self.delay = delay
+        self.clock = clock
+        self.times = []
+
+    def run_one_step(self):
+        if self.clock is None:
+            time.sleep(self.delay)
+        else:
+            self.clock.now += self.delay
+        self.times.append(self.model.model_time)
+
+
+class _Timed(Basic):
+    """Take one second of a fake clock for each time step."""
+
+    def __init__(self, *args, wall_clock=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wall_clock = wall_clock
+
+    def run_one_step(self, step):
+        if self.wall_clock is not None:
+            self.wall_clock.now += 1.0
+        super().run_one_step(step)
+
+
+def _model(tmpdir, writers, stop=20.0, clock=None, **kwargs):
+    grid = RasterModelGrid((4, 5))
+    z = grid.add_zeros("node", "topographic__elevation")
+    z += np.random.default_rng(8).uniform(0.0, 1.0, size=z.size)
+    for writer in writers.values():
+        if clock is not None:
+            writer.setdefault("kwargs", {})["clock"] = clock
+    return _Timed(
+        Clock(step=1.0, stop=stop),
+        grid,
+        output_writers=writers,
+        output_interval=1.0,
+        output_default_netcdf=False,
+        output_dir=str(tmpdir),
+        wall_clock=clock,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("budget", [0.0, 1.5])
+def test_bad_budget(tmpdir, budget):
+    with pytest.raises(ValueError):
+        _model(tmpdir, {}, output_budget=budget)
+
+
+def test_costs_recorded(tmpdir):
+    writers = {
+        "stats": {"class": OWReductions, "kwargs": {"intervals": 5.0}},
+        "slow": {"class": _Slow, "kwargs": {"delay": 0.01}},
+    }
+    model = _model(tmpdir, writers)
+    model.run()
+    (stats,) = model.get_output_writer("stats")
+    costs = stats.output_costs
+    assert [cost[0] for cost in costs] == [0.0, 5.0, 10.0, 15.0, 20.0]
+    assert all(cost[2] > 0 for cost in costs)
+    assert stats.total_bytes_written == os.path.getsize(stats.filepath)
+
+    (slow,) = model.get_output_writer("slow")
+    assert len(slow.output_costs) == 21
+    assert slow.total_output_time >= 21 * 0.01
+    assert slow.total_bytes_written == 0
+    model.remove_output()
+
+
+def test_no_warning_within_budget(tmpdir):
+    writers = {"slow": {"class": _Slow}}
+    model = _model(tmpdir, writers, output_budget=1.0)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", OutputBudgetWarning)
+        model.run()
+
+
+def test_budget_excludes_time_outside_run(tmpdir, clock):
+    writers = {"slow": {"class": _Slow, "kwargs": {"delay": 0.05}}}
+    model = _model(tmpdir, writers, clock=clock, output_budget=0.1)
+    clock.now += 1000.0
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", OutputBudgetWarning)
+        model.run()
+    assert model._run_wall_time == pytest.approx(20.0 + 21 * 0.05)
+
+
+def test_warns_without_thinning(tmpdir, clock):
+    writers = {"slow": {"class": _Slow, "kwargs": {"delay": 0.5}}}
+    model = _model(tmpdir, writers, clock=clock, output_budget=0.1)
+    with pytest.warns(OutputBudgetWarning):
+        model.run()
+    (slow,) = model.get_output_writer("slow")
+    assert slow.times == [float(t) for t in range(21)]
+
+
+def test_thinning_keeps_first_and_last(tmpdir, clock):
+    writers = {
+        "slow": {"class": _Slow, "kwargs": {"delay": 0.5}},
+        "fast": {"class": _Slow},
+    }
+    model = _model(
+        tmpdir,
+        writers,
+        stop=41.0,
+        clock=clock,
+        output_budget=0.1,
+        output_budget_thinning=True,
+    )
+    with pytest.warns(OutputBudgetWarning):
+        model.run()
+    (slow,) = model.get_output_writer("slow")
+    (fast,) = model.get_output_writer("fast")
+    assert fast.times == [float(t) for t in range(42)]
+    # thinned after every second call, as the slow writer stays over budget.
+    assert slow.times == [
+        0.0, 1.0, 3.0, 5.0, 9.0, 13.0, 21.0, 29.0, 37.0, 41.0
+    ]
+
+
+def test_thin_output_times(tmpdir):
+    model = _model(tmpdir, {"slow": {"class": _Slow}}, stop=10.0)
+    (slow,) = model.get_output_writer("slow")
+    with pytest.raises(ValueError):
+        slow.thin_output_times(0)
+    slow.thin_output_times(1)
+    slow.thin_output_times(3)
+    model.run()
+    assert slow.times == [0.0, 3.0, 6.0, 9.0, 10.0]
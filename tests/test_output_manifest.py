@@ -0,0 +1,100 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+
+from landlab import RasterModelGrid
+
+from terrainbento import OutputManifest
+from terrainbento.output_writers import OWReductions
+
+
+def _model(make_model, **kwargs):
+    return make_model(
+        RasterModelGrid((4, 5)),
+        {"stats": {"class": OWReductions, "kwargs": {"intervals": 2.0}}},
+        output_interval=1.0,
+        output_default_netcdf=True,
+        **kwargs,
+    )
+
+
+def test_no_manifest_by_default(tmpdir, make_model):
+    model = _model(make_model)
+    model.run()
+    assert model.output_manifest is None
+    assert not any(name.endswith(".jsonl") for name in os.listdir(tmpdir))
+    model.remove_output()
+
+
+def test_manifest_matches_writers(make_model):
+    model = _model(make_model, output_manifest=True)
+    model.run()
+    manifest = model.output_manifest
+    assert os.path.basename(manifest.filepath) == (
+        "terrainbento-output_manifest.jsonl"
+    )
+    assert manifest.paths() == model.get_output()
+    assert manifest.paths(extension="nc") == model.get_output(extension="nc")
+    (netcdf,) = model.get_output_writer("simple-netcdf")
+    (stats,) = model.get_output_writer("stats")
+    assert manifest.paths(writer=netcdf.name) == netcdf.output_filepaths
+    assert manifest.paths(writer=stats.name, extension="csv") == [
+        stats.filepath
+    ]
+    assert set(manifest.writers) == {netcdf.name, stats.name}
+    assert manifest.paths(time=3.0) == [netcdf.output_filepaths[3]]
+    assert manifest.record(netcdf.output_filepaths[2]) == {
+        "writer": netcdf.name,
+        "time": 2.0,
+        "extension": "nc",
+    }
+
+    loaded = OutputManifest.load(manifest.filepath)
+    assert loaded.paths() == manifest.paths()
+    assert loaded.paths(time=4.0) == manifest.paths(time=4.0)
+
+    netcdf_files = netcdf.output_filepaths
+    model.remove_output(extension="nc")
+    assert manifest.paths() == [stats.filepath]
+    assert netcdf.output_filepaths == []
+    assert not any(os.path.exists(path) for path in netcdf_files)
+    assert model.get_output(writer=stats.name) == [stats.filepath]
+    assert OutputManifest.load(manifest.filepath).paths() == [stats.filepath]
+    model.remove_output()
+    assert len(OutputManifest.load(manifest.filepath)) == 0
+    assert not os.path.exists(stats.filepath)
+    assert stats.output_filepaths == []
+
+
+def test_load_after_crash(tmpdir):
+    log = str(tmpdir.join("manifest.jsonl"))
+    manifest = OutputManifest(log)
+    for time in range(3):
+        manifest.add(f"out_{time}.nc", "netcdf", time)
+    manifest.add("out_0.nc", "netcdf", 0)
+    with open(log, "a") as fp:
+        fp.write('{"action": "add", "pa')
+
+    loaded = OutputManifest.load(log)
+    assert loaded.paths() == ["out_0.nc", "out_1.nc", "out_2.nc"]
+    assert "out_1.nc" in loaded
+    assert loaded.paths(writer="plot") == []
+
+
+def test_new_manifest_replaces_log(tmpdir):
+    log = str(tmpdir.join("manifest.jsonl"))
+    OutputManifest(log).add("old.nc", "netcdf", 0.0)
+    manifest = OutputManifest(log)
+    manifest.add("new.nc", "netcdf", 0.0)
+    assert OutputManifest.load(log).paths() == ["new.nc"]
+
+
+def test_in_memory_manifest():
+    manifest = OutputManifest()
+    manifest.add("a.nc", "netcdf", 1.0)
+    manifest.remove("a.nc")
+    manifest.remove("b.nc")
+    assert manifest.filepath is None
+    assert manifest.paths(writer="netcdf", time=1.0) == []
+    assert manifest.writers == []
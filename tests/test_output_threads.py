@@ -0,0 +1,95 @@
+# coding: utf8
+# !/usr/env/python
+
+import threading
+
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento.output_writers import (
+    OWReductions,
+    StaticIntervalOutputWriter,
+)
+
+
+class _Waiter(StaticIntervalOutputWriter):
+    """Wait at a barrier shared with the other writers."""
+
+    def __init__(self, model, barrier=None, fail_at=None, **kwargs):
+        super().__init__(model, **kwargs)
+        self.barrier = barrier
+        self.fail_at = fail_at
+        self.times = []
+        self.threads = set()
+
+    def run_one_step(self):
+        self.threads.add(threading.get_ident())
+        self.times.append(self.model.model_time)
+        if self.barrier is not None:
+            self.barrier.wait()
+        if self.model.model_time == self.fail_at:
+            raise ValueError(f"{self.name} failed")
+
+
+def _model(make_model, writers, **kwargs):
+    return make_model(
+        RasterModelGrid((4, 5)), writers, output_interval=2.0, **kwargs
+    )
+
+
+def test_bad_threads(make_model):
+    with pytest.raises(ValueError):
+        _model(make_model, {}, output_threads=0)
+
+
+def test_writers_run_together(make_model):
+    barrier = threading.Barrier(3, timeout=10.0)
+    writers = {
+        name: {"class": _Waiter, "kwargs": {"barrier": barrier}}
+        for name in ("a", "b", "c")
+    }
+    model = _model(make_model, writers, output_threads=3)
+    model.run()
+    for name in ("a", "b", "c"):
+        (writer,) = model.get_output_writer(name)
+        assert writer.times == [0.0, 2.0, 4.0]
+        assert threading.get_ident() not in writer.threads
+
+
+def test_same_output_as_sequential(tmpdir, make_model):
+    writers = {
+        name: {"class": OWReductions, "kwargs": {"intervals": 1.0}}
+        for name in ("a", "b")
+    }
+    outputs = []
+    for threads in (1, 2):
+        model = _model(
+            make_model,
+            writers,
+            output_threads=threads,
+            output_dir=str(tmpdir.mkdir(f"threads-{threads}")),
+        )
+        model.run()
+        outputs.append(
+            [
+                model.to_xarray_dataset(writer=name)
+                for name in ("a", "b")
+            ]
+        )
+    for (sequential, threaded) in zip(*outputs):
+        assert sequential.identical(threaded)
+
+
+def test_writer_exceptions(make_model):
+    writers = {
+        "a": {"class": _Waiter},
+        "b": {"class": _Waiter, "kwargs": {"fail_at": 2.0}},
+        "c": {"class": _Waiter, "kwargs": {"fail_at": 2.0}},
+    }
+    model = _model(make_model, writers, output_threads=2)
+    with pytest.warns(UserWarning, match="also failed"):
+        with pytest.raises(ValueError, match="^b"):
+            model.run()
+    for name in ("a", "b", "c"):
+        (writer,) = model.get_output_writer(name)
+        assert writer.times == [0.0, 2.0]
@@ -0,0 +1,131 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+
+import numpy as np
+import pytest
+from landlab import HexModelGrid, RasterModelGrid
+
+from terrainbento.output_writers import DeltaSnapshotReader, OWDeltaSnapshot
+
+
+def _run(make_model, grid, **kwargs):
+    model = make_model(
+        grid,
+        {"delta": {"class": OWDeltaSnapshot, "kwargs": kwargs}},
+        step=10.0,
+        stop=200.0,
+        lowering={"modify_core_nodes": True, "lowering_rate": -0.001},
+        record=True,
+        output_interval=10.0,
+    )
+    model.run()
+    return (model, np.array(model.get_output_writer("truth")[0].snapshots))
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{"precision": 0.0}, {"keyframe_interval": 0}, {"chunk_size": 0}],
+)
+def test_bad_values(make_model, kwargs):
+    with pytest.raises(ValueError):
+        make_model(
+            RasterModelGrid((3, 3)),
+            {"delta": {"class": OWDeltaSnapshot, "kwargs": kwargs}},
+        )
+
+
+@pytest.mark.parametrize("precision", [1e-3, 1e-8])
+def test_reconstruction_within_precision(make_model, precision):
+    (model, truth) = _run(
+        make_model,
+        RasterModelGrid((12, 15), xy_spacing=10.0),
+        precision=precision,
+        keyframe_interval=4,
+        chunk_size=32,
+    )
+    reader = model.get_output_writer("delta")[0].reader()
+    assert len(reader) == len(truth) == 21
+    np.testing.assert_array_equal(reader.times, 10.0 * np.arange(21))
+
+    series = reader.read_series()
+    assert np.max(np.abs(series - truth)) <= 0.5 * precision * (1 + 1e-9)
+    np.testing.assert_array_equal(series[::4], truth[::4])
+    for i in (0, 5, 20, -1):
+        np.testing.assert_array_equal(reader.read(i), series[i])
+
+
+def test_sub_region(make_model):
+    (model, truth) = _run(
+        make_model,
+        HexModelGrid((9, 11), spacing=10.0),
+        precision=1e-4,
+        keyframe_interval=5,
+        chunk_size=10,
+    )
+    reader = DeltaSnapshotReader(model.get_output(extension="jsonl")[0])
+    nodes = np.array([45, 3, 44, 70])
+    series = reader.read_series()
+    np.testing.assert_array_equal(
+        reader.read_series(start=7, stop=13, nodes=nodes),
+        series[7:13][:, nodes],
+    )
+    with pytest.raises(ValueError):
+        reader.read(21)
+
+
+def test_smaller_than_raw(make_model):
+    (model, truth) = _run(
+        make_model, RasterModelGrid((40, 40), xy_spacing=10.0), precision=1e-4
+    )
+    path = model.get_output(extension="tbdelta")[0]
+    assert os.path.getsize(path) < 0.5 * truth.nbytes
+
+
+def test_model_to_xarray_dataset(make_model):
+    (model, truth) = _run(
+        make_model, RasterModelGrid((6, 7), xy_spacing=10.0), precision=1e-6
+    )
+    ds = model.to_xarray_dataset(writer="delta", space_unit="m")
+    elevation = ds["topographic__elevation"]
+    assert elevation.dims == ("time", "y", "x")
+    assert elevation.shape == (21, 6, 7)
+    assert ds["x"].attrs["units"] == "m"
+    np.testing.assert_allclose(
+        elevation.values.reshape(truth.shape), truth, atol=1e-6
+    )
+    with pytest.raises(ValueError):
+        model.to_xarray_dataset(writer="truth")
+
+
+@pytest.mark.parametrize(
+    "grid",
+    [
+        RasterModelGrid(
+            (30, 40), xy_spacing=(10.0, 5.0), xy_of_lower_left=(3.0, -2.0)
+        ),
+        HexModelGrid((21, 25), spacing=10.0),
+    ],
+)
+def test_header_is_small(tmpdir, make_model, grid):
+    (model, truth) = _run(make_model, grid, precision=1e-4)
+    path = model.get_output(extension="jsonl")[0]
+    with open(path) as f:
+        assert len(f.readline()) < 1000
+
+    reader = DeltaSnapshotReader(path)
+    np.testing.assert_allclose(reader.x_of_node, grid.x_of_node)
+    np.testing.assert_allclose(reader.y_of_node, grid.y_of_node)
+    nodes = np.array([5, 0, 301])
+    (x, y) = reader.coordinates(nodes)
+    np.testing.assert_allclose(x, grid.x_of_node[nodes])
+    np.testing.assert_allclose(y, grid.y_of_node[nodes])
+
+    ds = reader.to_xarray_dataset(nodes=nodes)
+    np.testing.assert_allclose(ds["x"], grid.x_of_node[nodes])
+    assert len(model.get_output(extension="npy")) == (
+        0 if isinstance(grid, RasterModelGrid) else 1
+    )
+    model.remove_output()
+    assert not os.listdir(str(tmpdir))
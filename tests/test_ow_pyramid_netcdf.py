@@ -0,0 +1,117 @@
+# coding: utf8
+# !/usr/env/python
+
+import netCDF4
+import numpy as np
+import pytest
+from landlab import HexModelGrid, RasterModelGrid
+
+from terrainbento.output_writers import OWPyramidNetCDF
+
+
+def _model(make_model, grid, **kwargs):
+    return make_model(
+        grid,
+        {"pyramid": {"class": OWPyramidNetCDF, "kwargs": kwargs}},
+        relief=10.0,
+        output_interval=2.0,
+    )
+
+
+def _blocks(values, size):
+    """Mean and max of blocks of a 2D array, with a loop."""
+    (ny, nx) = values.shape
+    shape = (-(-ny // size), -(-nx // size))
+    (mean, peak) = (np.empty(shape), np.empty(shape))
+    for i in range(shape[0]):
+        for j in range(shape[1]):
+            rows = slice(i * size, (i + 1) * size)
+            columns = slice(j * size, (j + 1) * size)
+            block = values[rows, columns]
+            (mean[i, j], peak[i, j]) = (block.mean(), block.max())
+    return (mean, peak)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"factor": 1}, {"tile_size": 0}, {"levels": 0}]
+)
+def test_bad_values(make_model, kwargs):
+    with pytest.raises(ValueError):
+        _model(make_model, RasterModelGrid((4, 5)), **kwargs)
+
+
+def test_raster_only(make_model):
+    with pytest.raises(ValueError):
+        _model(make_model, HexModelGrid((4, 5)))
+
+
+@pytest.mark.parametrize(
+    "shape,factor,tile_size,levels",
+    [((13, 21), 2, 4, 3), ((32, 32), 2, 8, 2), ((17, 10), 3, 4, 2)],
+)
+def test_levels(make_model, shape, factor, tile_size, levels):
+    grid = RasterModelGrid(shape, xy_spacing=(10.0, 5.0))
+    model = _model(
+        make_model,
+        grid,
+        output_fields=["topographic__elevation", "soil__depth"],
+        factor=factor,
+        tile_size=tile_size,
+    )
+    model.run()
+    writer = model.get_output_writer("pyramid")[0]
+    assert writer.number_of_levels == levels
+    assert writer.output_times == [0.0, 2.0, 4.0]
+
+    z = grid.at_node["topographic__elevation"].reshape(shape)
+    with writer.open_level(0) as ds:
+        assert ds.attrs["block_size"] == 1
+        for field in ["topographic__elevation", "soil__depth"]:
+            np.testing.assert_array_equal(
+                ds[field], grid.at_node[field].reshape(shape)
+            )
+        np.testing.assert_array_equal(ds["x"], grid.x_of_node[: shape[1]])
+        np.testing.assert_array_equal(ds["y"], grid.y_of_node[:: shape[1]])
+    for level in range(1, levels + 1):
+        size = factor ** level
+        (mean, peak) = _blocks(z, size)
+        with writer.open_level(level) as ds:
+            assert ds.attrs["block_size"] == size
+            np.testing.assert_allclose(
+                ds["topographic__elevation_mean"], mean
+            )
+            np.testing.assert_array_equal(
+                ds["topographic__elevation_max"], peak
+            )
+            np.testing.assert_allclose(
+                ds["x"], _blocks(grid.x_of_node.reshape(shape), size)[0][0]
+            )
+            np.testing.assert_allclose(
+                ds["y"],
+                _blocks(grid.y_of_node.reshape(shape), size)[0][:, 0],
+            )
+    assert max(mean.shape) <= tile_size
+    model.remove_output()
+
+
+def test_tiles(make_model):
+    grid = RasterModelGrid((40, 50))
+    model = _model(make_model, grid, tile_size=8, levels=2)
+    model.run()
+    writer = model.get_output_writer("pyramid")[0]
+    with netCDF4.Dataset(writer.get_output_filepaths("nc")[0]) as nc:
+        level = nc.groups["level_0"]
+        var = level.variables["topographic__elevation"]
+        assert var.shape == (40, 50)
+        assert var.chunking() == [8, 8]
+        level = nc.groups["level_1"]
+        var = level.variables["topographic__elevation_mean"]
+        assert var.shape == (20, 25)
+        assert var.chunking() == [8, 8]
+        assert nc.groups["level_2"].variables[
+            "topographic__elevation_max"
+        ].chunking() == [8, 8]
+    for level in [-1, 3]:
+        with pytest.raises(ValueError):
+            writer.open_level(level)
+    model.remove_output()
@@ -0,0 +1,224 @@
+# coding: utf8
+# !/usr/env/python
+
+import copy
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento import Basic, BasicHy
+from terrainbento.output_writers import OWReductions, OWRunningReductions
+from terrainbento.output_writers.ow_reductions import _slope_area
+
+
+def _model(
+    make_model, writer, model_class=Basic, recorder_interval=20.0, **kw
+):
+    params = {}
+    if model_class is BasicHy:
+        params["settling_velocity"] = 0.1
+    return make_model(
+        RasterModelGrid((8, 9), xy_spacing=10.0),
+        {"stats": {"class": writer, "kwargs": kw}},
+        step=10.0,
+        stop=200.0,
+        gradient=(0.1, 0.01),
+        lowering={"modify_core_nodes": False, "lowering_rate": -0.001},
+        record=recorder_interval,
+        model_class=model_class,
+        output_interval=20.0,
+        **params,
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"reductions": "steepest_peak"},
+        {"reductions": {"a": 1.0}},
+    ],
+)
+def test_unknown_reduction(make_model, kwargs):
+    with pytest.raises(ValueError):
+        _model(make_model, OWReductions, **kwargs)
+
+
+@pytest.mark.parametrize("kwargs", [{"interval": 0.0}, {"times_iter": []}])
+def test_running_bad_values(make_model, kwargs):
+    with pytest.raises(ValueError):
+        _model(make_model, OWRunningReductions, **kwargs)
+
+
+def test_reductions_at_output_times(make_model):
+    model = _model(
+        make_model,
+        OWReductions,
+        reductions=[
+            "mean_elevation",
+            "relief",
+            "hypsometric_integral",
+            "hypsometry",
+            "mean_erosion_rate",
+            "outlet_sediment_flux",
+            "fraction_above_contact",
+        ],
+        hypsometry_levels=3,
+    )
+    grid = model.grid
+    contact = grid.add_zeros("node", "lithology_contact__elevation")
+    contact += 4.0
+    model.run()
+
+    writer = model.get_output_writer("stats")[0]
+    assert model.get_output(extension="csv") == [writer.filepath]
+
+    truth = model.get_output_writer("truth")[0]
+    z = np.array(truth.snapshots)[:, grid.core_nodes]
+    times = np.array(truth.times)
+    ds = model.to_xarray_dataset(writer="stats")
+    np.testing.assert_array_equal(ds["time"], times)
+    np.testing.assert_allclose(ds["mean_elevation"], z.mean(axis=1))
+    np.testing.assert_allclose(
+        ds["relief"],
+        np.ptp(np.array(truth.snapshots), axis=1),
+    )
+    np.testing.assert_allclose(
+        ds["hypsometric_integral"],
+        (z.mean(axis=1) - z.min(axis=1)) / np.ptp(z, axis=1),
+    )
+    np.testing.assert_allclose(ds["hypsometry_0.5"], np.median(z, axis=1))
+    np.testing.assert_allclose(ds["hypsometry_1"], z.max(axis=1))
+
+    rate = -np.diff(z.mean(axis=1)) / np.diff(times)
+    assert np.isnan(ds["mean_erosion_rate"][0])
+    np.testing.assert_allclose(ds["mean_erosion_rate"][1:], rate)
+    assert np.all(rate > 0.0)
+    np.testing.assert_allclose(
+        ds["outlet_sediment_flux"][1:],
+        rate * grid.cell_area_at_node[grid.core_nodes].sum(),
+    )
+    np.testing.assert_allclose(
+        ds["fraction_above_contact"], np.mean(z > 4.0, axis=1)
+    )
+
+
+def test_outlet_sediment_outflux(make_model):
+    model = _model(
+        make_model,
+        OWReductions,
+        model_class=BasicHy,
+        reductions=["outlet_sediment_flux"],
+        intervals=200.0,
+        save_first_timestep=False,
+    )
+    model.run()
+    grid = model.grid
+    core = grid.core_nodes
+    receivers = grid.at_node["flow__receiver_node"][core]
+    leaving = core[grid.status_at_node[receivers] != 0]
+    expected = grid.at_node["sediment__outflux"][leaving].sum()
+    ds = model.get_output_writer("stats")[0].to_xarray_dataset()
+    assert expected > 0.0
+    np.testing.assert_allclose(ds["outlet_sediment_flux"], [expected])
+
+
+def test_custom_reductions(make_model):
+    model = _model(
+        make_model,
+        OWReductions,
+        reductions={
+            "relief": "relief",
+            "two": lambda model: np.array([1.0, 2.0]),
+            "time": lambda model: {"squared": model.model_time ** 2},
+        },
+    )
+    model.run()
+    ds = model.to_xarray_dataset(writer="stats")
+    assert list(ds.data_vars) == ["relief", "two_0", "two_1", "time_squared"]
+    np.testing.assert_array_equal(ds["two_1"], 2.0)
+    np.testing.assert_array_equal(ds["time_squared"], ds["time"] ** 2)
+
+
+def test_slope_area_fit():
+    grid = RasterModelGrid((5, 6))
+    area = np.linspace(1.0, 100.0, grid.number_of_nodes)
+    grid.add_field("drainage_area", area, at="node")
+    slope = 2.0 * area ** -0.45
+    grid.add_field("topographic__steepest_slope", slope, at="node")
+    fit = _slope_area(SimpleNamespace(grid=grid))
+    np.testing.assert_allclose(fit["steepness"], 2.0)
+    np.testing.assert_allclose(fit["concavity"], 0.45)
+
+    grid.at_node["drainage_area"][:] = 0.0
+    assert np.isnan(_slope_area(SimpleNamespace(grid=grid))["concavity"])
+
+
+@pytest.mark.parametrize("interval", [30.0, 50.0])
+def test_running_reductions(make_model, interval):
+    model = _model(
+        make_model,
+        OWRunningReductions,
+        recorder_interval=10.0,
+        reductions=["mean_elevation", "mean_erosion_rate"],
+        interval=interval,
+    )
+    model.run()
+    grid = model.grid
+    truth = model.get_output_writer("truth")[0]
+    times = np.array(truth.times)
+    mean_z = np.array(truth.snapshots)[:, grid.core_nodes].mean(axis=1)
+    rate = np.concatenate([[np.nan], -np.diff(mean_z) / np.diff(times)])
+
+    ds = model.to_xarray_dataset(writer="stats")
+    row_times = np.append(np.arange(0.0, 200.0, interval), 200.0)
+    np.testing.assert_array_equal(ds["time"], row_times)
+
+    starts = np.concatenate([[-1.0], row_times[:-1]])
+    for (i, (start, stop)) in enumerate(zip(starts, row_times)):
+        window = (times > start) & (times <= stop)
+        np.testing.assert_allclose(
+            ds["mean_elevation_mean"][i], mean_z[window].mean()
+        )
+        np.testing.assert_allclose(
+            ds["mean_elevation_min"][i], mean_z[window].min()
+        )
+        np.testing.assert_allclose(
+            ds["mean_erosion_rate_max"][i], np.nanmax(rate[window])
+        )
+        np.testing.assert_allclose(
+            ds["mean_erosion_rate_mean"][i], np.nanmean(rate[window])
+        )
+
+
+def test_running_reductions_match_instantaneous(make_model):
+    params = {"reductions": ["mean_elevation"]}
+    model = _model(make_model, OWRunningReductions, interval=10.0, **params)
+    model.run()
+    other = _model(
+        make_model, OWReductions, intervals=10.0, **copy.copy(params)
+    )
+    other.run()
+    running = model.to_xarray_dataset(writer="stats")
+    instantaneous = other.to_xarray_dataset(writer="stats")
+    np.testing.assert_array_equal(running["time"], instantaneous["time"])
+    for suffix in ("mean", "min", "max"):
+        np.testing.assert_allclose(
+            running[f"mean_elevation_{suffix}"],
+            instantaneous["mean_elevation"],
+        )
+
+
+def test_running_reductions_without_first_step(make_model):
+    model = _model(
+        make_model,
+        OWRunningReductions,
+        interval=50.0,
+        reductions=["mean_erosion_rate"],
+        save_first_timestep=False,
+    )
+    model.run()
+    ds = model.to_xarray_dataset(writer="stats")
+    np.testing.assert_array_equal(ds["time"], [50.0, 100.0, 150.0, 200.0])
+    assert np.isfinite(ds["mean_erosion_rate_mean"]).all()
@@ -0,0 +1,144 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+
+import numpy as np
+import pytest
+import xarray as xr
+from landlab import HexModelGrid, RasterModelGrid
+from landlab.utils import get_watershed_mask
+
+from terrainbento.output_writers import OWRegionNetCDF
+
+
+def _model(make_model, grid, **kwargs):
+    # the default netcdf writer can not write hex grids.
+    return make_model(
+        grid,
+        {"region": {"class": OWRegionNetCDF, "kwargs": kwargs}},
+        step=10.0,
+        stop=100.0,
+        relief=0.1,
+        gradient=(0.01, 0.001),
+        lowering={"modify_core_nodes": True, "lowering_rate": -0.001},
+        output_interval=20.0,
+        output_default_netcdf=isinstance(grid, RasterModelGrid),
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"nodes": [1, 2], "bounding_box": (0, 1, 0, 1)},
+        {"bounding_box": (0, 1, 0, 1), "watershed_outlet": 3},
+        {"stride": 0},
+    ],
+)
+def test_bad_selection(make_model, kwargs):
+    with pytest.raises(ValueError):
+        _model(make_model, RasterModelGrid((4, 5)), **kwargs)
+
+
+def test_empty_region(make_model):
+    model = _model(
+        make_model, RasterModelGrid((4, 5)), bounding_box=(-5, -1, -5, -1)
+    )
+    with pytest.raises(ValueError):
+        model.run()
+
+
+def test_node_mask(make_model):
+    grid = HexModelGrid((7, 7), spacing=10.0)
+    mask = grid.x_of_node > 30.0
+    model = _model(
+        make_model,
+        grid,
+        output_fields=["soil__depth", "topographic__elevation"],
+        nodes=mask,
+        intervals=20.0,
+    )
+    model.run()
+    writer = model.get_output_writer("region")[0]
+    nodes = np.flatnonzero(mask)
+    np.testing.assert_array_equal(writer.region_nodes, nodes)
+
+    ds = writer.to_xarray_dataset()
+    np.testing.assert_array_equal(ds["time"], 20.0 * np.arange(6))
+    np.testing.assert_array_equal(ds["x"], grid.x_of_node[mask])
+    np.testing.assert_array_equal(ds["node_id"], nodes)
+    np.testing.assert_array_equal(
+        ds["topographic__elevation"][-1],
+        grid.at_node["topographic__elevation"][mask],
+    )
+    assert set(ds.data_vars) == {"soil__depth", "topographic__elevation"}
+
+
+def test_node_mapping_written_once(make_model):
+    grid = RasterModelGrid((6, 7), xy_spacing=10.0)
+    model = _model(make_model, grid, nodes=[30, 8, 9, 8], intervals=20.0)
+    model.run()
+    writer = model.get_output_writer("region")[0]
+    filepaths = writer.get_output_filepaths("nc")
+    assert filepaths.count(writer.nodes_filepath) == 1
+    assert len(filepaths) == 7
+    assert os.path.basename(writer.nodes_filepath).endswith("_nodes.nc")
+    np.testing.assert_array_equal(writer.region_nodes, [8, 9, 30])
+
+    with xr.open_dataset(filepaths[-1]) as ds:
+        assert set(ds.variables) == {"time", "topographic__elevation"}
+        assert ds["topographic__elevation"].shape == (1, 3)
+
+    # the default netcdf writer is read on its own.
+    ds = model.to_xarray_dataset()
+    assert ds["topographic__elevation"].shape == (6, 6, 7)
+    model.remove_output()
+
+
+def test_stride_and_bounding_box(make_model):
+    grid = RasterModelGrid((9, 10), xy_spacing=10.0)
+    model = _model(
+        make_model, grid, bounding_box=(15.0, 95.0, 0.0, 45.0), stride=2
+    )
+    model.run()
+    writer = model.get_output_writer("region")[0]
+    expected = [
+        node
+        for node in range(grid.number_of_nodes)
+        if node // 10 in (0, 2, 4) and node % 10 in (2, 4, 6, 8)
+    ]
+    np.testing.assert_array_equal(writer.region_nodes, expected)
+    model.remove_output()
+
+
+def test_stride_hex(make_model):
+    grid = HexModelGrid((5, 5))
+    model = _model(make_model, grid, stride=3)
+    model.run()
+    writer = model.get_output_writer("region")[0]
+    np.testing.assert_array_equal(
+        writer.region_nodes, np.arange(0, grid.number_of_nodes, 3)
+    )
+    model.remove_output()
+
+
+@pytest.mark.parametrize("outlet", [10, 17, 31])
+def test_watershed(make_model, outlet):
+    grid = RasterModelGrid((8, 9), xy_spacing=10.0)
+    model = _model(make_model, grid, watershed_outlet=outlet, intervals=20.0)
+    model.run_one_step(10.0)
+    expected = np.flatnonzero(get_watershed_mask(grid, outlet))
+    writer = model.get_output_writer("region")[0]
+    writer.run_one_step()
+    np.testing.assert_array_equal(writer.region_nodes, expected)
+    model.remove_output()
+
+
+def test_watershed_routes_flow_first(make_model):
+    grid = RasterModelGrid((6, 7), xy_spacing=10.0)
+    model = _model(make_model, grid, watershed_outlet=7)
+    model.run()
+    writer = model.get_output_writer("region")[0]
+    assert writer.region_nodes[0] == 7
+    assert writer.region_nodes.size > 1
+    model.remove_output()
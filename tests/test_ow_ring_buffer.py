@@ -0,0 +1,90 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+
+import numpy as np
+import pytest
+from landlab import HexModelGrid, RasterModelGrid
+
+from terrainbento.output_writers import OWRingBuffer, RingBuffer
+
+
+def _model(make_model, grid, **kwargs):
+    return make_model(
+        grid,
+        {"ring": {"class": OWRingBuffer, "kwargs": kwargs}},
+        step=10.0,
+        stop=200.0,
+        lowering={"modify_core_nodes": True, "lowering_rate": -0.001},
+        record=True,
+        output_interval=10.0,
+    )
+
+
+def test_bad_slots():
+    with pytest.raises(ValueError):
+        RingBuffer(["z"], 3, 0)
+
+
+@pytest.mark.parametrize("slots", [1, 5, 21, 30])
+def test_keeps_last_snapshots(tmpdir, make_model, slots):
+    model = _model(make_model, RasterModelGrid((5, 6)), slots=slots)
+    model.run()
+    truth = np.array(model.get_output_writer("truth")[0].snapshots)
+    kept = min(slots, 21)
+
+    ds = model.to_xarray_dataset(writer="ring")
+    np.testing.assert_array_equal(
+        ds["time"].values, 10.0 * np.arange(21 - kept, 21)
+    )
+    np.testing.assert_array_equal(
+        ds["topographic__elevation"].values.reshape((kept, -1)),
+        truth[-kept:],
+    )
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_hex_grid_dims(make_model):
+    grid = HexModelGrid((5, 5))
+    model = _model(
+        make_model,
+        grid,
+        output_fields=["topographic__elevation", "soil__depth"],
+        slots=4,
+    )
+    model.run()
+    ds = model.get_output_writer("ring")[0].to_xarray_dataset()
+    assert ds["topographic__elevation"].dims == ("time", "node")
+    assert ds["soil__depth"].shape == (4, grid.number_of_nodes)
+    np.testing.assert_array_equal(ds["x"].values, grid.x_of_node)
+
+
+def test_parent_reads_shared_buffer(make_model):
+    grid = RasterModelGrid((5, 6))
+    parent = RingBuffer(
+        ["topographic__elevation"], grid.number_of_nodes, 3, True
+    )
+    model = _model(make_model, grid, buffer_descriptor=parent.descriptor())
+    model.run()
+    writer = model.get_output_writer("ring")[0]
+    np.testing.assert_array_equal(parent.times, [180.0, 190.0, 200.0])
+    np.testing.assert_array_equal(
+        parent.snapshots("topographic__elevation")[-1],
+        grid.at_node["topographic__elevation"],
+    )
+    writer.buffer.close()
+    parent.close()
+
+
+def test_shared_buffer_must_match(make_model):
+    parent = RingBuffer(["topographic__elevation"], 7, 3, True)
+    with pytest.raises(ValueError):
+        _model(
+            make_model,
+            RasterModelGrid((5, 6)),
+            buffer_descriptor=parent.descriptor(),
+        )
+    parent.close()
+    with pytest.raises(ValueError):
+        RingBuffer(["z"], 3, 2).descriptor()
@@ -0,0 +1,141 @@
+# coding: utf8
+# !/usr/env/python
+
+import os
+
+import netCDF4
+import numpy as np
+import pytest
+import xarray as xr
+from landlab import HexModelGrid
+
+from terrainbento import OWUnstructuredNetCDF
+
+
+def _model(make_model, **kwargs):
+    # the default netcdf writer can not write hex grids.
+    return make_model(
+        HexModelGrid((7, 7), spacing=10.0),
+        {"hex": {"class": OWUnstructuredNetCDF, "kwargs": kwargs}},
+        stop=10.0,
+        gradient=(0.1, 0.0),
+        soil_depth=1.0,
+        record=2.0,
+        output_interval=2.0,
+    )
+
+
+def test_bad_chunk_size(make_model):
+    with pytest.raises(ValueError):
+        _model(make_model, chunk_size=0)
+
+
+def test_no_output_yet(make_model):
+    model = _model(make_model)
+    (writer,) = model.get_output_writer("hex")
+    assert writer.geometry_filepath is None
+    with pytest.raises(ValueError):
+        writer.to_xarray_dataset()
+
+
+@pytest.mark.parametrize("append", [False, True])
+def test_fields_match_grid(tmpdir, make_model, append):
+    model = _model(
+        make_model,
+        intervals=2.0,
+        append=append,
+        chunk_size=4,
+        output_fields=["topographic__elevation", "soil__depth"],
+    )
+    model.run()
+    grid = model.grid
+    (writer,) = model.get_output_writer("hex")
+    (truth,) = model.get_output_writer("truth")
+
+    filepaths = writer.get_output_filepaths("nc")
+    assert filepaths[0] == writer.geometry_filepath
+    assert writer.geometry_filepath.endswith("_grid.nc")
+    assert len(filepaths) == (2 if append else 7)
+
+    with xr.open_dataset(writer.geometry_filepath) as geometry:
+        np.testing.assert_array_equal(geometry["x_of_node"], grid.x_of_node)
+        np.testing.assert_array_equal(
+            geometry["status_at_node"], grid.status_at_node
+        )
+        np.testing.assert_array_equal(
+            geometry["nodes_at_link"], grid.nodes_at_link
+        )
+        np.testing.assert_array_equal(
+            geometry["nodes_at_patch"], grid.nodes_at_patch
+        )
+
+    for filepath in filepaths[1:]:
+        with xr.open_dataset(filepath) as ds:
+            assert set(ds.data_vars) == {
+                "topographic__elevation",
+                "soil__depth",
+            }
+            assert "x_of_node" not in ds
+
+    ds = writer.to_xarray_dataset()
+    np.testing.assert_array_equal(ds["time"], np.arange(0.0, 11.0, 2.0))
+    np.testing.assert_array_equal(writer.output_times, ds["time"])
+    assert ds["topographic__elevation"].dims == ("time", "node")
+    np.testing.assert_array_equal(
+        ds["topographic__elevation"], truth.snapshots
+    )
+    np.testing.assert_array_equal(ds["soil__depth"], 1.0)
+    np.testing.assert_array_equal(ds["y"], grid.y_of_node)
+    model.remove_output()
+    assert not os.listdir(str(tmpdir))
+
+
+def test_append_chunks(make_model):
+    model = _model(make_model, intervals=2.0, append=True, chunk_size=10)
+    model.run()
+    (writer,) = model.get_output_writer("hex")
+    filepath = writer.get_output_filepaths("nc")[1]
+    with netCDF4.Dataset(filepath) as nc:
+        assert nc.dimensions["time"].isunlimited()
+        variable = nc["topographic__elevation"]
+        assert variable.shape == (6, model.grid.number_of_nodes)
+        assert variable.chunking() == [1, 10]
+    sizes = [os.path.getsize(path) for path in writer.get_output_filepaths()]
+    assert writer.total_bytes_written == sum(sizes)
+    model.remove_output()
+
+
+def test_smaller_than_whole_grid(make_model):
+    model = _model(make_model, intervals=2.0)
+    model.run()
+    (writer,) = model.get_output_writer("hex")
+    (geometry, *snapshots) = writer.get_output_filepaths("nc")
+    assert all(
+        os.path.getsize(filepath) < os.path.getsize(geometry)
+        for filepath in snapshots
+    )
+    model.remove_output()
+
+
+@pytest.mark.parametrize("chunk_size", [2 ** 20, 1000])
+def test_append_file_size(make_model, chunk_size):
+    grid = HexModelGrid((151, 151), spacing=10.0)
+    model = make_model(
+        grid,
+        {
+            "hex": {
+                "class": OWUnstructuredNetCDF,
+                "kwargs": {"append": True, "chunk_size": chunk_size},
+            }
+        },
+        output_interval=10.0,
+    )
+    model.write_output()
+    (writer,) = model.get_output_writer("hex")
+    filepath = writer.get_output_filepaths("nc")[1]
+
+    # one append takes about the size of the field, not of a whole chunk of
+    # output times.
+    nbytes = grid.at_node["topographic__elevation"].nbytes
+    assert os.path.getsize(filepath) < 1.2 * nbytes
+    model.remove_output()
@@ -0,0 +1,147 @@
+# coding: utf8
+# !/usr/env/python
+import numpy as np
+import pytest
+
+from terrainbento import Basic, BasicSt, Clock, RandomPrecipitator
+from terrainbento.utilities import RandomStreams
+
+
+def _stochastic_params(clock, grid, opt_stochastic_duration, streams):
+    return {
+        "grid": grid,
+        "clock": clock,
+        "opt_stochastic_duration": opt_stochastic_duration,
+        "record_rain": True,
+        "water_erodibility": 0.01,
+        "regolith_transport_parameter": 0.1,
+        "infiltration_capacity": 0.0,
+        "mean_storm_duration": 2.0,
+        "mean_interstorm_duration": 3.0,
+        "mean_storm_depth": 1.0,
+        "rainfall__mean_rate": 1.0,
+        "rainfall_intermittency_factor": 0.1,
+        "rainfall__shape_factor": 0.6,
+        "random_streams": streams,
+    }
+
+
+def _rain_record(clock, grid, opt_stochastic_duration, streams):
+    model = BasicSt(
+        **_stochastic_params(clock, grid, opt_stochastic_duration, streams)
+    )
+    model.run_for(model.clock.step, 20 * model.clock.step)
+    return (
+        np.asarray(model.rain_record["event_duration"]),
+        np.asarray(model.rain_record["rainfall_rate"]),
+    )
+
+
+def test_bad_member():
+    with pytest.raises(ValueError):
+        RandomStreams(1, member=-1)
+
+
+def test_named_streams_do_not_depend_on_request_order():
+    a = RandomStreams(7)
+    a.generator("precipitator")
+    first = a.generator("storm_generator").random(5)
+
+    b = RandomStreams(7)
+    second = b.generator("storm_generator").random(5)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_members_are_distinct():
+    root = RandomStreams(7)
+    draws = [
+        root.spawn_member(i).generator("storm_generator").random()
+        for i in range(4)
+    ]
+    assert len(set(draws)) == 4
+
+
+def test_reset_single_stream():
+    streams = RandomStreams(7)
+    storms = streams.generator("storm_generator").random()
+    precip = streams.generator("precipitator").random()
+    streams.reset("storm_generator")
+    assert streams.generator("storm_generator").random() == storms
+    assert streams.generator("precipitator").random() != precip
+
+
+def test_integer_seed_is_converted(clock_simple, grid_1):
+    params = _stochastic_params(clock_simple, grid_1, False, 3)
+    model = BasicSt(**params)
+    assert isinstance(model.random_streams, RandomStreams)
+    assert model.rain_generator is None
+
+
+@pytest.mark.parametrize("opt_stochastic_duration", [True, False])
+def test_member_bit_identical(grid_1, opt_stochastic_duration):
+    # member 2 run alone and after other members gives the same rain.
+    root = RandomStreams(2021)
+    grids = [_copy_grid(grid_1) for member in range(3)]
+    alone = _rain_record(
+        Clock(step=10.0, stop=1000.0),
+        grid_1,
+        opt_stochastic_duration,
+        RandomStreams(2021, member=2),
+    )
+    for member in range(3):
+        record = _rain_record(
+            Clock(step=10.0, stop=1000.0),
+            grids[member],
+            opt_stochastic_duration,
+            root.spawn_member(member),
+        )
+    np.testing.assert_array_equal(alone[0], record[0])
+    np.testing.assert_array_equal(alone[1], record[1])
+
+
+def test_streams_leave_global_state_alone(grid_1):
+    np.random.seed(11)
+    expected = np.random.rand()
+    np.random.seed(11)
+    _rain_record(
+        Clock(step=10.0, stop=1000.0), grid_1, True, RandomStreams(5)
+    )
+    assert np.random.rand() == expected
+
+
+def test_reset_random_seed(clock_simple, grid_1):
+    model = BasicSt(
+        **_stochastic_params(clock_simple, grid_1, False, RandomStreams(5))
+    )
+    first = model._generate_rain_rate()
+    model._generate_rain_rate()
+    model.reset_random_seed()
+    assert model._generate_rain_rate() == first
+
+
+def test_precipitator_stream(clock_simple, grid_1):
+    precipitator = RandomPrecipitator(grid_1)
+    model = Basic(
+        clock=clock_simple,
+        grid=grid_1,
+        precipitator=precipitator,
+        random_streams=RandomStreams(5),
+    )
+    expected = (
+        RandomStreams(5)
+        .generator("precipitator")
+        .uniform(size=grid_1.number_of_nodes)
+    )
+    np.testing.assert_array_equal(
+        model.grid.at_node["rainfall__flux"], expected
+    )
+
+
+def _copy_grid(grid):
+    from landlab import RasterModelGrid
+
+    new = RasterModelGrid(grid.shape, xy_spacing=grid.dx)
+    new.status_at_node[:] = grid.status_at_node
+    for name in grid.at_node:
+        new.add_field(name, grid.at_node[name].copy(), at="node")
+    return new
@@ -0,0 +1,128 @@
+# coding: utf8
+# !/usr/env/python
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento import Basic, SpatiallyVariableUpliftHandler
+from terrainbento.boundary_handlers import (
+    BaselevelUpdatePlan,
+    GenericFuncBaselevelHandler,
+)
+
+_FIELDS = (
+    "topographic__elevation",
+    "bedrock__elevation",
+    "lithology_contact__elevation",
+)
+
+
+def _grid():
+    mg = RasterModelGrid((5, 6))
+    for (i, name) in enumerate(_FIELDS):
+        mg.add_field("node", name, mg.x_of_node - i)
+    mg.add_field("node", "uplift_rate", 0.001 * mg.y_of_node)
+    return mg
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"uplift_rate": "not_a_field"},
+        {"uplift_rate": np.ones(4)},
+        {"time_scaling": [1.0, 2.0]},
+        {"time_scaling": "not_a_file.txt"},
+    ],
+)
+def test_bad_values(kwargs):
+    with pytest.raises(ValueError):
+        SpatiallyVariableUpliftHandler(_grid(), **kwargs)
+
+
+@pytest.mark.parametrize("fused", [False, True])
+def test_matches_generic_function(fused):
+    def scale(t):
+        return 1.0 + 0.01 * t
+
+    grid = _grid()
+    bh = SpatiallyVariableUpliftHandler(
+        grid, uplift_rate="uplift_rate", time_scaling=scale
+    )
+    plan = BaselevelUpdatePlan(grid, {"uplift": bh})
+
+    expected = _grid()
+    generic = GenericFuncBaselevelHandler(
+        expected,
+        modify_core_nodes=True,
+        function=lambda g, t: -0.001 * g.y_of_node * scale(t),
+    )
+
+    for _ in range(10):
+        if fused:
+            plan.run_one_step(10.0)
+        else:
+            bh.run_one_step(10.0)
+        generic.run_one_step(10.0)
+    assert bh.model_time == 100.0
+
+    # the generic handler does not move the lithology contact.
+    for name in _FIELDS[:2]:
+        np.testing.assert_allclose(grid.at_node[name], expected.at_node[name])
+    contact = grid.at_node["lithology_contact__elevation"]
+    np.testing.assert_allclose(
+        contact - _grid().at_node["lithology_contact__elevation"],
+        grid.at_node["topographic__elevation"] - _grid().at_node[_FIELDS[0]],
+    )
+
+
+def test_schedule_is_held_outside_of_its_times(tmpdir):
+    path = str(tmpdir.join("scaling.txt"))
+    np.savetxt(path, [[10.0, 2.0], [20.0, 4.0]], delimiter=",", header="t,f")
+    bh = SpatiallyVariableUpliftHandler(_grid(), time_scaling=path)
+    assert bh.time_scaling(0.0) == 2.0
+    assert bh.time_scaling(15.0) == 3.0
+    assert bh.time_scaling(100.0) == 4.0
+
+
+def test_rate_is_static():
+    grid = _grid()
+    bh = SpatiallyVariableUpliftHandler(grid, uplift_rate="uplift_rate")
+    grid.at_node["uplift_rate"][:] = 100.0
+    before = grid.at_node["topographic__elevation"].copy()
+    bh.run_one_step(10.0)
+    np.testing.assert_allclose(
+        grid.at_node["topographic__elevation"] - before,
+        np.where(grid.status_at_node == 0, 0.01 * grid.y_of_node, 0.0),
+    )
+
+
+def test_from_dict():
+    params = {
+        "grid": {
+            "RasterModelGrid": [
+                (4, 5),
+                {
+                    "fields": {
+                        "node": {
+                            "topographic__elevation": {
+                                "constant": [{"value": 0.0}]
+                            }
+                        }
+                    }
+                },
+            ]
+        },
+        "clock": {"step": 10.0, "stop": 100.0},
+        "boundary_handlers": {
+            "SpatiallyVariableUpliftHandler": {
+                "uplift_rate": 0.001,
+                "time_scaling": [[0.0, 1.0], [100.0, 2.0]],
+            }
+        },
+        "output_default_netcdf": False,
+    }
+    model = Basic.from_dict(params)
+    bh = model.boundary_handlers["SpatiallyVariableUpliftHandler"]
+    assert isinstance(bh, SpatiallyVariableUpliftHandler)
+    assert bh.time_scaling(50.0) == 1.5
@@ -0,0 +1,143 @@
+# coding: utf8
+# !/usr/env/python
+import os
+
+import numpy as np
+import pytest
+
+from terrainbento import BasicDdSt, BasicSt, Clock
+from terrainbento.utilities import StormSequence
+
+
+def _sequence(total_time=2000.0):
+    return StormSequence.generate(
+        total_time,
+        mean_storm_duration=2.0,
+        mean_interstorm_duration=3.0,
+        mean_storm_depth=1.0,
+        random_generator=7,
+    )
+
+
+def _model(cls, grid, sequence, **kwargs):
+    params = {
+        "grid": grid,
+        "clock": Clock(step=10.0, stop=1000.0),
+        "opt_stochastic_duration": True,
+        "record_rain": True,
+        "water_erodibility": 0.01,
+        "regolith_transport_parameter": 0.1,
+        "infiltration_capacity": 0.0,
+        "storm_sequence": sequence,
+    }
+    params.update(kwargs)
+    return cls(**params)
+
+
+def test_bad_events():
+    with pytest.raises(ValueError):
+        StormSequence(np.ones(4))
+    with pytest.raises(ValueError):
+        StormSequence([[1.0, -1.0]])
+
+
+def test_bad_total_time():
+    with pytest.raises(ValueError):
+        StormSequence.generate(0.0)
+
+
+def test_generate_statistics():
+    sequence = StormSequence.generate(
+        1.0e5,
+        mean_storm_duration=2.0,
+        mean_interstorm_duration=3.0,
+        mean_storm_depth=1.5,
+        random_generator=np.random.default_rng(3),
+    )
+    np.testing.assert_almost_equal(sequence.total_time, 1.0e5)
+    storms = sequence.events[0::2][:-1]
+    interstorms = sequence.events[1::2][:-1]
+    assert np.all(interstorms[:, 1] == 0.0)
+    np.testing.assert_allclose(storms[:, 0].mean(), 2.0, rtol=0.05)
+    np.testing.assert_allclose(interstorms[:, 0].mean(), 3.0, rtol=0.05)
+    np.testing.assert_allclose(
+        (storms[:, 0] * storms[:, 1]).mean(), 1.5, rtol=0.05
+    )
+
+
+def test_views_are_zero_copy():
+    sequence = _sequence()
+    assert np.shares_memory(sequence.durations, sequence.events)
+    assert np.shares_memory(sequence.intensities, sequence.events)
+
+
+def test_save_load(tmpdir):
+    sequence = _sequence()
+    path = os.path.join(str(tmpdir), "storms.npy")
+    sequence.save(path)
+    loaded = StormSequence.load(path)
+    assert not loaded.events.flags.writeable
+    np.testing.assert_array_equal(loaded.events, sequence.events)
+
+
+def test_shared_memory():
+    sequence = _sequence()
+    shm = sequence.to_shared_memory()
+    try:
+        attached = StormSequence.from_shared_memory(shm.name)
+        np.testing.assert_array_equal(attached.events, sequence.events)
+        attached.close()
+        np.testing.assert_array_equal(attached.events, sequence.events)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_arbitrary_step_boundaries():
+    sequence = _sequence()
+    whole = np.array(list(sequence.cursor().advance(1.0e9, 1500.0)))
+
+    cursor = sequence.cursor()
+    pieces = []
+    for (step, runtime) in [(3.0, 17.3), (0.5, 100.0), (11.0, 1382.7)]:
+        pieces.extend(cursor.advance(step, runtime))
+    pieces = np.array(pieces)
+
+    np.testing.assert_almost_equal(pieces[:, 0].sum(), 1500.0)
+    np.testing.assert_almost_equal(
+        np.sum(pieces[:, 0] * pieces[:, 1]), np.sum(whole[:, 0] * whole[:, 1])
+    )
+
+
+def test_sequence_too_short():
+    cursor = _sequence(10.0).cursor()
+    with pytest.raises(ValueError):
+        list(cursor.advance(1.0, 11.0))
+
+
+def test_requires_stochastic_duration(grid_1):
+    with pytest.raises(ValueError):
+        _model(BasicSt, grid_1, _sequence(), opt_stochastic_duration=False)
+
+
+def test_models_share_sequence(grid_1, grid_2):
+    sequence = _sequence()
+    basic = _model(BasicSt, grid_1, sequence)
+    dd = _model(BasicDdSt, grid_2, sequence, water_erosion_rule__threshold=0.1)
+    for model in (basic, dd):
+        model.run_for(10.0, 600.0)
+        model.run_for(7.0, 400.0)
+    for key in ("event_duration", "rainfall_rate"):
+        np.testing.assert_array_equal(
+            basic.rain_record[key], dd.rain_record[key]
+        )
+
+
+def test_load_from_path(tmpdir, grid_1):
+    path = os.path.join(str(tmpdir), "storms.npy")
+    _sequence().save(path)
+    model = _model(BasicSt, grid_1, path)
+    assert isinstance(model.storm_sequence, StormSequence)
+    model.run_for(10.0, 100.0)
+    model.reset_random_seed()
+    assert model._storm_cursor.time == 0.0
@@ -0,0 +1,119 @@
+# coding: utf8
+# !/usr/env/python
+import os
+
+import numpy as np
+import pytest
+from landlab import RasterModelGrid
+
+from terrainbento.boundary_handlers import (
+    NotCoreNodeBaselevelHandler,
+    SingleNodeBaselevelHandler,
+)
+from terrainbento.utilities import TimeSeriesInterpolator, load_time_series
+
+
+def _series(n=10000):
+    rng = np.random.default_rng(4)
+    time = np.cumsum(rng.uniform(0.1, 2.0, size=n))
+    return time, rng.normal(size=n)
+
+
+@pytest.mark.parametrize(
+    "time,values",
+    [
+        ([0.0, 1.0], [1.0]),
+        ([0.0], [1.0]),
+        ([[0.0, 1.0]], [[0.0, 1.0]]),
+        ([1.0, 0.0], [1.0, 2.0]),
+    ],
+)
+def test_bad_series(time, values):
+    with pytest.raises(ValueError):
+        TimeSeriesInterpolator(time, values)
+
+
+@pytest.mark.parametrize("query", [-1.0, 1.0e9])
+def test_out_of_range(query):
+    f = TimeSeriesInterpolator(*_series())
+    with pytest.raises(ValueError):
+        f(query)
+
+
+@pytest.mark.parametrize("order", ["forward", "jumps", "random"])
+def test_matches_np_interp(order):
+    time, values = _series()
+    f = TimeSeriesInterpolator(time, values)
+    if order == "forward":
+        queries = np.linspace(time[0], time[-1], 25000)
+    elif order == "jumps":
+        queries = np.linspace(time[0], time[-1], 37)
+    else:
+        queries = np.random.default_rng(1).uniform(time[0], time[-1], 500)
+    np.testing.assert_allclose(
+        [f(t) for t in queries], np.interp(queries, time, values), atol=1e-12
+    )
+
+
+def test_repeated_times():
+    f = TimeSeriesInterpolator([0.0, 1.0, 1.0, 2.0], [0.0, 1.0, 5.0, 6.0])
+    assert f(0.5) == 0.5
+    assert f(1.0) == 5.0
+    assert f(1.5) == 5.5
+
+
+def test_scale_and_offset():
+    time, values = _series()
+    f = TimeSeriesInterpolator(time, values, scale=-3.0, offset=12.0)
+    queries = np.linspace(time[0], time[-1], 1000)
+    np.testing.assert_allclose(
+        [f(t) for t in queries],
+        -3.0 * np.interp(queries, time, values) + 12.0,
+        atol=1e-10,
+    )
+
+
+def test_load_npy_is_memory_mapped(tmpdir):
+    path = os.path.join(str(tmpdir), "history.npy")
+    np.save(path, np.column_stack(_series()))
+    series = load_time_series(path)
+    assert isinstance(series, np.memmap)
+    f = TimeSeriesInterpolator.from_file(path)
+    assert isinstance(f.time, np.memmap)
+
+
+def test_missing_file():
+    with pytest.raises(ValueError):
+        load_time_series("not_a_file.npy")
+
+
+def test_handler_npy_matches_text(tmpdir):
+    history = np.array([[0.0, 0.0], [50.0, -2.0], [200.0, -20.0]])
+    text = os.path.join(str(tmpdir), "history.txt")
+    np.savetxt(text, history, delimiter=",", header="time,elevation")
+    binary = os.path.join(str(tmpdir), "history.npy")
+    np.save(binary, history)
+
+    elevations = []
+    for path in (text, binary):
+        mg = RasterModelGrid((3, 3))
+        z = mg.add_zeros("node", "topographic__elevation")
+        bh = SingleNodeBaselevelHandler(mg, lowering_file_path=path)
+        for _ in range(15):
+            bh.run_one_step(10.0)
+        elevations.append(z.copy())
+    np.testing.assert_array_equal(elevations[0], elevations[1])
+    assert elevations[0][0] == pytest.approx(-12.8)
+
+
+@pytest.mark.parametrize(
+    "handler", [SingleNodeBaselevelHandler, NotCoreNodeBaselevelHandler]
+)
+def test_handler_keeps_history_mapped(tmpdir, handler):
+    path = os.path.join(str(tmpdir), "history.npy")
+    np.save(path, np.array([[0.0, 0.0], [50.0, -2.0], [200.0, -20.0]]))
+    mg = RasterModelGrid((3, 3))
+    mg.add_ones("node", "topographic__elevation")
+    bh = handler(mg, lowering_file_path=path, model_end_elevation=-9.0)
+    assert isinstance(bh.outlet_elevation_obj.values, np.memmap)
+    assert bh.outlet_elevation_obj(200.0) == pytest.approx(-9.0)